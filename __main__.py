@@ -1,15 +1,39 @@
 import os
+import argparse
 from dotenv import load_dotenv
 from logs import logger
 from scraping.scraper_dt import ScrapingDilutionTracker
 from database.db import Database
+from pipeline import TABLES, run_tables
+from read_service import serve
+from profiling import Profiler
+from run_state import RunState
 load_dotenv()
 
 DEBUG = os.getenv("DEBUG") == "True"
 CHROME_FOLDER = os.getenv('CHROME_FOLDER')
+SESSION_FILE = os.getenv('SESSION_FILE', '.session.json')
+LEAN_BROWSING = os.getenv('LEAN_BROWSING') == "True"
+POOL_MAX_PAGES = int(os.getenv('POOL_MAX_PAGES', 0))
+POOL_MAX_RSS_MB = int(os.getenv('POOL_MAX_RSS_MB', 1500))
+HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', 0))
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', 0))
+RUN_STATE_FILE = os.getenv('RUN_STATE_FILE', '.run_state.json')
 
 
-def main():
+def main(profile_folder: str = None, resume: bool = False):
+    """ Scrape and save all the tables
+
+    Args:
+        profile_folder (str, optional): profile each phase and trace the
+            webdriver commands, saving the results in this folder.
+            Defaults to None (no profiling).
+        resume (bool, optional): skip the tables already scraped and saved
+            by the last batch, if it didn't finish. Defaults to False.
+    """
+
+    profiler = Profiler(profile_folder, enabled=profile_folder is not None)
+    run_state = RunState(RUN_STATE_FILE)
 
     # Connect to database
     database = Database()
@@ -19,39 +43,67 @@ def main():
         logger.error('CHROME_FOLDER not found env variable is not set')
         quit()
 
-    # Connect to dilution tracker
-    scraper = ScrapingDilutionTracker(CHROME_FOLDER)
+    # Connect to dilution tracker. Resumed batches reuse the chrome of the
+    # last batch if it is still open, and keep chrome open if they crash
+    debugger_address = run_state.get_debugger_address() if resume else ""
+    scraper = ScrapingDilutionTracker(
+        CHROME_FOLDER, SESSION_FILE, LEAN_BROWSING, POOL_MAX_PAGES,
+        POOL_MAX_RSS_MB, HTTP_WORKERS, PARSE_WORKERS, detach=resume,
+        debugger_address=debugger_address)
+    run_state.start_batch(resume, scraper.get_debugger_address())
 
-    # End if login failed
-    is_logged = scraper.login()
-    if is_logged:
-        logger.info('Login success')
-    else:
-        error_message = 'Login failed. Close the program, open chrome, ' \
-                        'login manually and try again'
-        logger.error(error_message)
-        quit()
-        
-    # Get new filings
-    new_filings = scraper.get_new_filings()
-    database.save_new_filings(new_filings)
-    
-    # Get completed offerings
-    completed_offerings = scraper.get_completed_offerings()
-    database.save_completed_offerings(completed_offerings)
-    
-    # Get pending s1s
-    pending_s1s = scraper.get_pending_s1s()
-    database.save_pending_s1s(pending_s1s)
-    
-    # Get reverse splits
-    reverse_splits = scraper.get_reverse_splits()
-    database.save_reverse_splits(reverse_splits)
-    
-    # Get noncompliant data
-    noncompliant_data = scraper.get_noncompliant_data()
-    database.save_noncompliant_data(noncompliant_data)
+    is_finished = False
+    try:
+        # End if login failed
+        with profiler.phase("login"):
+            is_logged = scraper.login()
+        if is_logged:
+            logger.info('Login success')
+        else:
+            error_message = 'Login failed. Close the program, open chrome, ' \
+                            'login manually and try again'
+            logger.error(error_message)
+            quit()
+
+        # Fetch the app pages over HTTP (if it is enabled)
+        with profiler.phase("prefetch"):
+            scraper.prefetch_pages()
+
+        # Scrape and save each table (one phase per table when profiling)
+        if profiler.enabled:
+            for table_name in TABLES:
+                with profiler.phase(table_name):
+                    run_tables(scraper, database, [table_name], run_state)
+            profiler.save_commands()
+        else:
+            run_tables(scraper, database, list(TABLES), run_state)
+
+        # All tables done: the next run starts a new batch and chrome
+        run_state.finish_batch()
+        is_finished = True
+    finally:
+
+        # Keep the login browser of resumed batches open after errors
+        if is_finished or not resume:
+            scraper.end_browser()
+        else:
+            scraper.close_pools()
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serve", action="store_true",
+                        help="start the per ticker read service")
+    parser.add_argument("--profile", nargs="?", const="profile",
+                        metavar="FOLDER",
+                        help="profile each phase and trace the webdriver "
+                             "commands (results in FOLDER, default profile)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip the tables already done by the last "
+                             "batch, if it didn't finish")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve()
+    else:
+        main(args.profile, args.resume)
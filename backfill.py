@@ -0,0 +1,103 @@
+import os
+import argparse
+import multiprocessing
+from datetime import datetime as dt
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dotenv import load_dotenv
+from logs import logger, get_worker_queue, init_worker
+from database.db import Database
+from scraping.table_parser import parse_html
+from scraping.table_specs import TABLE_SPECS, parse_payload
+load_dotenv()
+
+
+def get_table_name(file_name: str) -> str:
+    """ Detect table from the file name prefix, like new_filings_2023-10-01.html
+
+    Args:
+        file_name (str): html file name
+
+    Returns:
+        str: table key in TABLE_SPECS or None
+    """
+
+    for table_name in TABLE_SPECS:
+        if file_name.startswith(table_name):
+            return table_name
+    return None
+
+
+def parse_file(path: str) -> tuple:
+    """ Parse a saved page (runs in a worker process)
+
+    Args:
+        path (str): html file path
+
+    Returns:
+        tuple: table name, file date and records
+    """
+
+    table_name = get_table_name(os.path.basename(path))
+    query_date = dt.fromtimestamp(os.path.getmtime(path))
+
+    with open(path, encoding="utf-8") as file:
+        html = file.read()
+
+    rows_selector = TABLE_SPECS[table_name].get("rows_selector", "tbody > tr")
+    payload = parse_html(html, rows_selector)
+    return table_name, query_date, parse_payload(table_name, payload, query_date)
+
+
+def backfill(folder: str, workers: int = None, chunk_size: int = 5000):
+    """ Parse the html pages of a folder in a process pool and load each one
+    in database as a run, dated with the file modification time
+
+    Args:
+        folder (str): folder with pages saved with WebScraping.save_page
+        workers (int, optional): worker processes. Defaults to cpu count.
+        chunk_size (int, optional): rows per insert batch. Defaults to 5000.
+    """
+
+    paths = []
+    for file_name in sorted(os.listdir(folder)):
+        if not file_name.endswith(".html"):
+            continue
+        if not get_table_name(file_name):
+            logger.warning(f"Skipped {file_name}: unknown table")
+            continue
+        paths.append(os.path.join(folder, file_name))
+
+    logger.info(f"Backfilling {len(paths)} pages")
+
+    database = Database()
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=init_worker,
+                             initargs=(get_worker_queue(),)) as executor:
+        futures = {executor.submit(parse_file, path): path for path in paths}
+
+        # Load each page as soon as it is parsed
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                table_name, query_date, rows = future.result()
+                run_id = database.load_snapshot(table_name, rows, query_date,
+                                                chunk_size)
+            except Exception as err:
+                database.rollback_close()
+                logger.error(f"Backfill of {path} failed: {err}")
+                continue
+
+            logger.info(f"Loaded {path}: {len(rows)} rows (run {run_id})")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Load historical pages saved with WebScraping.save_page")
+    parser.add_argument("folder", help="folder with the html pages, named "
+                                       "with the table as prefix")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    backfill(args.folder, args.workers, args.chunk_size)
@@ -0,0 +1,332 @@
+""" Benchmark the Database write strategies with synthetic rows (NULLs,
+datetimes and long strings) against a local MySQL / MariaDB server started
+in a temporary data folder. Reports rows/s, p50/p99 batch latency and
+server CPU, and appends the results to a csv file to compare them over time
+
+Run from the project folder (mysqld or mariadbd in the PATH):
+python -m benchmarks.db_writes --tables completed_offerings --sizes 1000,100000
+"""
+
+import os
+import csv
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime as dt, timedelta
+import psutil
+import pymysql
+from pipeline import TABLES
+from scraping.table_specs import TABLE_SPECS
+
+DB_NAME = "dilution_bench"
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "..", "database",
+                           "queries", "create_db.sql")
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "db_writes_results.csv")
+RESULTS_FIELDS = ["date", "server", "table", "rows", "strategy", "chunk_rows",
+                  "rows_per_s", "p50_ms", "p99_ms", "batches", "server_cpu"]
+
+
+class LocalServer ():
+    """ MySQL / MariaDB server in a temporary data folder and free port """
+
+    def __init__(self, mysqld: str):
+        """ Initialize the data folder and start the server
+
+        Args:
+            mysqld (str): mysqld or mariadbd executable
+        """
+
+        self.folder = tempfile.mkdtemp(prefix="mysql_bench_")
+        self.datadir = os.path.join(self.folder, "data")
+        self.port = self.__get_free_port__()
+
+        version = subprocess.run([mysqld, "--version"], capture_output=True,
+                                 text=True).stdout
+        self.name = version.strip().split("  ")[-1] or mysqld
+        is_mariadb = "MariaDB" in version
+
+        user_args = ["--user=root"] if os.geteuid() == 0 else []
+
+        # Create system tables, with root user without password
+        if is_mariadb:
+            install_db = shutil.which("mariadb-install-db") \
+                or shutil.which("mysql_install_db")
+            subprocess.run([install_db, "--no-defaults",
+                            f"--datadir={self.datadir}",
+                            "--auth-root-authentication-method=normal"]
+                           + user_args, check=True, capture_output=True)
+        else:
+            subprocess.run([mysqld, "--no-defaults", "--initialize-insecure",
+                            f"--datadir={self.datadir}"] + user_args,
+                           check=True, capture_output=True)
+
+        args = [
+            mysqld,
+            "--no-defaults",
+            f"--datadir={self.datadir}",
+            f"--port={self.port}",
+            f"--socket={os.path.join(self.folder, 'mysqld.sock')}",
+            f"--pid-file={os.path.join(self.folder, 'mysqld.pid')}",
+            "--bind-address=127.0.0.1",
+            "--skip-log-bin",
+        ] + user_args
+        if not is_mariadb:
+            args.append("--mysqlx=OFF")
+
+        self.log = open(os.path.join(self.folder, "mysqld.log"), "w")
+        self.process = subprocess.Popen(args, stdout=self.log,
+                                        stderr=subprocess.STDOUT)
+        self.__wait_ready__()
+        self.ps = psutil.Process(self.process.pid)
+
+    def __get_free_port__(self) -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def __wait_ready__(self, timeout: int = 60):
+        """ Wait until the server accepts connections """
+
+        end = time.time() + timeout
+        while time.time() < end:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server stopped, see {self.log.name}")
+            try:
+                self.connect().close()
+                return
+            except pymysql.err.OperationalError:
+                time.sleep(0.5)
+        raise RuntimeError(f"Server not ready, see {self.log.name}")
+
+    def connect(self, database: str = None):
+        return pymysql.connect(host="127.0.0.1", port=self.port, user="root",
+                               password="", database=database)
+
+    def get_cpu_time(self) -> float:
+        """ Server process cpu seconds (user + system) """
+
+        times = self.ps.cpu_times()
+        return times.user + times.system
+
+    def reset_database(self):
+        """ Create an empty database with the project schema """
+
+        with open(SCHEMA_FILE, encoding="utf-8") as file:
+            statements = [sql for sql in file.read().split(";") if sql.strip()]
+
+        connection = self.connect()
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS {DB_NAME}")
+            cursor.execute(f"CREATE DATABASE {DB_NAME}")
+            cursor.execute(f"USE {DB_NAME}")
+            for sql in statements:
+                cursor.execute(sql)
+        connection.commit()
+        connection.close()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=60)
+        self.log.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+def get_rows(table_name: str, rows_num: int, seed: int = 1) -> list:
+    """ Synthetic records of a table: tickers from a pool, low-cardinality
+    texts for the dictionary fields, long company names and 10% of NULLs
+
+    Args:
+        table_name (str): table key in TABLE_SPECS
+        rows_num (int): number of rows
+        seed (int, optional): random seed. Defaults to 1.
+
+    Returns:
+        list: records
+    """
+
+    # Imported after the server env variables are set
+    from database.db import TICKER_FIELDS, DICTIONARY_FIELDS
+
+    rand = random.Random(seed)
+    record_class = TABLE_SPECS[table_name]["record_class"]
+    symbol_field, company_field = TICKER_FIELDS[table_name]
+    dictionary_fields = DICTIONARY_FIELDS[table_name]
+    tickers = [f"T{index:04d}" for index in range(min(rows_num, 5000))]
+    dictionary_pool = [f"Value {index} " + "x" * rand.randint(0, 40)
+                       for index in range(12)]
+    start_date = dt(2020, 1, 1)
+    query_date = dt.today()
+
+    def get_value(column: dict, ticker: str):
+        name = column["name"]
+        if name == symbol_field:
+            return ticker
+        if rand.random() < 0.1:
+            return "NULL"
+        if name == company_field:
+            return f"{ticker} " + "Holdings Corp " * rand.randint(1, 13)
+        if name in dictionary_fields:
+            return rand.choice(dictionary_pool)
+        if column["data_type"] == int:
+            return str(rand.randint(0, 10 ** 9))
+        if column["data_type"] == float:
+            return f"{rand.uniform(0, 100):.2f}"
+        if column["data_type"] == dt:
+            return start_date + timedelta(minutes=rand.randint(0, 2_000_000))
+        return "".join(rand.choices("ABCDEFGH 1234", k=rand.randint(1, 15)))
+
+    columns = TABLE_SPECS[table_name]["columns"]
+    rows = []
+    for _ in range(rows_num):
+        ticker = rand.choice(tickers)
+        values = [get_value(column, ticker) for column in columns]
+        rows.append(record_class(*values, query_date))
+    return rows
+
+
+def get_strategies(table_name: str, chunk_sizes: list) -> list:
+    """ Write strategies of Database: (name, chunk rows, function) """
+
+    save_method = TABLES[table_name]["save"]
+
+    def save(database, rows, chunk_rows):
+        database.chunk_rows = chunk_rows
+        run_id = database.start_run(table_name)
+        getattr(database, save_method)(rows, run_id)
+
+    def save_incremental(database, rows, chunk_rows):
+        database.chunk_rows = chunk_rows
+        run_id = database.start_run(table_name, mode="incremental")
+        getattr(database, save_method)(rows, run_id, incremental=True)
+
+    def load_snapshot(database, rows, chunk_rows):
+        database.load_snapshot(table_name, rows, dt.today(), chunk_rows)
+
+    strategies = [("save", 0, save)]
+    strategies += [("save_chunked", size, save) for size in chunk_sizes]
+    if TABLES[table_name].get("incremental"):
+        strategies.append(("save_incremental", 0, save_incremental))
+    strategies += [("load_snapshot", size, load_snapshot)
+                   for size in chunk_sizes]
+    return strategies
+
+
+def measure(server: LocalServer, database, strategy, rows: list,
+            chunk_rows: int) -> dict:
+    """ Run a write strategy, timing each batch (executemany) and commit
+
+    Returns:
+        dict: rows_per_s, p50_ms, p99_ms, batches and server_cpu (%)
+    """
+
+    latencies = []
+
+    def timed(function):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            return result
+        return wrapper
+
+    database.run_many = timed(database.run_many)
+
+    cpu_start = server.get_cpu_time()
+    start = time.perf_counter()
+    strategy(database, rows, chunk_rows)
+    duration = time.perf_counter() - start
+    cpu = server.get_cpu_time() - cpu_start
+
+    latencies.sort()
+    return {
+        "rows_per_s": round(len(rows) / duration),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+        "batches": len(latencies),
+        "server_cpu": round(cpu / duration * 100, 1),
+    }
+
+
+def print_table(results: list):
+    """ Print the results as a markdown table """
+
+    fields = RESULTS_FIELDS[2:]
+    print("| " + " | ".join(fields) + " |")
+    print("|" + "---|" * len(fields))
+    for result in results:
+        print("| " + " | ".join(str(result[field]) for field in fields) + " |")
+
+
+def save_results(results: list, results_file: str):
+    """ Append the results to the csv file """
+
+    is_new = not os.path.isfile(results_file)
+    with open(results_file, "a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=RESULTS_FIELDS)
+        if is_new:
+            writer.writeheader()
+        writer.writerows(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", default="completed_offerings",
+                        help="comma separated table names or 'all'")
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--chunk-sizes", default="1000,10000")
+    parser.add_argument("--mysqld", default=shutil.which("mysqld")
+                        or shutil.which("mariadbd"))
+    parser.add_argument("--results", default=RESULTS_FILE)
+    args = parser.parse_args()
+
+    if not args.mysqld:
+        parser.error("mysqld or mariadbd not found, use --mysqld")
+
+    table_names = list(TABLE_SPECS) if args.tables == "all" \
+        else args.tables.split(",")
+    sizes = [int(size) for size in args.sizes.split(",")]
+    chunk_sizes = [int(size) for size in args.chunk_sizes.split(",")]
+
+    server = LocalServer(args.mysqld)
+
+    # Database reads the connection from env variables on import
+    os.environ.update({
+        "DB_HOST": "127.0.0.1",
+        "DB_PORT": str(server.port),
+        "DB_NAME": DB_NAME,
+        "DB_USER": "root",
+        "DB_PASS": "",
+    })
+    from database.db import Database
+
+    results = []
+    try:
+        for table_name in table_names:
+            for size in sizes:
+                rows = get_rows(table_name, size)
+                for name, chunk_rows, strategy in get_strategies(table_name,
+                                                                 chunk_sizes):
+                    server.reset_database()
+                    database = Database()
+                    result = measure(server, database, strategy, rows,
+                                     chunk_rows)
+                    result.update({
+                        "date": dt.now().strftime("%Y-%m-%d %H:%M"),
+                        "server": server.name,
+                        "table": table_name,
+                        "rows": size,
+                        "strategy": name,
+                        "chunk_rows": chunk_rows,
+                    })
+                    results.append(result)
+                    print(f"{table_name} {size} rows {name} ({chunk_rows}): "
+                          f"{result['rows_per_s']} rows/s")
+    finally:
+        server.stop()
+
+    print_table(results)
+    save_results(results, args.results)
@@ -0,0 +1,85 @@
+""" Load test of the read service with synthetic data: concurrent clients
+with keep alive connections request random tickers
+
+Run from the project folder: python -m benchmarks.read_service_load
+"""
+
+import time
+import random
+import argparse
+import threading
+import http.client
+from read_service import ReadService
+
+TABLES = {
+    "new_filings": ("ticker", 3),
+    "completed_offerings": ("ticker", 4),
+    "pending_s1s": ("ticker", 1),
+    "reverse_splits": ("symbol", 1),
+    "noncompliant": ("ticker", 1),
+}
+
+
+def get_rows(tickers: list) -> dict:
+    """ Synthetic rows for each table and ticker """
+
+    tables_rows = {}
+    for table_name, (symbol_field, rows_num) in TABLES.items():
+        tables_rows[table_name] = [
+            {symbol_field: ticker, "run_id": 1, "value": f"{table_name} {index}"}
+            for ticker in tickers
+            for index in range(rows_num)
+        ]
+    return tables_rows
+
+
+def client(port: int, tickers: list, end: float, latencies: list):
+    """ Request random tickers until end time """
+
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    while time.perf_counter() < end:
+        ticker = random.choice(tickers)
+        start = time.perf_counter()
+        connection.request("GET", f"/tickers/{ticker}")
+        connection.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    tickers = [f"T{index:04d}" for index in range(args.tickers)]
+    service = ReadService(lambda: get_rows(tickers), lambda: 1)
+
+    # In process lookup latency
+    start = time.perf_counter()
+    for ticker in tickers:
+        service.lookup(ticker)
+    lookup_us = (time.perf_counter() - start) / len(tickers) * 1e6
+
+    server = service.get_server("127.0.0.1", 0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    latencies = []
+    end = time.perf_counter() + args.seconds
+    threads = [threading.Thread(target=client,
+                                args=(port, tickers, end, latencies))
+               for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+
+    latencies.sort()
+    print(f"lookup: {lookup_us:.2f} us")
+    print(f"http: {len(latencies) / args.seconds:.0f} req/s, "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms "
+          f"({args.clients} clients)")
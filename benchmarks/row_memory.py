@@ -0,0 +1,59 @@
+""" Compare peak memory of 100k scraped rows stored as dicts (with a query
+date per row) and as slotted records (with a shared run date)
+
+Run from the project folder: python -m benchmarks.row_memory
+"""
+
+import tracemalloc
+from datetime import datetime as dt
+from scraping.records import CompletedOffering
+
+ROWS = 100_000
+
+
+def build_dicts() -> list:
+    return [
+        {
+            "ticker": "ABCD",
+            "type": "ATM",
+            "method": "S-3",
+            "share_equivalent": str(index),
+            "price": "1.25",
+            "warrants": "NULL",
+            "offering_amt": str(index * 2),
+            "bank": "H.C. Wainwright",
+            "investors": "NULL",
+            "datetime": dt(2023, 9, 30, 10, 30),
+            "query_date": dt.today(),
+        }
+        for index in range(ROWS)
+    ]
+
+
+def build_records() -> list:
+    query_date = dt.today()
+    return [
+        CompletedOffering(
+            "ABCD", "ATM", "S-3", str(index), "1.25", "NULL",
+            str(index * 2), "H.C. Wainwright", "NULL",
+            dt(2023, 9, 30, 10, 30), query_date,
+        )
+        for index in range(ROWS)
+    ]
+
+
+def measure(builder) -> int:
+    """ Return peak memory, in bytes, used to build the rows """
+
+    tracemalloc.start()
+    rows = builder()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return peak
+
+
+if __name__ == "__main__":
+    for name, builder in (("dicts", build_dicts), ("records", build_records)):
+        peak = measure(builder)
+        print(f"{name:8} {ROWS} rows: peak {peak / 1024 / 1024:.1f} MB")
@@ -1,5 +1,12 @@
 import os
+from time import perf_counter
+from datetime import datetime as dt
+import json
+import hashlib
 from database.mysql import MySQL
+from database.diff import diff_snapshots, normalize_value, get_row_key
+from database.validation import get_column_rules, validate_columns
+from logs import logger
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -7,6 +14,47 @@ DB_HOST = os.getenv("DB_HOST")
 DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASS = os.getenv("DB_PASS")
+DB_PORT = int(os.getenv("DB_PORT", 3306))
+JOB_TIMEOUT = int(os.getenv("JOB_TIMEOUT", 300))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+# Rows per committed chunk in the save methods (0 for one transaction)
+SAVE_CHUNK_ROWS = int(os.getenv("SAVE_CHUNK_ROWS", 0))
+
+# Minutes after which a run still marked as running is considered killed
+# (it can be resumed if it committed chunks)
+RUN_STALE_MINUTES = int(os.getenv("RUN_STALE_MINUTES", 120))
+
+# Natural key fields of each table rows
+NATURAL_KEYS = {
+    "new_filings": ["ticker", "dilution_name", "date_modified"],
+    "completed_offerings": ["ticker", "type", "datetime"],
+    "pending_s1s": ["ticker", "date_first_s1"],
+    "reverse_splits": ["symbol", "effective_date"],
+    "noncompliant": ["ticker", "deficiency", "notification_date"],
+}
+
+# Ticker symbol and company name fields of each table rows. Symbols are
+# saved in the tickers table and referenced by ticker_id. Company names are
+# saved in each row (each site has its own names), and the last name is
+# also kept in tickers
+TICKER_FIELDS = {
+    "new_filings": ("ticker", "company_name"),
+    "completed_offerings": ("ticker", None),
+    "pending_s1s": ("ticker", "company_name"),
+    "reverse_splits": ("symbol", None),
+    "noncompliant": ("ticker", "company"),
+}
+
+# Low-cardinality text fields of each table, saved as codes of
+# dictionary_values (the field name is the dictionary domain)
+DICTIONARY_FIELDS = {
+    "new_filings": ["dilution_type", "dilution_name"],
+    "completed_offerings": ["type", "method", "bank", "investors"],
+    "pending_s1s": ["industry", "status"],
+    "reverse_splits": ["status"],
+    "noncompliant": ["deficiency", "market"],
+}
 
 
 class Database (MySQL):
@@ -14,15 +62,33 @@ class Database (MySQL):
     def __init__(self):
 
         # Connect to mysql
-        super().__init__(DB_HOST, DB_NAME, DB_USER, DB_PASS)
+        super().__init__(DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_PORT)
 
         self.premarket_id = None
+
+        # Dimension tables are updated with its own connection, to commit
+        # them apart from the data transactions
+        self.dimensions_db = MySQL(DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_PORT)
+
+        # Symbol -> ticker id cache, loaded in the first save
+        self.tickers = None
+
+        # (domain, value) -> code and code -> value caches of the
+        # dictionary values, loaded in the first save
+        self.dictionary_codes = None
+        self.dictionary_values = None
+
+        # Columns rules from the schema metadata, loaded in the first save
+        self.column_rules = None
+
+        self.chunk_rows = SAVE_CHUNK_ROWS
     
-    def save_new_filings(self, new_filings_data: list):
+    def save_new_filings(self, new_filings_data: list, run_id: int,
+                         incremental: bool = False):
         """ Save in database the new filings data
 
         Args:
-            new_filings_data (list): dicts with rows data
+            new_filings_data (list): records (or dicts) with rows data
             Structure:
             [
                 {
@@ -35,37 +101,23 @@ class Database (MySQL):
                 },
                 ...
             ]
+            run_id (int): id of the run in scrape_runs
+            incremental (bool, optional): data only has the new rows, so
+                the missing rows are kept. Defaults to False.
+
+        Returns:
+            list: saved rows (without the quarantined rows)
         """
-        
-        for row in new_filings_data:
-            
-            # Generate insert script
-            sql = f""" insert into new_filings (
-                        ticker,
-                        company_name,
-                        dilution_type,
-                        dilution_name,
-                        date_modified,
-                        query_date
-                    ) values (
-                        {self.get_clean_text(row["ticker"])},
-                        {self.get_clean_text(row["company_name"])},
-                        {self.get_clean_text(row["dilution_type"])},
-                        {self.get_clean_text(row["dilution_name"])},
-                        "{row["date_modified"].strftime("%Y-%m-%d")}",
-                        "{row["query_date"].strftime("%Y-%m-%d")}"
-                    )
-            """
-            self.run_sql(sql, auto_commit=False)
-            
-        # Commit changes
-        self.commit_close()
+
+        return self.__save_run__("new_filings", new_filings_data, run_id,
+                                 incremental)
     
-    def save_completed_offerings(self, completed_offerings_data: list):
+    def save_completed_offerings(self, completed_offerings_data: list, run_id: int,
+                                 incremental: bool = False):
         """ Save in database the new completed offerings data
 
         Args:
-            completed_offerings_data (list): dicts with rows data
+            completed_offerings_data (list): records (or dicts) with rows data
             Structure:
             [
                 {
@@ -83,47 +135,22 @@ class Database (MySQL):
                 },
                 ...
             ]
+            run_id (int): id of the run in scrape_runs
+            incremental (bool, optional): data only has the new rows, so
+                the missing rows are kept. Defaults to False.
+
+        Returns:
+            list: saved rows (without the quarantined rows)
         """
+
+        return self.__save_run__("completed_offerings",
+                                 completed_offerings_data, run_id, incremental)
         
-        for row in completed_offerings_data:
-            
-            # Generate insert script
-            sql = f"""insert into completed_offerings (
-                        ticker,
-                        type,
-                        method,
-                        share_equivalent,
-                        price,
-                        warrants,
-                        offering_amt,
-                        bank,
-                        investors,
-                        datetime,
-                        query_date
-                    ) values (
-                        {self.get_clean_text(row["ticker"])},
-                        {self.get_clean_text(row["type"])},
-                        {self.get_clean_text(row["method"])},
-                        {row["share_equivalent"]},
-                        {row["price"]},
-                        {row["warrants"]},
-                        {row["offering_amt"]},
-                        {self.get_clean_text(row["bank"])},
-                        {self.get_clean_text(row["investors"])},
-                        "{row["datetime"].strftime("%Y-%m-%d %H:%M")}",
-                        "{row["query_date"].strftime("%Y-%m-%d")}"
-                    )
-            """
-            self.run_sql(sql, auto_commit=False)
-            
-        # Commit changes
-        self.commit_close()
-        
-    def save_pending_s1s(self, pending_s1s_data: list):
+    def save_pending_s1s(self, pending_s1s_data: list, run_id: int):
         """ Save in database the pending s1s data
 
         Args:
-            pending_s1s_data (list): dicts with rows data
+            pending_s1s_data (list): records (or dicts) with rows data
             Structure:
             [
                 {
@@ -145,64 +172,19 @@ class Database (MySQL):
                 },
                 ...
             ]
+            run_id (int): id of the run in scrape_runs
+
+        Returns:
+            list: saved rows (without the quarantined rows)
         """
+
+        return self.__save_run__("pending_s1s", pending_s1s_data, run_id)
         
-        for row in pending_s1s_data:
-        
-            # Fix fields
-            date_first_s1 = row["date_first_s1"]
-            if date_first_s1 != "NULL":
-                date_first_s1 = f'"{date_first_s1.strftime("%Y-%m-%d")}"'
-            
-            pricing_date = row["pricing_date"]
-            if pricing_date != "NULL":
-                pricing_date = f'"{pricing_date.strftime("%Y-%m-%d")}"'
-            
-            # Generate insert script
-            sql = f"""insert into pending_s1s (
-                        ticker,
-                        company_name,
-                        industry,
-                        date_first_s1,
-                        pricing_date,
-                        anticipated_deal_size,
-                        estimated_warrant_coverage,
-                        underwriters_placement_agents,
-                        float_before_offering,
-                        status,
-                        pricing,
-                        shares_offered,
-                        final_warrant_coverage,
-                        exercise_price,
-                        query_date
-                    ) values (
-                        {self.get_clean_text(row["ticker"])},
-                        {self.get_clean_text(row["company_name"])},
-                        {self.get_clean_text(row["industry"])},
-                        {date_first_s1},
-                        {pricing_date},
-                        {self.get_clean_text(row["anticipated_deal_size"])},
-                        {row["estimated_warrant_coverage"]},
-                        {self.get_clean_text(row["underwriters_placement_agents"])},
-                        {row["float_before_offering"]},
-                        {self.get_clean_text(row["status"])},
-                        {row["pricing"]},
-                        {row["shares_offered"]},
-                        {row["final_warrant_coverage"]},
-                        {row["exercise_price"]},
-                        "{row["query_date"].strftime("%Y-%m-%d")}"
-                    )
-            """
-            self.run_sql(sql, auto_commit=False)
-            
-        # Commit changes
-        self.commit_close()
-        
-    def save_reverse_splits(self, reverse_splits_data: list):
+    def save_reverse_splits(self, reverse_splits_data: list, run_id: int):
         """ Save in database the reverse splits data
 
         Args:
-            reverse_splits_data (list): dicts with rows data
+            reverse_splits_data (list): records (or dicts) with rows data
             Structure:
             [
                 {
@@ -215,42 +197,19 @@ class Database (MySQL):
                 },
                 ...
             ]
+            run_id (int): id of the run in scrape_runs
+
+        Returns:
+            list: saved rows (without the quarantined rows)
         """
-        
-        for row in reverse_splits_data:
-        
-            # Fix fields
-            effective_date = row["effective_date"]
-            if effective_date != "NULL":
-                effective_date = f'"{effective_date.strftime("%Y-%m-%d")}"'
-            
-            # Generate insert script
-            sql = f"""insert into reverse_splits (
-                        symbol,
-                        effective_date,
-                        split_ratio,
-                        current_float_m,
-                        status,
-                        query_date
-                    ) values (
-                        {self.get_clean_text(row["symbol"])},
-                        {effective_date},
-                        {self.get_clean_text(row["split_ratio"])},
-                        {row["current_float_m"]},
-                        {self.get_clean_text(row["status"])},
-                        "{row["query_date"].strftime("%Y-%m-%d")}"
-                    )
-            """
-            self.run_sql(sql, auto_commit=False)
-            
-        # Commit changes
-        self.commit_close()
+
+        return self.__save_run__("reverse_splits", reverse_splits_data, run_id)
     
-    def save_noncompliant_data(self, noncompliant_data: list):
+    def save_noncompliant_data(self, noncompliant_data: list, run_id: int):
         """ Save in database the no compliant data
 
         Args:
-            noncompliant_data (list): dictionaries with no compliant data
+            noncompliant_data (list): records (or dicts) with no compliant data
             
             Structure:
             [
@@ -264,29 +223,942 @@ class Database (MySQL):
                 },
                 ...
             ]
+            run_id (int): id of the run in scrape_runs
+
+        Returns:
+            list: saved rows (without the quarantined rows)
+        """
+
+        return self.__save_run__("noncompliant", noncompliant_data, run_id)
+
+    def __get_sql_value__(self, value):
+        """ Convert a row value to a query parameter: empty values to NULL
+        and texts cleaned like in get_clean_text
+
+        Args:
+            value: row value (str, datetime or number)
+
+        Returns:
+            query parameter
+        """
+
+        if value is None or value == "NULL":
+            return None
+
+        if isinstance(value, str):
+            value = self.get_clean_text(value, add_quotes=False)
+            if value == "NULL":
+                return None
+
+        return value
+
+    def __get_fields__(self, rows: list) -> list:
+        """ Return the database fields of the rows (all except query_date) """
+
+        return [field for field in rows[0].keys() if field != "query_date"]
+
+    def __load_tickers__(self):
+        """ Load all the tickers ids in cache """
+
+        results = self.dimensions_db.run_sql("SELECT id, symbol FROM tickers")
+        self.tickers = {row["symbol"].upper(): row["id"] for row in results}
+
+    def get_ticker_ids(self, rows: list, symbol_field: str,
+                       company_field: str = None) -> list:
+        """ Resolve the rows tickers to ids with the cache. Missing tickers
+        are created in bulk
+
+        Args:
+            rows (list): records or dicts with rows data
+            symbol_field (str): ticker symbol field
+            company_field (str, optional): company name field. Defaults to None.
+
+        Returns:
+            list: ticker id (or None) of each row
+        """
+
+        if self.tickers is None:
+            self.__load_tickers__()
+
+        symbols = []
+        missing = {}
+        for row in rows:
+            symbol = self.__get_sql_value__(row[symbol_field])
+            symbol = symbol.strip().upper() if symbol else None
+            symbols.append(symbol)
+
+            if symbol and symbol not in self.tickers and symbol not in missing:
+                company = None
+                if company_field:
+                    company = self.__get_sql_value__(row[company_field])
+                missing[symbol] = company
+
+        if missing:
+            sql = """
+                INSERT INTO tickers (symbol, company_name)
+                VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE
+                    company_name = COALESCE(VALUES(company_name), company_name)
+            """
+            self.dimensions_db.run_many(sql, list(missing.items()))
+
+            symbols_sql = ", ".join(self.get_clean_text(symbol)
+                                    for symbol in missing)
+            sql = f"SELECT id, symbol FROM tickers WHERE symbol IN ({symbols_sql})"
+            for row in self.dimensions_db.run_sql(sql):
+                self.tickers[row["symbol"].upper()] = row["id"]
+
+        return [self.tickers.get(symbol) for symbol in symbols]
+
+    def __load_dictionary__(self):
+        """ Load all the dictionary values in cache """
+
+        sql = "SELECT id, domain, value FROM dictionary_values"
+        self.dictionary_codes = {}
+        self.dictionary_values = {}
+        for row in self.dimensions_db.run_sql(sql):
+            self.dictionary_codes[(row["domain"], row["value"])] = row["id"]
+            self.dictionary_values[row["id"]] = row["value"]
+
+    def get_dictionary_codes(self, domain: str, values: list) -> list:
+        """ Encode the values of a field with the cache. Missing values
+        are created in bulk
+
+        Args:
+            domain (str): dictionary domain (field name)
+            values (list): field values, already converted to query
+                parameters (None for empty values)
+
+        Returns:
+            list: code (or None) of each value
         """
 
-        for row in noncompliant_data:
+        if self.dictionary_codes is None:
+            self.__load_dictionary__()
+
+        missing = {value for value in values
+                   if value is not None
+                   and (domain, value) not in self.dictionary_codes}
+        if missing:
+            sql = """
+                INSERT IGNORE INTO dictionary_values (domain, value)
+                VALUES (%s, %s)
+            """
+            self.dimensions_db.run_many(
+                sql, [(domain, value) for value in missing])
 
-            # Save row data
+            # Parameters, to read back the values as they are saved
+            placeholders = ", ".join(["%s"] * len(missing))
             sql = f"""
-                INSERT INTO noncompliant (
-                    ticker,
-                    company,
-                    deficiency,
-                    market,
-                    notification_date,
-                    query_date
-                ) VALUES (
-                    {self.get_clean_text(row["ticker"])},
-                    {self.get_clean_text(row["company"])},
-                    {self.get_clean_text(row["deficiency"])},
-                    {self.get_clean_text(row["market"])},
-                    "{row["notification_date"].strftime("%Y-%m-%d")}",
-                    "{row["query_date"].strftime("%Y-%m-%d")}"
-                )
+                SELECT id, value
+                FROM dictionary_values
+                WHERE domain = %s
+                    AND value IN ({placeholders})
+            """
+            params = (domain,) + tuple(missing)
+            for row in self.dimensions_db.run_sql(sql, params=params):
+                self.dictionary_codes[(domain, row["value"])] = row["id"]
+                self.dictionary_values[row["id"]] = row["value"]
+
+        return [self.dictionary_codes.get((domain, value)) for value in values]
+
+    def get_dictionary_value(self, code: int) -> str:
+        """ Decode a dictionary code with the cache
+
+        Args:
+            code (int): dictionary value id
+
+        Returns:
+            str: value, or None if the code is not found
+        """
+
+        if self.dictionary_values is None:
+            self.__load_dictionary__()
+        return self.dictionary_values.get(code)
+
+    def __get_db_rows__(self, table_name: str, rows: list) -> tuple:
+        """ Convert rows to database columns and values: tickers are replaced
+        by ticker_id, and the dictionary fields by their codes
+
+        Args:
+            table_name (str): table name
+            rows (list): records or dicts with rows data
+
+        Returns:
+            tuple: columns names and values tuples
+        """
+
+        symbol_field, company_field = TICKER_FIELDS[table_name]
+        fields = [field for field in self.__get_fields__(rows)
+                  if field != symbol_field]
+        ticker_ids = self.get_ticker_ids(rows, symbol_field, company_field)
+
+        # Values by column, encoding the dictionary fields
+        dictionary_fields = DICTIONARY_FIELDS.get(table_name, [])
+        columns = ["ticker_id"]
+        columns_values = [ticker_ids]
+        for field in fields:
+            values = [self.__get_sql_value__(row[field]) for row in rows]
+            if field in dictionary_fields:
+                values = [value.strip() if value is not None else None
+                          for value in values]
+                columns.append(f"{field}_id")
+                columns_values.append(self.get_dictionary_codes(field, values))
+            else:
+                columns.append(field)
+                columns_values.append(values)
+
+        return columns, list(zip(*columns_values))
+
+    def insert_rows(self, table_name: str, rows: list, run_id: int,
+                    auto_commit: bool = False):
+        """ Insert rows in bulk (multi row inserts), without commit by default
+
+        Args:
+            table_name (str): table name
+            rows (list): records or dicts with rows data
+            run_id (int): id of the run in scrape_runs
+            auto_commit (bool, optional): commit changes. Defaults to False.
+        """
+
+        if not rows:
+            return
+
+        columns, values = self.__get_db_rows__(table_name, rows)
+        columns_sql = ", ".join(f"`{column}`" for column in columns + ["run_id"])
+        placeholders = ", ".join(["%s"] * (len(columns) + 1))
+        sql = f"INSERT INTO {table_name} ({columns_sql}) VALUES ({placeholders})"
+
+        values = [row_values + (run_id,) for row_values in values]
+        self.run_many(sql, values, auto_commit=auto_commit)
+
+    def __clean_key_text__(self, text: str) -> str:
+        """ Clean a text like the save methods (for keys and diffs) """
+
+        return self.get_clean_text(text, add_quotes=False)
+
+    def get_row_key(self, table_name: str, row, occurrence: int = 1) -> str:
+        """ Return the hash of the row natural key, used as primary key in
+        the current tables. Repeated keys get an occurrence suffix, like in
+        the snapshot diff. Values are normalized like they are saved, so
+        scraped and saved rows get the same key
+
+        Args:
+            table_name (str): table name
+            row (Record or dict): row data
+            occurrence (int, optional): occurrence of the natural key in the
+                run. Defaults to 1.
+
+        Returns:
+            str: sha1 hex digest
+        """
+
+        key_fields = NATURAL_KEYS[table_name]
+        symbol_field = TICKER_FIELDS[table_name][0]
+        values = {field: normalize_value(row[field], self.__clean_key_text__,
+                                         field == symbol_field)
+                  for field in key_fields}
+        key = get_row_key(values, key_fields)
+        if occurrence > 1:
+            key = f"{key}#{occurrence}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get_row_keys(self, table_name: str, rows: list) -> list:
+        """ Return the row keys of the rows of a run, numbering the repeated
+        natural keys, so all the rows are kept in the current table
+
+        Args:
+            table_name (str): table name
+            rows (list): records or dicts with the run rows
+
+        Returns:
+            list: sha1 hex digest of each row
+        """
+
+        occurrences = {}
+        keys = []
+        for row in rows:
+            key = self.get_row_key(table_name, row)
+            occurrence = occurrences.get(key, 0) + 1
+            occurrences[key] = occurrence
+            if occurrence > 1:
+                key = self.get_row_key(table_name, row, occurrence)
+            keys.append(key)
+
+        repeated = sum(1 for count in occurrences.values() if count > 1)
+        if repeated:
+            logger.warning(f"Table {table_name}: {repeated} natural keys "
+                           "repeated in the run, saved with occurrence "
+                           "suffix")
+        return keys
+
+    def update_current(self, table_name: str, rows: list, run_id: int,
+                       delete_missing: bool = True, auto_commit: bool = False,
+                       row_keys: list = None):
+        """ Upsert the rows in the current table of the table by natural key,
+        and delete the rows that are not in the run
+
+        Args:
+            table_name (str): table name
+            rows (list): records or dicts with the full table snapshot
+            run_id (int): id of the run in scrape_runs
+            delete_missing (bool, optional): delete rows of previous runs.
+                Defaults to True.
+            auto_commit (bool, optional): commit changes. Defaults to False.
+            row_keys (list, optional): keys of the rows (from get_row_keys
+                with all the run rows). Defaults to None (keys of rows).
+        """
+
+        if rows:
+            columns, values = self.__get_db_rows__(table_name, rows)
+            columns += ["run_id"]
+            columns_sql = ", ".join(f"`{column}`"
+                                    for column in ["row_key"] + columns)
+            placeholders = ", ".join(["%s"] * (len(columns) + 1))
+            updates = ", ".join(f"`{column}` = VALUES(`{column}`)"
+                                for column in columns)
+            sql = f"""
+                INSERT INTO {table_name}_current ({columns_sql})
+                VALUES ({placeholders})
+                ON DUPLICATE KEY UPDATE {updates}
+            """
+
+            row_keys = row_keys or self.get_row_keys(table_name, rows)
+            values = [
+                (row_key,) + row_values + (run_id,)
+                for row_key, row_values in zip(row_keys, values)
+            ]
+            self.run_many(sql, values, auto_commit=False)
+
+        if delete_missing:
+            sql = f"DELETE FROM {table_name}_current WHERE run_id <> {run_id}"
+            self.run_sql(sql, auto_commit=False)
+
+        if auto_commit:
+            self.commit_close()
+
+    def __load_column_rules__(self):
+        """ Load the validation rules of all the columns from the schema """
+
+        sql = """
+            SELECT
+                TABLE_NAME AS table_name,
+                COLUMN_NAME AS column_name,
+                DATA_TYPE AS data_type,
+                COLUMN_TYPE AS column_type,
+                CHARACTER_MAXIMUM_LENGTH AS max_length,
+                IS_NULLABLE AS is_nullable
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+        """
+        self.column_rules = get_column_rules(self.dimensions_db.run_sql(sql))
+
+    def validate_rows(self, table_name: str, rows: list, run_id: int,
+                      quarantine: bool = True) -> list:
+        """ Validate the rows column by column against the schema (lengths,
+        numeric ranges and null rules). Invalid rows are saved in
+        quarantine_rows with the reasons, without commit
+
+        Args:
+            table_name (str): table name
+            rows (list): records or dicts with rows data
+            run_id (int): id of the run in scrape_runs
+            quarantine (bool, optional): save the invalid rows in
+                quarantine_rows. Defaults to True.
+
+        Returns:
+            list: valid rows
+        """
+
+        if not rows:
+            return rows
+
+        if self.column_rules is None:
+            self.__load_column_rules__()
+
+        # Rules of the rows fields. Tickers are saved in tickers and
+        # dictionary fields in dictionary_values
+        table_rules = self.column_rules.get(table_name, {})
+        ticker_rules = self.column_rules.get("tickers", {})
+        value_rule = self.column_rules.get("dictionary_values", {}).get("value")
+        symbol_field = TICKER_FIELDS[table_name][0]
+        dictionary_fields = DICTIONARY_FIELDS.get(table_name, [])
+        rules = {}
+        for field in self.__get_fields__(rows):
+            if field == symbol_field and "symbol" in ticker_rules:
+                rules[field] = dict(ticker_rules["symbol"], nullable=True)
+            elif field in dictionary_fields and value_rule:
+                rules[field] = dict(value_rule, nullable=True)
+            elif field in table_rules:
+                rules[field] = table_rules[field]
+
+        columns = {
+            field: [self.__get_sql_value__(row[field]) for row in rows]
+            for field in rules
+        }
+        rejected = validate_columns(columns, rules)
+        if not rejected:
+            return rows
+        if not quarantine:
+            return [row for index, row in enumerate(rows)
+                    if index not in rejected]
+
+        # Save invalid rows in quarantine
+        sql = """
+            INSERT INTO quarantine_rows (table_name, run_id, reasons, row_data)
+            VALUES (%s, %s, %s, %s)
+        """
+        self.run_many(sql, [
+            (table_name, run_id, "; ".join(reasons)[:1000],
+             json.dumps({field: rows[index][field]
+                         for field in rows[index].keys()}, default=str))
+            for index, reasons in rejected.items()
+        ], auto_commit=False)
+
+        logger.warning(f"Table {table_name}: {len(rejected)} rows "
+                       "sent to quarantine")
+        return [row for index, row in enumerate(rows) if index not in rejected]
+
+    def __save_run__(self, table_name: str, rows: list, run_id: int,
+                     incremental: bool = False) -> list:
+        """ Validate and insert the run rows, update the current table and
+        mark the run as complete. With chunk_rows, the rows are staged in the
+        history table in committed chunks with a checkpoint in scrape_runs,
+        and a resumed run skips the rows already committed. The current
+        table is updated (and the missing rows deleted) and the run is
+        completed in the last transaction, so readers never see two runs
+
+        Args:
+            table_name (str): table name
+            rows (list): records or dicts with rows data
+            run_id (int): id of the run in scrape_runs
+            incremental (bool, optional): rows are only the new rows of the
+                table. Defaults to False.
+
+        Returns:
+            list: saved rows
+        """
+
+        # An empty full run after a run with rows is a failed page load:
+        # saving it would delete the current table
+        if not rows and not incremental:
+            last_run = self.get_latest_complete_run(table_name, mode="full")
+            if last_run and last_run["row_count"]:
+                raise ValueError(
+                    f"Table {table_name}: full run {run_id} has no rows, "
+                    f"previous run {last_run['id']} had "
+                    f"{last_run['row_count']}")
+
+        checkpoint = self.get_run_checkpoint(run_id)
+        rows = self.validate_rows(table_name, rows, run_id,
+                                  quarantine=not checkpoint)
+
+        # Skip the rows committed before the run failed
+        row_keys = self.get_row_keys(table_name, rows)
+        pending = list(zip(rows, row_keys))
+        if checkpoint:
+            saved_keys = self.__get_run_keys__(table_name, run_id)
+            pending = [(row, row_key) for row, row_key in pending
+                       if row_key not in saved_keys]
+            logger.info(f"Table {table_name}: resuming run {run_id} from "
+                        f"{checkpoint} committed rows")
+
+        chunk_rows = self.chunk_rows or len(pending) or 1
+        latencies = []
+        for start in range(0, len(pending), chunk_rows):
+            chunk_start = perf_counter()
+            chunk = [row for row, _ in pending[start:start + chunk_rows]]
+            self.insert_rows(table_name, chunk, run_id)
+
+            # Save checkpoint and commit chunk
+            if self.chunk_rows:
+                checkpoint += len(chunk)
+                self.__set_checkpoint__(run_id, checkpoint)
+                self.commit_close()
+                latencies.append(perf_counter() - chunk_start)
+
+        # Update current table, delete missing rows, mark run as complete
+        # and commit changes
+        self.update_current(table_name, rows, run_id,
+                            delete_missing=not incremental, row_keys=row_keys)
+        self.finish_run(run_id, len(rows), auto_commit=False)
+        self.commit_close()
+
+        if latencies:
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            logger.info(f"Table {table_name}: {len(latencies)} chunks of "
+                        f"{self.chunk_rows} rows, chunk latency p50 "
+                        f"{p50:.1f}ms p99 {p99:.1f}ms, total "
+                        f"{sum(latencies):.2f}s")
+
+        return rows
+
+    def get_run_checkpoint(self, run_id: int) -> int:
+        """ Return the rows committed by a run in previous chunks
+
+        Args:
+            run_id (int): run id
+
+        Returns:
+            int: committed rows
+        """
+
+        sql = f"SELECT checkpoint_rows FROM scrape_runs WHERE id = {run_id}"
+        results = self.run_sql(sql, auto_commit=False)
+        return results[0]["checkpoint_rows"] if results else 0
+
+    def __set_checkpoint__(self, run_id: int, checkpoint: int):
+        """ Save the committed rows of a run, without commit """
+
+        sql = f"""
+            UPDATE scrape_runs
+            SET checkpoint_rows = {checkpoint}
+            WHERE id = {run_id}
+        """
+        self.run_sql(sql, auto_commit=False)
+
+    def __get_run_keys__(self, table_name: str, run_id: int) -> set:
+        """ Return the row keys of the rows committed by a run in the
+        history table """
+
+        rows = self.get_run_rows(table_name, run_id)
+        return set(self.get_row_keys(table_name, rows))
+
+    def resume_run(self, table_name: str, mode: str = "full") -> int:
+        """ Restart the last run of the table if it failed (or it was killed:
+        still running after RUN_STALE_MINUTES) after committing chunks, so
+        the next save continues from its checkpoint
+
+        Args:
+            table_name (str): table key
+            mode (str, optional): run mode (full or incremental).
+                Defaults to "full".
+
+        Returns:
+            int: run id, or None if there is no run to resume
+        """
+
+        sql = f"""
+            SELECT id, status, mode, checkpoint_rows,
+                started_at < NOW() - INTERVAL {RUN_STALE_MINUTES} MINUTE
+                    AS is_stale
+            FROM scrape_runs
+            WHERE table_name = {self.get_clean_text(table_name)}
+                AND mode <> 'backfill'
+            ORDER BY id DESC
+            LIMIT 1
+        """
+        results = self.run_sql(sql)
+        if not results:
+            return None
+
+        run = results[0]
+        is_killed = run["status"] == "running" and run["is_stale"]
+        if run["status"] != "failed" and not is_killed:
+            return None
+        if run["mode"] != mode or not run["checkpoint_rows"]:
+            return None
+
+        sql = f"UPDATE scrape_runs SET status = 'running' WHERE id = {run['id']}"
+        self.run_sql(sql)
+        return run["id"]
+
+    def load_snapshot(self, table_name: str, rows: list, started_at: dt,
+                      chunk_size: int = 5000) -> int:
+        """ Bulk load a full table snapshot (like a backfilled page) as a
+        complete backfill run, inserting the rows in chunks in one
+        transaction. Backfill runs are only history: they are not used as
+        latest run, diff or fingerprint baseline
+
+        Args:
+            table_name (str): table name
+            rows (list): records or dicts with rows data
+            started_at (datetime): snapshot date
+            chunk_size (int, optional): rows per insert batch. Defaults to 5000.
+
+        Returns:
+            int: run id
+        """
+
+        run_id = self.start_run(table_name, started_at, mode="backfill")
+        rows = self.validate_rows(table_name, rows, run_id)
+        for start in range(0, len(rows), chunk_size):
+            self.insert_rows(table_name, rows[start:start + chunk_size], run_id)
+
+        # Mark run as complete and commit changes
+        self.finish_run(run_id, len(rows), auto_commit=False)
+        self.commit_close()
+
+        return run_id
+
+    def start_run(self, table_name: str, started_at: dt = None,
+                  mode: str = "full") -> int:
+        """ Register the start of a table run
+
+        Args:
+            table_name (str): table key
+            started_at (datetime, optional): run date. Defaults to now.
+            mode (str, optional): full (all table rows), incremental
+                (only the new rows) or backfill (saved page). Defaults to
+                "full".
+
+        Returns:
+            int: run id
+        """
+
+        started_at = started_at or dt.now()
+        sql = f"""
+            INSERT INTO scrape_runs (table_name, mode, started_at)
+            VALUES (
+                {self.get_clean_text(table_name)},
+                {self.get_clean_text(mode)},
+                "{started_at.strftime("%Y-%m-%d %H:%M:%S")}"
+            )
+        """
+        self.run_sql(sql)
+        return self.cursor.lastrowid
+
+    def finish_run(self, run_id: int, row_count: int, status: str = "complete",
+                   auto_commit: bool = True):
+        """ Register the end of a table run. Save methods call it in the
+        same transaction of the rows, so incomplete runs are never visible
+
+        Args:
+            run_id (int): run id
+            row_count (int): saved rows
+            status (str, optional): complete, failed or unchanged (the table
+                didn't change since the last complete run). Defaults to
+                "complete".
+            auto_commit (bool, optional): commit changes. Defaults to True.
+        """
+
+        sql = f"""
+            UPDATE scrape_runs
+            SET status = {self.get_clean_text(status)},
+                row_count = {row_count},
+                finished_at = NOW()
+            WHERE id = {run_id}
+        """
+        self.run_sql(sql, auto_commit=auto_commit)
+
+    def set_run_fingerprint(self, run_id: int, fingerprint: str):
+        """ Save the text fingerprint of the table scraped in a run
+
+        Args:
+            run_id (int): run id
+            fingerprint (str): table fingerprint from the scraper
+        """
+
+        sql = f"""
+            UPDATE scrape_runs
+            SET fingerprint = {self.get_clean_text(fingerprint)}
+            WHERE id = {run_id}
+        """
+        self.run_sql(sql)
+
+    def get_latest_complete_run(self, table_name: str,
+                                mode: str = "full") -> dict:
+        """ Return the last complete run of a table. Incremental runs are
+        partial snapshots, so only full runs are returned by default
+
+        Args:
+            table_name (str): table key
+            mode (str, optional): only runs in this mode (full or
+                incremental), or None for both modes (backfill runs are
+                always excluded). Defaults to "full".
+
+        Returns:
+            dict: run data (id, table_name, status, mode, row_count,
+                fingerprint, started_at, finished_at) or None if the table has no
+                complete runs
+        """
+
+        mode_filter = "AND mode <> 'backfill'"
+        if mode:
+            mode_filter = f"AND mode = {self.get_clean_text(mode)}"
+
+        sql = f"""
+            SELECT *
+            FROM scrape_runs
+            WHERE table_name = {self.get_clean_text(table_name)}
+                AND status = 'complete'
+                {mode_filter}
+            ORDER BY id DESC
+            LIMIT 1
+        """
+        results = self.run_sql(sql)
+        return results[0] if results else None
+
+    def get_latest_run_ids(self, mode: str = "full") -> dict:
+        """ Return the last complete run id of each table. Incremental runs
+        are partial snapshots, so only full runs are returned by default
+
+        Args:
+            mode (str, optional): only runs in this mode (full or
+                incremental), or None for both modes (backfill runs are
+                always excluded). Defaults to "full".
+
+        Returns:
+            dict: table name -> run id
+        """
+
+        mode_filter = "AND mode <> 'backfill'"
+        if mode:
+            mode_filter = f"AND mode = {self.get_clean_text(mode)}"
+
+        sql = f"""
+            SELECT table_name, MAX(id) AS run_id
+            FROM scrape_runs
+            WHERE status = 'complete'
+                {mode_filter}
+            GROUP BY table_name
+        """
+        results = self.run_sql(sql)
+        return {row["table_name"]: row["run_id"] for row in results}
+
+    def get_current_rows(self, table_name: str) -> list:
+        """ Return the current rows of a table
+
+        Args:
+            table_name (str): table key
+
+        Returns:
+            list: dicts with rows data
+        """
+
+        sql = f"SELECT * FROM {table_name}_current_view"
+        return self.run_sql(sql)
+
+    def get_current_keys(self, table_name: str) -> set:
+        """ Return the row keys of the current table, used as high-water mark
+        of the incremental scrapes
+
+        Args:
+            table_name (str): table key
+
+        Returns:
+            set: row keys (see get_row_key)
+        """
+
+        sql = f"SELECT row_key FROM {table_name}_current"
+        return {row["row_key"] for row in self.run_sql(sql) or []}
+
+    def get_run_rows(self, table_name: str, run_id: int) -> list:
+        """ Return the rows saved in a run
+
+        Args:
+            table_name (str): table key
+            run_id (int): run id
+
+        Returns:
+            list: dicts with rows data
+        """
+
+        sql = f"""
+            SELECT *
+            FROM {table_name}_view
+            WHERE run_id = {run_id}
+            ORDER BY id
+        """
+        return self.run_sql(sql)
+
+    def save_changes(self, table_name: str, rows: list, run_id: int) -> int:
+        """ Compare the run rows with the previous complete full run and save
+        the inserted, removed and changed rows in snapshot_changes.
+        Incremental runs are partial snapshots, so their rows are recorded
+        by the diff of the next full run
+
+        Args:
+            table_name (str): table key
+            rows (list): records or dicts saved in the run
+            run_id (int): run id (of a full run)
+
+        Returns:
+            int: number of changes
+        """
+
+        # Previous complete full run
+        sql = f"""
+            SELECT id
+            FROM scrape_runs
+            WHERE table_name = {self.get_clean_text(table_name)}
+                AND status = 'complete'
+                AND mode = 'full'
+                AND id < {run_id}
+            ORDER BY id DESC
+            LIMIT 1
+        """
+        results = self.run_sql(sql)
+        if not results:
+            return 0
+        previous_run_id = results[0]["id"]
+        previous_rows = self.get_run_rows(table_name, previous_run_id)
+
+        # Compare data fields
+        if rows:
+            fields = self.__get_fields__(rows)
+        elif previous_rows:
+            fields = [field for field in previous_rows[0].keys()
+                      if field not in ("id", "run_id")]
+        else:
+            return 0
+
+        key_fields = NATURAL_KEYS[table_name]
+        symbol_field = TICKER_FIELDS[table_name][0]
+        changes = diff_snapshots(previous_rows, rows, key_fields, fields,
+                                 self.__clean_key_text__, [symbol_field])
+
+        sql = """
+            INSERT INTO snapshot_changes (
+                table_name,
+                run_id,
+                previous_run_id,
+                change_type,
+                row_key,
+                deltas
+            ) VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        self.run_many(sql, [
+            (table_name, run_id, previous_run_id, change_type, row_key[:255],
+             json.dumps(deltas))
+            for change_type, row_key, deltas in changes
+        ])
+
+        return len(changes)
+
+    def enqueue_jobs(self, table_names: list):
+        """ Create pending scrape jobs
+
+        Args:
+            table_names (list): table keys to scrape
+        """
+
+        for table_name in table_names:
+            sql = f"""
+                INSERT INTO scrape_jobs (table_name)
+                VALUES ({self.get_clean_text(table_name)})
             """
             self.run_sql(sql, auto_commit=False)
 
         # Commit changes
-        self.commit_close()
\ No newline at end of file
+        self.commit_close()
+
+    def claim_job(self, worker: str) -> dict:
+        """ Claim the next pending job (or a running job without heartbeat).
+        Locked jobs are skipped, so workers never claim the same job
+
+        Args:
+            worker (str): worker name
+
+        Returns:
+            dict: job data (id, table_name, attempts) or None if there are
+                no jobs
+        """
+
+        sql = f"""
+            SELECT id, table_name, attempts
+            FROM scrape_jobs
+            WHERE status = 'pending'
+                OR (
+                    status = 'running'
+                    AND heartbeat_at < NOW() - INTERVAL {JOB_TIMEOUT} SECOND
+                )
+            ORDER BY id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        """
+        results = self.run_sql(sql, auto_commit=False)
+        if not results:
+            self.commit_close()
+            return None
+
+        job = results[0]
+        sql = f"""
+            UPDATE scrape_jobs
+            SET status = 'running',
+                worker = {self.get_clean_text(worker)},
+                claimed_at = NOW(),
+                heartbeat_at = NOW()
+            WHERE id = {job["id"]}
+        """
+        self.run_sql(sql, auto_commit=False)
+
+        # Commit changes
+        self.commit_close()
+
+        return job
+
+    def __get_job_filter__(self, job_id: int, worker: str) -> str:
+        """ Sql filter of a job still claimed by the worker (stale jobs can
+        be reclaimed by other workers) """
+
+        return f"""
+            id = {job_id}
+            AND worker = {self.get_clean_text(worker)}
+            AND status = 'running'
+        """
+
+    def heartbeat_job(self, job_id: int, worker: str) -> bool:
+        """ Update job heartbeat to keep it claimed
+
+        Args:
+            job_id (int): job id
+            worker (str): worker name that claimed the job
+
+        Returns:
+            bool: False if the job is not claimed by the worker anymore
+        """
+
+        sql = f"""
+            UPDATE scrape_jobs
+            SET heartbeat_at = NOW()
+            WHERE {self.__get_job_filter__(job_id, worker)}
+        """
+        self.run_sql(sql)
+        return self.cursor.rowcount > 0
+
+    def release_job(self, job_id: int, worker: str, error: str) -> bool:
+        """ Return a failed job to the queue, or mark it as failed after
+        JOB_MAX_ATTEMPTS attempts
+
+        Args:
+            job_id (int): job id
+            worker (str): worker name that claimed the job
+            error (str): error message
+
+        Returns:
+            bool: False if the job is not claimed by the worker anymore
+        """
+
+        sql = f"""
+            UPDATE scrape_jobs
+            SET status = IF(attempts + 1 >= {JOB_MAX_ATTEMPTS}, 'failed', 'pending'),
+                attempts = attempts + 1,
+                worker = NULL,
+                error = {self.get_clean_text(error[:500])}
+            WHERE {self.__get_job_filter__(job_id, worker)}
+        """
+        self.run_sql(sql)
+        return self.cursor.rowcount > 0
+
+    def finish_job(self, job_id: int, worker: str) -> bool:
+        """ Mark job as done
+
+        Args:
+            job_id (int): job id
+            worker (str): worker name that claimed the job
+
+        Returns:
+            bool: False if the job is not claimed by the worker anymore
+        """
+
+        sql = f"""
+            UPDATE scrape_jobs
+            SET status = 'done',
+                finished_at = NOW()
+            WHERE {self.__get_job_filter__(job_id, worker)}
+        """
+        self.run_sql(sql)
+        return self.cursor.rowcount > 0
@@ -1,61 +1,210 @@
+CREATE TABLE `tickers` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `symbol` varchar(20) NOT NULL UNIQUE,
+  `company_name` varchar(200)
+);
+
+CREATE TABLE `dictionary_values` (
+  `id` mediumint unsigned PRIMARY KEY AUTO_INCREMENT,
+  `domain` varchar(40) NOT NULL,
+  `value` varchar(200) COLLATE utf8mb4_bin NOT NULL,
+  UNIQUE INDEX `dictionary_values_domain` (`domain`, `value`)
+);
+
+CREATE TABLE `scrape_runs` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'running',
+  `mode` varchar(12) NOT NULL DEFAULT 'full',
+  `row_count` int,
+  `checkpoint_rows` int NOT NULL DEFAULT 0,
+  `fingerprint` varchar(40),
+  `started_at` datetime NOT NULL,
+  `finished_at` datetime,
+  INDEX `scrape_runs_latest` (`table_name`, `status`, `id`)
+);
+
 CREATE TABLE `new_filings` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `ticker` varchar(5),
-  `company_name` varchar(100),
-  `dilution_type` varchar(50),
-  `dilution_name` varchar(50),
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `dilution_type_id` mediumint unsigned,
+  `dilution_name_id` mediumint unsigned,
   `date_modified` date,
-  `query_date` date
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `completed_offerings` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `ticker` varchar(5),
-  `type` varchar(50),
-  `method` varchar(5),
+  `ticker_id` int,
+  `type_id` mediumint unsigned,
+  `method_id` mediumint unsigned,
   `share_equivalent` bigint,
   `price` float,
+  `warrants` bigint,
   `offering_amt` bigint,
-  `bank` varchar(50),
-  `investors` varchar(50),
+  `bank_id` mediumint unsigned,
+  `investors_id` mediumint unsigned,
   `datetime` date,
-  `query_date` date
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `pending_s1s` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `ticker` varchar(5),
-  `company_name` varchar(50),
-  `industry` varchar(50),
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `industry_id` mediumint unsigned,
   `date_first_s1` date,
   `pricing_date` date,
   `anticipated_deal_size` varchar(20),
   `estimated_warrant_coverage` int,
   `underwriters_placement_agents` varchar(20),
   `float_before_offering` bigint,
-  `status` varchar(20),
+  `status_id` mediumint unsigned,
   `pricing` float,
   `shares_offered` bigint,
   `final_warrant_coverage` int,
   `exercise_price` float,
-  `query_date` date
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `reverse_splits` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `symbol` varchar(5),
+  `ticker_id` int,
   `effective_date` date,
   `split_ratio` varchar(15),
   `current_float_m` float,
-  `status` varchar(20),
-  `query_date` date
+  `status_id` mediumint unsigned,
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `noncompliant` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
+  `ticker_id` int,
+  `company` varchar(200),
+  `deficiency_id` mediumint unsigned,
+  `market_id` mediumint unsigned,
+  `notification_date` date,
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
+);
+
+CREATE TABLE `scrape_jobs` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'pending',
+  `worker` varchar(100),
+  `attempts` int NOT NULL DEFAULT 0,
+  `error` varchar(500),
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `claimed_at` datetime,
+  `heartbeat_at` datetime,
+  `finished_at` datetime,
+  INDEX `scrape_jobs_status` (`status`, `heartbeat_at`)
+);
+
+CREATE TABLE `snapshot_changes` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `run_id` int NOT NULL,
+  `previous_run_id` int NOT NULL,
+  `change_type` varchar(10) NOT NULL,
+  `row_key` varchar(255) NOT NULL,
+  `deltas` json,
+  INDEX `snapshot_changes_run` (`table_name`, `run_id`),
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`)
+);
+
+CREATE TABLE `quarantine_rows` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `run_id` int NOT NULL,
+  `reasons` varchar(1000) NOT NULL,
+  `row_data` json,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX `quarantine_rows_run` (`table_name`, `run_id`),
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`)
+);
+
+CREATE TABLE `new_filings_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `dilution_type_id` mediumint unsigned,
+  `dilution_name_id` mediumint unsigned,
+  `date_modified` date,
+  `run_id` int NOT NULL,
+  INDEX `new_filings_current_run` (`run_id`),
+  INDEX `new_filings_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `completed_offerings_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `type_id` mediumint unsigned,
+  `method_id` mediumint unsigned,
+  `share_equivalent` bigint,
+  `price` float,
+  `warrants` bigint,
+  `offering_amt` bigint,
+  `bank_id` mediumint unsigned,
+  `investors_id` mediumint unsigned,
+  `datetime` date,
+  `run_id` int NOT NULL,
+  INDEX `completed_offerings_current_run` (`run_id`),
+  INDEX `completed_offerings_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `pending_s1s_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `industry_id` mediumint unsigned,
+  `date_first_s1` date,
+  `pricing_date` date,
+  `anticipated_deal_size` varchar(20),
+  `estimated_warrant_coverage` int,
+  `underwriters_placement_agents` varchar(20),
+  `float_before_offering` bigint,
+  `status_id` mediumint unsigned,
+  `pricing` float,
+  `shares_offered` bigint,
+  `final_warrant_coverage` int,
+  `exercise_price` float,
+  `run_id` int NOT NULL,
+  INDEX `pending_s1s_current_run` (`run_id`),
+  INDEX `pending_s1s_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `reverse_splits_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `effective_date` date,
+  `split_ratio` varchar(15),
+  `current_float_m` float,
+  `status_id` mediumint unsigned,
+  `run_id` int NOT NULL,
+  INDEX `reverse_splits_current_run` (`run_id`),
+  INDEX `reverse_splits_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `noncompliant_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
   `company` varchar(200),
-  `deficiency` varchar(50),
-  `market` varchar(5),
+  `deficiency_id` mediumint unsigned,
+  `market_id` mediumint unsigned,
   `notification_date` date,
-  `query_date` date
+  `run_id` int NOT NULL,
+  INDEX `noncompliant_current_run` (`run_id`),
+  INDEX `noncompliant_current_ticker` (`ticker_id`)
 );
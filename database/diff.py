@@ -0,0 +1,134 @@
+from datetime import date
+
+
+def normalize_value(value, clean_text=None, upper=False):
+    """ Convert scraped and database values to comparable strings
+
+    Args:
+        value: scraped (str, datetime) or database (str, date, number) value
+        clean_text (callable, optional): function to clean texts like the
+            save methods do. Defaults to None.
+        upper (bool, optional): upper case texts (like the saved ticker
+            symbols). Defaults to False.
+
+    Returns:
+        str: normalized value or None for empty values
+    """
+
+    if value is None or value == "NULL" or value == "":
+        return None
+
+    # Dates are saved without time
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+
+    # Numbers: integers without decimals and floats with float precision
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is not None:
+        if number.is_integer():
+            return str(int(number))
+        return f"{number:.6g}"
+
+    # Texts cleaned before stripping, like the save methods
+    value = str(value)
+    if clean_text:
+        value = clean_text(value)
+    value = value.strip()
+    if upper:
+        value = value.upper()
+    return value or None
+
+
+def get_row_key(values: dict, key_fields: list) -> str:
+    """ Return the natural key of a normalized row
+
+    Args:
+        values (dict): normalized row
+        key_fields (list): natural key fields
+
+    Returns:
+        str: key values joined with "|"
+    """
+
+    return "|".join(str(values[field]) for field in key_fields)
+
+
+def index_rows(rows: list, key_fields: list, fields: list,
+               clean_text=None, upper_fields: list = []) -> dict:
+    """ Build a hash table of normalized rows by natural key. Repeated keys
+    get an occurrence suffix, to keep all rows
+
+    Args:
+        rows (list): records or dicts
+        key_fields (list): natural key fields
+        fields (list): fields to compare
+        clean_text (callable, optional): text cleaning function
+        upper_fields (list, optional): fields saved in upper case
+
+    Returns:
+        dict: row key -> normalized row dict
+    """
+
+    indexed = {}
+    for row in rows:
+        values = {field: normalize_value(row[field], clean_text,
+                                         field in upper_fields)
+                  for field in fields}
+        key = get_row_key(values, key_fields)
+
+        # Repeated keys
+        occurrence = 1
+        row_key = key
+        while row_key in indexed:
+            occurrence += 1
+            row_key = f"{key}#{occurrence}"
+
+        indexed[row_key] = values
+    return indexed
+
+
+def diff_snapshots(previous_rows: list, new_rows: list, key_fields: list,
+                   fields: list, clean_text=None,
+                   upper_fields: list = []) -> list:
+    """ Compare two snapshots of a table with a hash join by natural key
+
+    Args:
+        previous_rows (list): rows of the previous snapshot
+        new_rows (list): rows of the new snapshot
+        key_fields (list): natural key fields
+        fields (list): fields to compare
+        clean_text (callable, optional): text cleaning function
+        upper_fields (list, optional): fields saved in upper case
+
+    Returns:
+        list: changes as (change_type, row_key, deltas). change_type is
+            inserted, removed or changed. Deltas are the full row for inserted
+            and removed rows, and {field: [old, new]} for changed rows
+    """
+
+    previous = index_rows(previous_rows, key_fields, fields, clean_text,
+                          upper_fields)
+    new = index_rows(new_rows, key_fields, fields, clean_text, upper_fields)
+
+    changes = []
+    for row_key, values in new.items():
+
+        old_values = previous.get(row_key)
+        if old_values is None:
+            changes.append(("inserted", row_key, values))
+            continue
+
+        deltas = {field: [old_values[field], values[field]]
+                  for field in fields
+                  if old_values[field] != values[field]}
+        if deltas:
+            changes.append(("changed", row_key, deltas))
+
+    for row_key, values in previous.items():
+        if row_key not in new:
+            changes.append(("removed", row_key, values))
+
+    return changes
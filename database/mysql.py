@@ -1,9 +1,11 @@
 import pymysql.cursors
+from pymysql.constants import CLIENT
 
 
 class MySQL ():
 
-    def __init__(self, server: str, database: str, username: str, password: str):
+    def __init__(self, server: str, database: str, username: str, password: str,
+                 port: int = 3306):
         """ Connect with mysql db
 
         Args:
@@ -11,9 +13,11 @@ class MySQL ():
             database (str): database name
             username (str): database username
             password (str): database password
+            port (int, optional): server port. Defaults to 3306.
         """
 
         self.server = server
+        self.port = port
         self.database = database
         self.username = username
         self.password = password
@@ -21,8 +25,26 @@ class MySQL ():
         self.connection = None
         self.cursor = None
 
+    def __connect__(self):
+        """ Open connection if it is closed and get a new cursor """
+
+        # Validate if connection is open
+        if not self.connection or not self.connection.open:
+
+            # Connect and get cursor. Updates return the matched rows (not
+            # only the changed ones) in cursor.rowcount
+            self.connection = pymysql.connect(host=self.server,
+                                              port=self.port,
+                                              user=self.username,
+                                              database=self.database,
+                                              passwd=self.password,
+                                              cursorclass=pymysql.cursors.DictCursor,
+                                              client_flag=CLIENT.FOUND_ROWS)
+
+        self.cursor = self.connection.cursor()
+
     def run_sql(self, sql: str, auto_commit: bool = True,
-                raise_errors: bool = True) -> list:
+                raise_errors: bool = True, params: tuple = None) -> list:
         """ Exceute sql code
             Run sql code in the current data base, and commit it
 
@@ -30,29 +52,22 @@ class MySQL ():
             sql (str): sql code to run
             auto_commit (bool, optional): commit changes. Defaults to True.
             raise_errors (bool, optional): raise errors running sql. Defaults to False.
+            params (tuple, optional): values of the %s placeholders, escaped
+                by the driver (the sql is not modified). Defaults to None.
 
         Returns:
             list: results of the sql code (like select)
         """
 
-        # Validate if connection is open
-        if not self.connection or not self.connection.open:
-
-            # Connect and get cursor
-            self.connection = pymysql.connect(host=self.server,
-                                              user=self.username,
-                                              database=self.database,
-                                              passwd=self.password,
-                                              cursorclass=pymysql.cursors.DictCursor)
-
-        self.cursor = self.connection.cursor()
+        self.__connect__()
 
         # Replce "None" columns to "NULL"
-        sql = sql.replace('"None"', 'NULL').replace("None", "NULL")
+        if params is None:
+            sql = sql.replace('"None"', 'NULL').replace("None", "NULL")
 
         # Try to run sql
         try:
-            self.cursor.execute(sql)
+            self.cursor.execute(sql, params)
         except Exception as err:
 
             if raise_errors:
@@ -74,6 +89,24 @@ class MySQL ():
 
         return results
 
+    def run_many(self, sql: str, rows: list, auto_commit: bool = True):
+        """ Execute a parametrized sql query for each row in a single batch
+            (multi row insert for "insert ... values" queries)
+
+        Args:
+            sql (str): sql code with %s placeholders
+            rows (list): tuples with the values of each row
+            auto_commit (bool, optional): commit changes. Defaults to True.
+        """
+
+        self.__connect__()
+        if rows:
+            self.cursor.executemany(sql, rows)
+
+        # Commit and close by default
+        if auto_commit:
+            self.commit_close()
+
     def get_clean_text(self, text: str, keep: list = [], add_quotes=True) -> str():
 
         # Fix none values
@@ -100,3 +133,10 @@ class MySQL ():
 
         self.connection.commit()
         self.connection.close()
+
+    def rollback_close(self):
+        """ Discard not committed changes and close connection """
+
+        if self.connection and self.connection.open:
+            self.connection.rollback()
+            self.connection.close()
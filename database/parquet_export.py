@@ -0,0 +1,264 @@
+""" Export the saved runs as Parquet files, partitioned by table and query
+date (hive style: <folder>/table=<table>/query_date=<YYYY-MM-DD>/), with
+typed columns. pyarrow is optional, only required to export
+
+Compact the daily files of a folder:
+python -m database.parquet_export compact <folder> [--table new_filings]
+"""
+
+import os
+import argparse
+from datetime import datetime as dt, date
+from scraping.table_specs import TABLE_SPECS
+from logs import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def get_schema(table_name: str):
+    """ Return the arrow schema of a table: texts as strings, integers as
+    int64, floats as float64, dates as date32 (or timestamps if the column
+    has time) and the run id
+
+    Args:
+        table_name (str): table key in TABLE_SPECS
+
+    Returns:
+        pyarrow.Schema: table schema
+    """
+
+    fields = []
+    for column in TABLE_SPECS[table_name]["columns"]:
+        data_type = column["data_type"]
+        if data_type == int:
+            arrow_type = pa.int64()
+        elif data_type == float:
+            arrow_type = pa.float64()
+        elif data_type == dt:
+            date_format = column.get("extra", {}).get("format", "")
+            arrow_type = pa.timestamp("s") if "%H" in date_format \
+                else pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column["name"], arrow_type))
+
+    fields.append(pa.field("run_id", pa.int64()))
+    return pa.schema(fields)
+
+
+def convert_value(value, arrow_type):
+    """ Convert a scraped value to the column type (None for empty or
+    invalid values)
+
+    Args:
+        value: scraped value (str, datetime or number)
+        arrow_type (pyarrow.DataType): column type
+
+    Returns:
+        converted value
+    """
+
+    if value is None or value == "NULL" or value == "":
+        return None
+
+    try:
+        if pa.types.is_integer(arrow_type):
+            return int(float(str(value).replace(",", "")))
+        if pa.types.is_floating(arrow_type):
+            return float(str(value).replace(",", ""))
+    except ValueError:
+        return None
+
+    if pa.types.is_date(arrow_type):
+        return value.date() if isinstance(value, dt) else value
+    if pa.types.is_timestamp(arrow_type):
+        return value if isinstance(value, date) else None
+
+    return str(value)
+
+
+class ParquetRunWriter ():
+    """ Stream the rows of a run to a Parquet file, one row group per chunk """
+
+    def __init__(self, folder: str, table_name: str, query_date: date,
+                 run_id: int, mode: str = "full"):
+        """ Open the file of the run in the table and date partition
+
+        Args:
+            folder (str): base folder
+            table_name (str): table key in TABLE_SPECS
+            query_date (date): run date (partition)
+            run_id (int): run id
+            mode (str, optional): run mode, in the file name. Defaults to "full".
+        """
+
+        if pa is None:
+            raise ImportError("pyarrow is required to export Parquet files")
+
+        self.table_name = table_name
+        self.run_id = run_id
+        self.schema = get_schema(table_name)
+
+        partition = os.path.join(
+            folder,
+            f"table={table_name}",
+            f"query_date={query_date.strftime('%Y-%m-%d')}",
+        )
+        os.makedirs(partition, exist_ok=True)
+        self.path = os.path.join(partition, f"run-{run_id}-{mode}.parquet")
+        self.writer = pq.ParquetWriter(self.path, self.schema,
+                                       compression="zstd")
+        self.rows = 0
+
+    def write_rows(self, rows: list):
+        """ Convert a chunk of rows to columns and write it as a row group
+
+        Args:
+            rows (list): records or dicts with rows data
+        """
+
+        if not rows:
+            return
+
+        columns = []
+        for field in self.schema:
+            if field.name == "run_id":
+                values = [self.run_id] * len(rows)
+            else:
+                values = [convert_value(row[field.name], field.type)
+                          for row in rows]
+            columns.append(pa.array(values, type=field.type))
+
+        self.writer.write_table(pa.Table.from_arrays(columns,
+                                                     schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        self.writer.close()
+
+
+def export_run(folder: str, table_name: str, rows: list, run_id: int,
+               mode: str = "full", chunk_rows: int = 50000) -> str:
+    """ Write the rows of a run as Parquet, streaming chunks of rows
+
+    Args:
+        folder (str): base folder
+        table_name (str): table key in TABLE_SPECS
+        rows (list): records or dicts with rows data (with query_date)
+        run_id (int): run id
+        mode (str, optional): run mode. Defaults to "full".
+        chunk_rows (int, optional): rows per row group. Defaults to 50000.
+
+    Returns:
+        str: file path, or None if there are no rows
+    """
+
+    if not rows:
+        return None
+
+    query_date = rows[0]["query_date"]
+    writer = ParquetRunWriter(folder, table_name, query_date, run_id, mode)
+    try:
+        for start in range(0, len(rows), chunk_rows):
+            writer.write_rows(rows[start:start + chunk_rows])
+    finally:
+        writer.close()
+
+    logger.info(f"Table {table_name}: {writer.rows} rows exported to "
+                f"{writer.path}")
+    return writer.path
+
+
+def get_file_mode(file_name: str) -> str:
+    """ Return the run mode of a Parquet file, from its name
+    (run-<id>-<mode>.parquet or compacted-<mode>-<timestamp>.parquet)
+
+    Args:
+        file_name (str): file name
+
+    Returns:
+        str: run mode, or None for files without mode (old compacted files)
+    """
+
+    parts = file_name[:-len(".parquet")].split("-")
+    if parts[0] == "run" and len(parts) == 3:
+        return parts[2]
+    if parts[0] == "compacted" and len(parts) == 3:
+        return parts[1]
+    return None
+
+
+def compact(folder: str, table_name: str = None) -> int:
+    """ Merge the files of each table, date partition and run mode in a
+    single file (the mode is only in the file names)
+
+    Args:
+        folder (str): base folder
+        table_name (str, optional): only compact this table. Defaults to
+            None (all tables).
+
+    Returns:
+        int: merged files
+    """
+
+    if pa is None:
+        raise ImportError("pyarrow is required to compact Parquet files")
+
+    merged = 0
+    for table_folder in sorted(os.listdir(folder)):
+        if not table_folder.startswith("table="):
+            continue
+        if table_name and table_folder != f"table={table_name}":
+            continue
+
+        schema = get_schema(table_folder[len("table="):])
+        for partition in sorted(os.listdir(os.path.join(folder, table_folder))):
+            partition_path = os.path.join(folder, table_folder, partition)
+            modes_files = {}
+            for file in sorted(os.listdir(partition_path)):
+                mode = get_file_mode(file) if file.endswith(".parquet") \
+                    else None
+                if mode:
+                    modes_files.setdefault(mode, []).append(file)
+
+            for mode, files in modes_files.items():
+                if len(files) < 2:
+                    continue
+
+                # Write merged file, then replace the small files
+                paths = [os.path.join(partition_path, file) for file in files]
+                tables = [pq.read_table(path, schema=schema) for path in paths]
+                timestamp = dt.now().strftime("%Y%m%d%H%M%S")
+                merged_path = os.path.join(
+                    partition_path, f"compacted-{mode}-{timestamp}.parquet")
+                temp_path = merged_path + ".tmp"
+                pq.write_table(pa.concat_tables(tables), temp_path,
+                               compression="zstd")
+                os.replace(temp_path, merged_path)
+                for path in paths:
+                    if path != merged_path:
+                        os.remove(path)
+
+                merged += len(paths)
+                logger.info(f"{table_folder}/{partition}: {len(paths)} "
+                            f"{mode} files compacted")
+
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compact_parser = subparsers.add_parser(
+        "compact",
+        help="merge the files of each table, date partition and run mode")
+    compact_parser.add_argument("folder")
+    compact_parser.add_argument("--table", default=None)
+    args = parser.parse_args()
+
+    compact(args.folder, args.table)
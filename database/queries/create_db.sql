@@ -1,63 +1,380 @@
+CREATE TABLE `tickers` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `symbol` varchar(20) NOT NULL UNIQUE,
+  `company_name` varchar(200)
+);
+
+CREATE TABLE `dictionary_values` (
+  `id` mediumint unsigned PRIMARY KEY AUTO_INCREMENT,
+  `domain` varchar(40) NOT NULL,
+  `value` varchar(200) COLLATE utf8mb4_bin NOT NULL,
+  UNIQUE INDEX `dictionary_values_domain` (`domain`, `value`)
+);
+
+CREATE TABLE `scrape_runs` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'running',
+  `mode` varchar(12) NOT NULL DEFAULT 'full',
+  `row_count` int,
+  `checkpoint_rows` int NOT NULL DEFAULT 0,
+  `fingerprint` varchar(40),
+  `started_at` datetime NOT NULL,
+  `finished_at` datetime,
+  INDEX `scrape_runs_latest` (`table_name`, `status`, `id`)
+);
+
 CREATE TABLE `new_filings` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `ticker` varchar(5),
-  `company_name` varchar(100),
-  `dilution_type` varchar(50),
-  `dilution_name` varchar(50),
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `dilution_type_id` mediumint unsigned,
+  `dilution_name_id` mediumint unsigned,
   `date_modified` date,
-  `query_date` date
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `completed_offerings` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `ticker` varchar(5),
-  `type` varchar(50),
-  `method` varchar(5),
+  `ticker_id` int,
+  `type_id` mediumint unsigned,
+  `method_id` mediumint unsigned,
   `share_equivalent` bigint,
   `price` float,
   `warrants` bigint,
   `offering_amt` bigint,
-  `bank` varchar(50),
-  `investors` varchar(50),
+  `bank_id` mediumint unsigned,
+  `investors_id` mediumint unsigned,
   `datetime` date,
-  `query_date` date
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `pending_s1s` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `ticker` varchar(5),
-  `company_name` varchar(50),
-  `industry` varchar(50),
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `industry_id` mediumint unsigned,
   `date_first_s1` date,
   `pricing_date` date,
   `anticipated_deal_size` varchar(20),
   `estimated_warrant_coverage` int,
   `underwriters_placement_agents` varchar(20),
   `float_before_offering` bigint,
-  `status` varchar(20),
+  `status_id` mediumint unsigned,
   `pricing` float,
   `shares_offered` bigint,
   `final_warrant_coverage` int,
   `exercise_price` float,
-  `query_date` date
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `reverse_splits` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `symbol` varchar(5),
+  `ticker_id` int,
   `effective_date` date,
   `split_ratio` varchar(15),
   `current_float_m` float,
-  `status` varchar(20),
-  `query_date` date
+  `status_id` mediumint unsigned,
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
 );
 
 CREATE TABLE `noncompliant` (
   `id` int PRIMARY KEY AUTO_INCREMENT,
-  `ticker` varchar(20),
+  `ticker_id` int,
+  `company` varchar(200),
+  `deficiency_id` mediumint unsigned,
+  `market_id` mediumint unsigned,
+  `notification_date` date,
+  `run_id` int NOT NULL,
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`)
+);
+
+CREATE TABLE `scrape_jobs` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'pending',
+  `worker` varchar(100),
+  `attempts` int NOT NULL DEFAULT 0,
+  `error` varchar(500),
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `claimed_at` datetime,
+  `heartbeat_at` datetime,
+  `finished_at` datetime,
+  INDEX `scrape_jobs_status` (`status`, `heartbeat_at`)
+);
+
+CREATE TABLE `snapshot_changes` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `run_id` int NOT NULL,
+  `previous_run_id` int NOT NULL,
+  `change_type` varchar(10) NOT NULL,
+  `row_key` varchar(255) NOT NULL,
+  `deltas` json,
+  INDEX `snapshot_changes_run` (`table_name`, `run_id`),
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`)
+);
+
+CREATE TABLE `quarantine_rows` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `run_id` int NOT NULL,
+  `reasons` varchar(1000) NOT NULL,
+  `row_data` json,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX `quarantine_rows_run` (`table_name`, `run_id`),
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`)
+);
+
+CREATE TABLE `new_filings_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `dilution_type_id` mediumint unsigned,
+  `dilution_name_id` mediumint unsigned,
+  `date_modified` date,
+  `run_id` int NOT NULL,
+  INDEX `new_filings_current_run` (`run_id`),
+  INDEX `new_filings_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `completed_offerings_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `type_id` mediumint unsigned,
+  `method_id` mediumint unsigned,
+  `share_equivalent` bigint,
+  `price` float,
+  `warrants` bigint,
+  `offering_amt` bigint,
+  `bank_id` mediumint unsigned,
+  `investors_id` mediumint unsigned,
+  `datetime` date,
+  `run_id` int NOT NULL,
+  INDEX `completed_offerings_current_run` (`run_id`),
+  INDEX `completed_offerings_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `pending_s1s_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `industry_id` mediumint unsigned,
+  `date_first_s1` date,
+  `pricing_date` date,
+  `anticipated_deal_size` varchar(20),
+  `estimated_warrant_coverage` int,
+  `underwriters_placement_agents` varchar(20),
+  `float_before_offering` bigint,
+  `status_id` mediumint unsigned,
+  `pricing` float,
+  `shares_offered` bigint,
+  `final_warrant_coverage` int,
+  `exercise_price` float,
+  `run_id` int NOT NULL,
+  INDEX `pending_s1s_current_run` (`run_id`),
+  INDEX `pending_s1s_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `reverse_splits_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `effective_date` date,
+  `split_ratio` varchar(15),
+  `current_float_m` float,
+  `status_id` mediumint unsigned,
+  `run_id` int NOT NULL,
+  INDEX `reverse_splits_current_run` (`run_id`),
+  INDEX `reverse_splits_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `noncompliant_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
   `company` varchar(200),
-  `deficiency` varchar(50),
-  `market` varchar(5),
+  `deficiency_id` mediumint unsigned,
+  `market_id` mediumint unsigned,
   `notification_date` date,
-  `query_date` date
+  `run_id` int NOT NULL,
+  INDEX `noncompliant_current_run` (`run_id`),
+  INDEX `noncompliant_current_ticker` (`ticker_id`)
 );
+
+CREATE VIEW `new_filings_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_dilution_type`.`value` AS `dilution_type`,
+  `d_dilution_name`.`value` AS `dilution_name`,
+  data.`date_modified`,
+  data.`run_id`
+FROM `new_filings` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_type` ON `d_dilution_type`.`id` = data.`dilution_type_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_name` ON `d_dilution_name`.`id` = data.`dilution_name_id`;
+
+CREATE VIEW `new_filings_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_dilution_type`.`value` AS `dilution_type`,
+  `d_dilution_name`.`value` AS `dilution_name`,
+  data.`date_modified`,
+  data.`run_id`
+FROM `new_filings_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_type` ON `d_dilution_type`.`id` = data.`dilution_type_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_name` ON `d_dilution_name`.`id` = data.`dilution_name_id`;
+
+CREATE VIEW `completed_offerings_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  `d_type`.`value` AS `type`,
+  `d_method`.`value` AS `method`,
+  data.`share_equivalent`,
+  data.`price`,
+  data.`warrants`,
+  data.`offering_amt`,
+  `d_bank`.`value` AS `bank`,
+  `d_investors`.`value` AS `investors`,
+  data.`datetime`,
+  data.`run_id`
+FROM `completed_offerings` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_type` ON `d_type`.`id` = data.`type_id`
+LEFT JOIN `dictionary_values` AS `d_method` ON `d_method`.`id` = data.`method_id`
+LEFT JOIN `dictionary_values` AS `d_bank` ON `d_bank`.`id` = data.`bank_id`
+LEFT JOIN `dictionary_values` AS `d_investors` ON `d_investors`.`id` = data.`investors_id`;
+
+CREATE VIEW `completed_offerings_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  `d_type`.`value` AS `type`,
+  `d_method`.`value` AS `method`,
+  data.`share_equivalent`,
+  data.`price`,
+  data.`warrants`,
+  data.`offering_amt`,
+  `d_bank`.`value` AS `bank`,
+  `d_investors`.`value` AS `investors`,
+  data.`datetime`,
+  data.`run_id`
+FROM `completed_offerings_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_type` ON `d_type`.`id` = data.`type_id`
+LEFT JOIN `dictionary_values` AS `d_method` ON `d_method`.`id` = data.`method_id`
+LEFT JOIN `dictionary_values` AS `d_bank` ON `d_bank`.`id` = data.`bank_id`
+LEFT JOIN `dictionary_values` AS `d_investors` ON `d_investors`.`id` = data.`investors_id`;
+
+CREATE VIEW `pending_s1s_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_industry`.`value` AS `industry`,
+  data.`date_first_s1`,
+  data.`pricing_date`,
+  data.`anticipated_deal_size`,
+  data.`estimated_warrant_coverage`,
+  data.`underwriters_placement_agents`,
+  data.`float_before_offering`,
+  `d_status`.`value` AS `status`,
+  data.`pricing`,
+  data.`shares_offered`,
+  data.`final_warrant_coverage`,
+  data.`exercise_price`,
+  data.`run_id`
+FROM `pending_s1s` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_industry` ON `d_industry`.`id` = data.`industry_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `pending_s1s_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_industry`.`value` AS `industry`,
+  data.`date_first_s1`,
+  data.`pricing_date`,
+  data.`anticipated_deal_size`,
+  data.`estimated_warrant_coverage`,
+  data.`underwriters_placement_agents`,
+  data.`float_before_offering`,
+  `d_status`.`value` AS `status`,
+  data.`pricing`,
+  data.`shares_offered`,
+  data.`final_warrant_coverage`,
+  data.`exercise_price`,
+  data.`run_id`
+FROM `pending_s1s_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_industry` ON `d_industry`.`id` = data.`industry_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `reverse_splits_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `symbol`,
+  data.`effective_date`,
+  data.`split_ratio`,
+  data.`current_float_m`,
+  `d_status`.`value` AS `status`,
+  data.`run_id`
+FROM `reverse_splits` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `reverse_splits_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `symbol`,
+  data.`effective_date`,
+  data.`split_ratio`,
+  data.`current_float_m`,
+  `d_status`.`value` AS `status`,
+  data.`run_id`
+FROM `reverse_splits_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `noncompliant_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  data.`company`,
+  `d_deficiency`.`value` AS `deficiency`,
+  `d_market`.`value` AS `market`,
+  data.`notification_date`,
+  data.`run_id`
+FROM `noncompliant` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_deficiency` ON `d_deficiency`.`id` = data.`deficiency_id`
+LEFT JOIN `dictionary_values` AS `d_market` ON `d_market`.`id` = data.`market_id`;
+
+CREATE VIEW `noncompliant_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  data.`company`,
+  `d_deficiency`.`value` AS `deficiency`,
+  `d_market`.`value` AS `market`,
+  data.`notification_date`,
+  data.`run_id`
+FROM `noncompliant_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_deficiency` ON `d_deficiency`.`id` = data.`deficiency_id`
+LEFT JOIN `dictionary_values` AS `d_market` ON `d_market`.`id` = data.`market_id`;
@@ -0,0 +1,660 @@
+-- Migrate a database created with the first schema (text columns and
+-- query_date in the data tables) to the schema of create_db.sql. The old
+-- rows are kept as backfill runs (one run per table and query date, rows
+-- without query date go to a 1970-01-01 run), with their tickers and
+-- dictionary values. The current tables start empty and are filled by the
+-- next full run of each table.
+-- Run it once, with a backup: mysql -u <user> -p <db_name> < migrate_db.sql
+
+-- New tables
+
+CREATE TABLE `tickers` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `symbol` varchar(20) NOT NULL UNIQUE,
+  `company_name` varchar(200)
+);
+
+CREATE TABLE `dictionary_values` (
+  `id` mediumint unsigned PRIMARY KEY AUTO_INCREMENT,
+  `domain` varchar(40) NOT NULL,
+  `value` varchar(200) COLLATE utf8mb4_bin NOT NULL,
+  UNIQUE INDEX `dictionary_values_domain` (`domain`, `value`)
+);
+
+CREATE TABLE `scrape_runs` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'running',
+  `mode` varchar(12) NOT NULL DEFAULT 'full',
+  `row_count` int,
+  `checkpoint_rows` int NOT NULL DEFAULT 0,
+  `fingerprint` varchar(40),
+  `started_at` datetime NOT NULL,
+  `finished_at` datetime,
+  INDEX `scrape_runs_latest` (`table_name`, `status`, `id`)
+);
+
+CREATE TABLE `scrape_jobs` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'pending',
+  `worker` varchar(100),
+  `attempts` int NOT NULL DEFAULT 0,
+  `error` varchar(500),
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `claimed_at` datetime,
+  `heartbeat_at` datetime,
+  `finished_at` datetime,
+  INDEX `scrape_jobs_status` (`status`, `heartbeat_at`)
+);
+
+CREATE TABLE `snapshot_changes` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `run_id` int NOT NULL,
+  `previous_run_id` int NOT NULL,
+  `change_type` varchar(10) NOT NULL,
+  `row_key` varchar(255) NOT NULL,
+  `deltas` json,
+  INDEX `snapshot_changes_run` (`table_name`, `run_id`),
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`)
+);
+
+CREATE TABLE `quarantine_rows` (
+  `id` int PRIMARY KEY AUTO_INCREMENT,
+  `table_name` varchar(30) NOT NULL,
+  `run_id` int NOT NULL,
+  `reasons` varchar(1000) NOT NULL,
+  `row_data` json,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX `quarantine_rows_run` (`table_name`, `run_id`),
+  FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`)
+);
+
+-- new_filings
+
+INSERT INTO `scrape_runs` (`table_name`, `status`, `mode`, `row_count`, `started_at`, `finished_at`)
+SELECT 'new_filings', 'complete', 'backfill', COUNT(*), `run_date`, `run_date`
+FROM (
+  SELECT COALESCE(`query_date`, '1970-01-01') AS `run_date`
+  FROM `new_filings`
+) AS data
+GROUP BY `run_date`;
+
+INSERT INTO `tickers` (`symbol`, `company_name`)
+SELECT UPPER(TRIM(`ticker`)), MAX(NULLIF(TRIM(`company_name`), ''))
+FROM `new_filings`
+WHERE TRIM(`ticker`) <> ''
+GROUP BY UPPER(TRIM(`ticker`))
+ON DUPLICATE KEY UPDATE
+  `company_name` = COALESCE(VALUES(`company_name`), `company_name`);
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'dilution_type', TRIM(`dilution_type`)
+FROM `new_filings`
+WHERE TRIM(`dilution_type`) <> '';
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'dilution_name', TRIM(`dilution_name`)
+FROM `new_filings`
+WHERE TRIM(`dilution_name`) <> '';
+
+ALTER TABLE `new_filings`
+  ADD COLUMN `ticker_id` int AFTER `ticker`,
+  ADD COLUMN `dilution_type_id` mediumint unsigned AFTER `dilution_type`,
+  ADD COLUMN `dilution_name_id` mediumint unsigned AFTER `dilution_name`,
+  ADD COLUMN `run_id` int,
+  MODIFY `company_name` varchar(200);
+
+UPDATE `new_filings` AS data SET
+  data.`ticker_id` = (
+    SELECT `id` FROM `tickers`
+    WHERE `symbol` = UPPER(TRIM(data.`ticker`))
+  ),
+  data.`dilution_type_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'dilution_type'
+      AND `value` = CONVERT(TRIM(data.`dilution_type`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`dilution_name_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'dilution_name'
+      AND `value` = CONVERT(TRIM(data.`dilution_name`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`run_id` = (
+    SELECT `id` FROM `scrape_runs`
+    WHERE `table_name` = 'new_filings'
+      AND `mode` = 'backfill'
+      AND `started_at` = COALESCE(data.`query_date`, '1970-01-01')
+  );
+
+ALTER TABLE `new_filings`
+  DROP COLUMN `ticker`,
+  DROP COLUMN `dilution_type`,
+  DROP COLUMN `dilution_name`,
+  DROP COLUMN `query_date`,
+  MODIFY `run_id` int NOT NULL,
+  ADD FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  ADD FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`);
+
+-- completed_offerings
+
+INSERT INTO `scrape_runs` (`table_name`, `status`, `mode`, `row_count`, `started_at`, `finished_at`)
+SELECT 'completed_offerings', 'complete', 'backfill', COUNT(*), `run_date`, `run_date`
+FROM (
+  SELECT COALESCE(`query_date`, '1970-01-01') AS `run_date`
+  FROM `completed_offerings`
+) AS data
+GROUP BY `run_date`;
+
+INSERT INTO `tickers` (`symbol`, `company_name`)
+SELECT UPPER(TRIM(`ticker`)), NULL
+FROM `completed_offerings`
+WHERE TRIM(`ticker`) <> ''
+GROUP BY UPPER(TRIM(`ticker`))
+ON DUPLICATE KEY UPDATE
+  `company_name` = COALESCE(VALUES(`company_name`), `company_name`);
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'type', TRIM(`type`)
+FROM `completed_offerings`
+WHERE TRIM(`type`) <> '';
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'method', TRIM(`method`)
+FROM `completed_offerings`
+WHERE TRIM(`method`) <> '';
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'bank', TRIM(`bank`)
+FROM `completed_offerings`
+WHERE TRIM(`bank`) <> '';
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'investors', TRIM(`investors`)
+FROM `completed_offerings`
+WHERE TRIM(`investors`) <> '';
+
+ALTER TABLE `completed_offerings`
+  ADD COLUMN `ticker_id` int AFTER `ticker`,
+  ADD COLUMN `type_id` mediumint unsigned AFTER `type`,
+  ADD COLUMN `method_id` mediumint unsigned AFTER `method`,
+  ADD COLUMN `bank_id` mediumint unsigned AFTER `bank`,
+  ADD COLUMN `investors_id` mediumint unsigned AFTER `investors`,
+  ADD COLUMN `run_id` int;
+
+UPDATE `completed_offerings` AS data SET
+  data.`ticker_id` = (
+    SELECT `id` FROM `tickers`
+    WHERE `symbol` = UPPER(TRIM(data.`ticker`))
+  ),
+  data.`type_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'type'
+      AND `value` = CONVERT(TRIM(data.`type`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`method_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'method'
+      AND `value` = CONVERT(TRIM(data.`method`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`bank_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'bank'
+      AND `value` = CONVERT(TRIM(data.`bank`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`investors_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'investors'
+      AND `value` = CONVERT(TRIM(data.`investors`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`run_id` = (
+    SELECT `id` FROM `scrape_runs`
+    WHERE `table_name` = 'completed_offerings'
+      AND `mode` = 'backfill'
+      AND `started_at` = COALESCE(data.`query_date`, '1970-01-01')
+  );
+
+ALTER TABLE `completed_offerings`
+  DROP COLUMN `ticker`,
+  DROP COLUMN `type`,
+  DROP COLUMN `method`,
+  DROP COLUMN `bank`,
+  DROP COLUMN `investors`,
+  DROP COLUMN `query_date`,
+  MODIFY `run_id` int NOT NULL,
+  ADD FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  ADD FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`);
+
+-- pending_s1s
+
+INSERT INTO `scrape_runs` (`table_name`, `status`, `mode`, `row_count`, `started_at`, `finished_at`)
+SELECT 'pending_s1s', 'complete', 'backfill', COUNT(*), `run_date`, `run_date`
+FROM (
+  SELECT COALESCE(`query_date`, '1970-01-01') AS `run_date`
+  FROM `pending_s1s`
+) AS data
+GROUP BY `run_date`;
+
+INSERT INTO `tickers` (`symbol`, `company_name`)
+SELECT UPPER(TRIM(`ticker`)), MAX(NULLIF(TRIM(`company_name`), ''))
+FROM `pending_s1s`
+WHERE TRIM(`ticker`) <> ''
+GROUP BY UPPER(TRIM(`ticker`))
+ON DUPLICATE KEY UPDATE
+  `company_name` = COALESCE(VALUES(`company_name`), `company_name`);
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'industry', TRIM(`industry`)
+FROM `pending_s1s`
+WHERE TRIM(`industry`) <> '';
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'status', TRIM(`status`)
+FROM `pending_s1s`
+WHERE TRIM(`status`) <> '';
+
+ALTER TABLE `pending_s1s`
+  ADD COLUMN `ticker_id` int AFTER `ticker`,
+  ADD COLUMN `industry_id` mediumint unsigned AFTER `industry`,
+  ADD COLUMN `status_id` mediumint unsigned AFTER `status`,
+  ADD COLUMN `run_id` int,
+  MODIFY `company_name` varchar(200);
+
+UPDATE `pending_s1s` AS data SET
+  data.`ticker_id` = (
+    SELECT `id` FROM `tickers`
+    WHERE `symbol` = UPPER(TRIM(data.`ticker`))
+  ),
+  data.`industry_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'industry'
+      AND `value` = CONVERT(TRIM(data.`industry`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`status_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'status'
+      AND `value` = CONVERT(TRIM(data.`status`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`run_id` = (
+    SELECT `id` FROM `scrape_runs`
+    WHERE `table_name` = 'pending_s1s'
+      AND `mode` = 'backfill'
+      AND `started_at` = COALESCE(data.`query_date`, '1970-01-01')
+  );
+
+ALTER TABLE `pending_s1s`
+  DROP COLUMN `ticker`,
+  DROP COLUMN `industry`,
+  DROP COLUMN `status`,
+  DROP COLUMN `query_date`,
+  MODIFY `run_id` int NOT NULL,
+  ADD FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  ADD FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`);
+
+-- reverse_splits
+
+INSERT INTO `scrape_runs` (`table_name`, `status`, `mode`, `row_count`, `started_at`, `finished_at`)
+SELECT 'reverse_splits', 'complete', 'backfill', COUNT(*), `run_date`, `run_date`
+FROM (
+  SELECT COALESCE(`query_date`, '1970-01-01') AS `run_date`
+  FROM `reverse_splits`
+) AS data
+GROUP BY `run_date`;
+
+INSERT INTO `tickers` (`symbol`, `company_name`)
+SELECT UPPER(TRIM(`symbol`)), NULL
+FROM `reverse_splits`
+WHERE TRIM(`symbol`) <> ''
+GROUP BY UPPER(TRIM(`symbol`))
+ON DUPLICATE KEY UPDATE
+  `company_name` = COALESCE(VALUES(`company_name`), `company_name`);
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'status', TRIM(`status`)
+FROM `reverse_splits`
+WHERE TRIM(`status`) <> '';
+
+ALTER TABLE `reverse_splits`
+  ADD COLUMN `ticker_id` int AFTER `symbol`,
+  ADD COLUMN `status_id` mediumint unsigned AFTER `status`,
+  ADD COLUMN `run_id` int;
+
+UPDATE `reverse_splits` AS data SET
+  data.`ticker_id` = (
+    SELECT `id` FROM `tickers`
+    WHERE `symbol` = UPPER(TRIM(data.`symbol`))
+  ),
+  data.`status_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'status'
+      AND `value` = CONVERT(TRIM(data.`status`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`run_id` = (
+    SELECT `id` FROM `scrape_runs`
+    WHERE `table_name` = 'reverse_splits'
+      AND `mode` = 'backfill'
+      AND `started_at` = COALESCE(data.`query_date`, '1970-01-01')
+  );
+
+ALTER TABLE `reverse_splits`
+  DROP COLUMN `symbol`,
+  DROP COLUMN `status`,
+  DROP COLUMN `query_date`,
+  MODIFY `run_id` int NOT NULL,
+  ADD FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  ADD FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`);
+
+-- noncompliant
+
+INSERT INTO `scrape_runs` (`table_name`, `status`, `mode`, `row_count`, `started_at`, `finished_at`)
+SELECT 'noncompliant', 'complete', 'backfill', COUNT(*), `run_date`, `run_date`
+FROM (
+  SELECT COALESCE(`query_date`, '1970-01-01') AS `run_date`
+  FROM `noncompliant`
+) AS data
+GROUP BY `run_date`;
+
+INSERT INTO `tickers` (`symbol`, `company_name`)
+SELECT UPPER(TRIM(`ticker`)), MAX(NULLIF(TRIM(`company`), ''))
+FROM `noncompliant`
+WHERE TRIM(`ticker`) <> ''
+GROUP BY UPPER(TRIM(`ticker`))
+ON DUPLICATE KEY UPDATE
+  `company_name` = COALESCE(VALUES(`company_name`), `company_name`);
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'deficiency', TRIM(`deficiency`)
+FROM `noncompliant`
+WHERE TRIM(`deficiency`) <> '';
+
+INSERT IGNORE INTO `dictionary_values` (`domain`, `value`)
+SELECT DISTINCT 'market', TRIM(`market`)
+FROM `noncompliant`
+WHERE TRIM(`market`) <> '';
+
+ALTER TABLE `noncompliant`
+  ADD COLUMN `ticker_id` int AFTER `ticker`,
+  ADD COLUMN `deficiency_id` mediumint unsigned AFTER `deficiency`,
+  ADD COLUMN `market_id` mediumint unsigned AFTER `market`,
+  ADD COLUMN `run_id` int,
+  MODIFY `company` varchar(200);
+
+UPDATE `noncompliant` AS data SET
+  data.`ticker_id` = (
+    SELECT `id` FROM `tickers`
+    WHERE `symbol` = UPPER(TRIM(data.`ticker`))
+  ),
+  data.`deficiency_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'deficiency'
+      AND `value` = CONVERT(TRIM(data.`deficiency`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`market_id` = (
+    SELECT `id` FROM `dictionary_values`
+    WHERE `domain` = 'market'
+      AND `value` = CONVERT(TRIM(data.`market`) USING utf8mb4) COLLATE utf8mb4_bin
+  ),
+  data.`run_id` = (
+    SELECT `id` FROM `scrape_runs`
+    WHERE `table_name` = 'noncompliant'
+      AND `mode` = 'backfill'
+      AND `started_at` = COALESCE(data.`query_date`, '1970-01-01')
+  );
+
+ALTER TABLE `noncompliant`
+  DROP COLUMN `ticker`,
+  DROP COLUMN `deficiency`,
+  DROP COLUMN `market`,
+  DROP COLUMN `query_date`,
+  MODIFY `run_id` int NOT NULL,
+  ADD FOREIGN KEY (`run_id`) REFERENCES `scrape_runs` (`id`),
+  ADD FOREIGN KEY (`ticker_id`) REFERENCES `tickers` (`id`);
+
+-- Current tables (filled by the next full run)
+
+CREATE TABLE `new_filings_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `dilution_type_id` mediumint unsigned,
+  `dilution_name_id` mediumint unsigned,
+  `date_modified` date,
+  `run_id` int NOT NULL,
+  INDEX `new_filings_current_run` (`run_id`),
+  INDEX `new_filings_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `completed_offerings_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `type_id` mediumint unsigned,
+  `method_id` mediumint unsigned,
+  `share_equivalent` bigint,
+  `price` float,
+  `warrants` bigint,
+  `offering_amt` bigint,
+  `bank_id` mediumint unsigned,
+  `investors_id` mediumint unsigned,
+  `datetime` date,
+  `run_id` int NOT NULL,
+  INDEX `completed_offerings_current_run` (`run_id`),
+  INDEX `completed_offerings_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `pending_s1s_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `company_name` varchar(200),
+  `industry_id` mediumint unsigned,
+  `date_first_s1` date,
+  `pricing_date` date,
+  `anticipated_deal_size` varchar(20),
+  `estimated_warrant_coverage` int,
+  `underwriters_placement_agents` varchar(20),
+  `float_before_offering` bigint,
+  `status_id` mediumint unsigned,
+  `pricing` float,
+  `shares_offered` bigint,
+  `final_warrant_coverage` int,
+  `exercise_price` float,
+  `run_id` int NOT NULL,
+  INDEX `pending_s1s_current_run` (`run_id`),
+  INDEX `pending_s1s_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `reverse_splits_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `effective_date` date,
+  `split_ratio` varchar(15),
+  `current_float_m` float,
+  `status_id` mediumint unsigned,
+  `run_id` int NOT NULL,
+  INDEX `reverse_splits_current_run` (`run_id`),
+  INDEX `reverse_splits_current_ticker` (`ticker_id`)
+);
+
+CREATE TABLE `noncompliant_current` (
+  `row_key` char(40) PRIMARY KEY,
+  `ticker_id` int,
+  `company` varchar(200),
+  `deficiency_id` mediumint unsigned,
+  `market_id` mediumint unsigned,
+  `notification_date` date,
+  `run_id` int NOT NULL,
+  INDEX `noncompliant_current_run` (`run_id`),
+  INDEX `noncompliant_current_ticker` (`ticker_id`)
+);
+
+-- Views
+
+CREATE VIEW `new_filings_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_dilution_type`.`value` AS `dilution_type`,
+  `d_dilution_name`.`value` AS `dilution_name`,
+  data.`date_modified`,
+  data.`run_id`
+FROM `new_filings` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_type` ON `d_dilution_type`.`id` = data.`dilution_type_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_name` ON `d_dilution_name`.`id` = data.`dilution_name_id`;
+
+CREATE VIEW `new_filings_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_dilution_type`.`value` AS `dilution_type`,
+  `d_dilution_name`.`value` AS `dilution_name`,
+  data.`date_modified`,
+  data.`run_id`
+FROM `new_filings_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_type` ON `d_dilution_type`.`id` = data.`dilution_type_id`
+LEFT JOIN `dictionary_values` AS `d_dilution_name` ON `d_dilution_name`.`id` = data.`dilution_name_id`;
+
+CREATE VIEW `completed_offerings_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  `d_type`.`value` AS `type`,
+  `d_method`.`value` AS `method`,
+  data.`share_equivalent`,
+  data.`price`,
+  data.`warrants`,
+  data.`offering_amt`,
+  `d_bank`.`value` AS `bank`,
+  `d_investors`.`value` AS `investors`,
+  data.`datetime`,
+  data.`run_id`
+FROM `completed_offerings` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_type` ON `d_type`.`id` = data.`type_id`
+LEFT JOIN `dictionary_values` AS `d_method` ON `d_method`.`id` = data.`method_id`
+LEFT JOIN `dictionary_values` AS `d_bank` ON `d_bank`.`id` = data.`bank_id`
+LEFT JOIN `dictionary_values` AS `d_investors` ON `d_investors`.`id` = data.`investors_id`;
+
+CREATE VIEW `completed_offerings_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  `d_type`.`value` AS `type`,
+  `d_method`.`value` AS `method`,
+  data.`share_equivalent`,
+  data.`price`,
+  data.`warrants`,
+  data.`offering_amt`,
+  `d_bank`.`value` AS `bank`,
+  `d_investors`.`value` AS `investors`,
+  data.`datetime`,
+  data.`run_id`
+FROM `completed_offerings_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_type` ON `d_type`.`id` = data.`type_id`
+LEFT JOIN `dictionary_values` AS `d_method` ON `d_method`.`id` = data.`method_id`
+LEFT JOIN `dictionary_values` AS `d_bank` ON `d_bank`.`id` = data.`bank_id`
+LEFT JOIN `dictionary_values` AS `d_investors` ON `d_investors`.`id` = data.`investors_id`;
+
+CREATE VIEW `pending_s1s_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_industry`.`value` AS `industry`,
+  data.`date_first_s1`,
+  data.`pricing_date`,
+  data.`anticipated_deal_size`,
+  data.`estimated_warrant_coverage`,
+  data.`underwriters_placement_agents`,
+  data.`float_before_offering`,
+  `d_status`.`value` AS `status`,
+  data.`pricing`,
+  data.`shares_offered`,
+  data.`final_warrant_coverage`,
+  data.`exercise_price`,
+  data.`run_id`
+FROM `pending_s1s` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_industry` ON `d_industry`.`id` = data.`industry_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `pending_s1s_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  data.`company_name`,
+  `d_industry`.`value` AS `industry`,
+  data.`date_first_s1`,
+  data.`pricing_date`,
+  data.`anticipated_deal_size`,
+  data.`estimated_warrant_coverage`,
+  data.`underwriters_placement_agents`,
+  data.`float_before_offering`,
+  `d_status`.`value` AS `status`,
+  data.`pricing`,
+  data.`shares_offered`,
+  data.`final_warrant_coverage`,
+  data.`exercise_price`,
+  data.`run_id`
+FROM `pending_s1s_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_industry` ON `d_industry`.`id` = data.`industry_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `reverse_splits_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `symbol`,
+  data.`effective_date`,
+  data.`split_ratio`,
+  data.`current_float_m`,
+  `d_status`.`value` AS `status`,
+  data.`run_id`
+FROM `reverse_splits` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `reverse_splits_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `symbol`,
+  data.`effective_date`,
+  data.`split_ratio`,
+  data.`current_float_m`,
+  `d_status`.`value` AS `status`,
+  data.`run_id`
+FROM `reverse_splits_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_status` ON `d_status`.`id` = data.`status_id`;
+
+CREATE VIEW `noncompliant_view` AS
+SELECT
+  data.`id`,
+  tickers.`symbol` AS `ticker`,
+  data.`company`,
+  `d_deficiency`.`value` AS `deficiency`,
+  `d_market`.`value` AS `market`,
+  data.`notification_date`,
+  data.`run_id`
+FROM `noncompliant` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_deficiency` ON `d_deficiency`.`id` = data.`deficiency_id`
+LEFT JOIN `dictionary_values` AS `d_market` ON `d_market`.`id` = data.`market_id`;
+
+CREATE VIEW `noncompliant_current_view` AS
+SELECT
+  data.`row_key`,
+  tickers.`symbol` AS `ticker`,
+  data.`company`,
+  `d_deficiency`.`value` AS `deficiency`,
+  `d_market`.`value` AS `market`,
+  data.`notification_date`,
+  data.`run_id`
+FROM `noncompliant_current` AS data
+LEFT JOIN `tickers` ON tickers.`id` = data.`ticker_id`
+LEFT JOIN `dictionary_values` AS `d_deficiency` ON `d_deficiency`.`id` = data.`deficiency_id`
+LEFT JOIN `dictionary_values` AS `d_market` ON `d_market`.`id` = data.`market_id`;
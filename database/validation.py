@@ -0,0 +1,150 @@
+import math
+from datetime import date, datetime as dt
+
+# Value ranges of the integer data types (signed)
+INT_RANGES = {
+    "tinyint": (-2 ** 7, 2 ** 7 - 1),
+    "smallint": (-2 ** 15, 2 ** 15 - 1),
+    "mediumint": (-2 ** 23, 2 ** 23 - 1),
+    "int": (-2 ** 31, 2 ** 31 - 1),
+    "bigint": (-2 ** 63, 2 ** 63 - 1),
+}
+
+# Max absolute value of the float data types
+FLOAT_LIMITS = {
+    "float": 3.402823466e38,
+    "double": 1.7976931348623157e308,
+}
+
+DATE_TYPES = ("date", "datetime", "timestamp")
+
+
+def get_column_rules(schema_rows: list) -> dict:
+    """ Build the validation rules of each column from INFORMATION_SCHEMA
+    columns metadata
+
+    Args:
+        schema_rows (list): dicts with table_name, column_name, data_type,
+            column_type, max_length and is_nullable
+
+    Returns:
+        dict: table name -> column name -> rule dict (data_type, max_length,
+            min, max, nullable)
+    """
+
+    rules = {}
+    for row in schema_rows:
+        data_type = row["data_type"].lower()
+        rule = {
+            "data_type": data_type,
+            "max_length": row["max_length"],
+            "min": None,
+            "max": None,
+            "nullable": row["is_nullable"] == "YES",
+        }
+
+        if data_type in INT_RANGES:
+            rule["min"], rule["max"] = INT_RANGES[data_type]
+            if "unsigned" in row["column_type"].lower():
+                rule["min"] = 0
+                rule["max"] = rule["max"] * 2 + 1
+        elif data_type in FLOAT_LIMITS:
+            rule["min"] = -FLOAT_LIMITS[data_type]
+            rule["max"] = FLOAT_LIMITS[data_type]
+
+        rules.setdefault(row["table_name"], {})[row["column_name"]] = rule
+    return rules
+
+
+def get_number(value):
+    """ Convert a value to float, or None if it is not numeric """
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def is_date(value) -> bool:
+    """ Validate date values: date objects or "YYYY-MM-DD" texts """
+
+    if isinstance(value, date):
+        return True
+    try:
+        dt.strptime(str(value)[:10], "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+def validate_column(values: list, rule: dict) -> dict:
+    """ Check all the values of a column against the column rule
+
+    Args:
+        values (list): column values, already converted to query parameters
+            (None for empty values)
+        rule (dict): column rule from get_column_rules
+
+    Returns:
+        dict: row index -> reason, only for the invalid values
+    """
+
+    errors = {}
+
+    # Null rule
+    if not rule["nullable"]:
+        for index, value in enumerate(values):
+            if value is None:
+                errors[index] = "null not allowed"
+
+    present = [(index, value) for index, value in enumerate(values)
+               if value is not None]
+
+    # Texts length
+    max_length = rule["max_length"]
+    if max_length:
+        for index, value in present:
+            length = len(str(value))
+            if length > max_length:
+                errors[index] = f"length {length} > {max_length}"
+
+    # Numeric ranges
+    if rule["min"] is not None:
+        for index, value in present:
+            number = get_number(value)
+            if number is None or math.isnan(number):
+                errors[index] = f"not numeric: {str(value)[:30]}"
+            elif not rule["min"] <= number <= rule["max"]:
+                errors[index] = f"out of {rule['data_type']} range: {value}"
+
+    # Dates
+    if rule["data_type"] in DATE_TYPES:
+        for index, value in present:
+            if not is_date(value):
+                errors[index] = f"not a date: {str(value)[:30]}"
+
+    return errors
+
+
+def validate_columns(columns: dict, rules: dict) -> dict:
+    """ Validate a batch column by column
+
+    Args:
+        columns (dict): field name -> column values
+        rules (dict): field name -> column rule (fields without rule are
+            not validated)
+
+    Returns:
+        dict: row index -> list of reasons ("field: reason"), only for the
+            invalid rows
+    """
+
+    rejected = {}
+    for field, values in columns.items():
+        if field not in rules:
+            continue
+        for index, reason in validate_column(values, rules[field]).items():
+            rejected.setdefault(index, []).append(f"{field}: {reason}")
+    return rejected
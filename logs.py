@@ -1,9 +1,134 @@
+import os
+import json
+import queue
+import atexit
+import multiprocessing
+import random
 import logging
+import logging.handlers
+from time import perf_counter
+from contextlib import contextmanager
 
-# logs to file
+# Keep this fraction (0 to 1) of the debug records, for noisy per row logs
+LOG_DEBUG_SAMPLE = float(os.getenv('LOG_DEBUG_SAMPLE', 1))
+
+# Extra fields of the structured records
+STRUCTURED_FIELDS = ("table", "phase", "duration", "rows")
+
+
+class JsonFormatter (logging.Formatter):
+    """ Format records as json lines, with the structured extra fields """
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "file": record.filename,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                data[field] = getattr(record, field)
+        return json.dumps(data, default=str)
+
+
+class SamplingFilter (logging.Filter):
+    """ Drop a fraction of the debug records """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno != logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+# logs to file (json) and console, written in a listener thread
 format = '%(asctime)s - %(filename)s (%(lineno)s) - %(levelname)s - %(message)s'
-logging.basicConfig(filename='.log', format=format)
+file_handler = logging.FileHandler('.log')
+file_handler.setFormatter(JsonFormatter())
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(logging.Formatter(format))
+
+log_queue = queue.SimpleQueue()
+listener = logging.handlers.QueueListener(
+    log_queue, file_handler, stream_handler, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)
+
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.addFilter(SamplingFilter(LOG_DEBUG_SAMPLE))
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
-logger.addHandler(logging.StreamHandler())
+logger.addHandler(queue_handler)
+logger.propagate = False
+
+# Queue of the worker processes records (created with the first pool)
+worker_queue = None
+
+
+def get_worker_queue():
+    """ Return the queue where the worker processes send their records,
+    written by a listener thread of this process (the workers can't use the
+    listener of the parent)
+
+    Returns:
+        multiprocessing.Queue: records queue, pass it to init_worker
+    """
+
+    global worker_queue
+    if worker_queue is None:
+        worker_queue = multiprocessing.get_context("spawn").Queue()
+        worker_listener = logging.handlers.QueueListener(
+            worker_queue, file_handler, stream_handler,
+            respect_handler_level=True)
+        worker_listener.start()
+        atexit.register(worker_listener.stop)
+    return worker_queue
+
+
+def init_worker(records_queue):
+    """ Process pool initializer: send the logger records of the worker to
+    the parent process
+
+    Args:
+        records_queue (multiprocessing.Queue): queue from get_worker_queue
+    """
+
+    handler = logging.handlers.QueueHandler(records_queue)
+    handler.addFilter(SamplingFilter(LOG_DEBUG_SAMPLE))
+    logger.removeHandler(queue_handler)
+    logger.addHandler(handler)
+
+
+@contextmanager
+def log_phase(table: str, phase: str):
+    """ Log the duration of a table phase. Set the "rows" key of the yielded
+    dict to log the processed rows
+
+    Args:
+        table (str): table name
+        phase (str): phase name, like scrape or save
+    """
+
+    info = {"rows": None}
+    start = perf_counter()
+    try:
+        yield info
+    finally:
+        duration = perf_counter() - start
+        rows_text = f", {info['rows']} rows" if info["rows"] is not None else ""
+        logger.info(
+            f"{table} {phase}: {duration:.2f}s{rows_text}",
+            extra={
+                "table": table,
+                "phase": phase,
+                "duration": round(duration, 4),
+                "rows": info["rows"],
+            },
+            stacklevel=3,
+        )
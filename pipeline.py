@@ -0,0 +1,271 @@
+import os
+from concurrent.futures import Future
+from datetime import datetime as dt, timedelta
+from dotenv import load_dotenv
+from logs import logger, log_phase
+from database.parquet_export import export_run
+load_dotenv()
+
+# Hours between full scans of the incremental tables
+FULL_SCAN_HOURS = float(os.getenv('INCREMENTAL_FULL_SCAN_HOURS', 24))
+
+# Folder to export the saved runs as Parquet (empty to skip the export)
+PARQUET_FOLDER = os.getenv('PARQUET_FOLDER', '')
+PARQUET_CHUNK_ROWS = int(os.getenv('PARQUET_CHUNK_ROWS', 50000))
+
+# Scraped tables, in scraping order, with the scraper and database methods
+# used to extract and save each one. Incremental tables are sorted newest
+# first, so the scrape can stop in the first known row
+TABLES = {
+    "new_filings": {
+        "scrape": "get_new_filings",
+        "save": "save_new_filings",
+        "incremental": True,
+    },
+    "completed_offerings": {
+        "scrape": "get_completed_offerings",
+        "save": "save_completed_offerings",
+        "incremental": True,
+    },
+    "pending_s1s": {
+        "scrape": "get_pending_s1s",
+        "save": "save_pending_s1s",
+    },
+    "reverse_splits": {
+        "scrape": "get_reverse_splits",
+        "save": "save_reverse_splits",
+    },
+    "noncompliant": {
+        "scrape": "get_noncompliant_data",
+        "save": "save_noncompliant_data",
+    },
+}
+
+
+def get_run_mode(database, table_name: str) -> str:
+    """ Select the run mode of a table: incremental tables run a full scan
+    every FULL_SCAN_HOURS, as safety net, and incremental runs in between
+
+    Args:
+        database (Database): database instance
+        table_name (str): table key in TABLES
+
+    Returns:
+        str: full or incremental
+    """
+
+    if not TABLES[table_name].get("incremental", False):
+        return "full"
+
+    last_full_run = database.get_latest_complete_run(table_name)
+    if not last_full_run:
+        return "full"
+
+    full_scan_age = dt.now() - last_full_run["started_at"]
+    if full_scan_age >= timedelta(hours=FULL_SCAN_HOURS):
+        return "full"
+
+    return "incremental"
+
+
+def start_table(scraper, database, table_name: str, mode: str = None) -> dict:
+    """ Start the run of a table and scrape it. With parse workers, the
+    scraper only extracts the table payload and the rows are parsed in a
+    worker process (the run data is a future). If the table fingerprint
+    matches the last complete run, the rows are not extracted and the run
+    is saved as unchanged (the run data is None). Resumed runs are never
+    unchanged
+
+    Args:
+        scraper (ScrapingDilutionTracker): logged scraper instance
+        database (Database): database instance
+        table_name (str): table key in TABLES
+        mode (str, optional): full or incremental. Defaults to None
+            (selected with get_run_mode).
+
+    Returns:
+        dict: run data (table_name, run_id, mode, data and save_kwargs)
+    """
+
+    table = TABLES[table_name]
+    mode = mode or get_run_mode(database, table_name)
+
+    # High-water mark: rows saved by the previous runs
+    scrape_kwargs = {}
+    save_kwargs = {}
+    if mode == "incremental":
+        known_keys = database.get_current_keys(table_name)
+        if known_keys:
+            scrape_kwargs["is_known"] = \
+                lambda row: database.get_row_key(table_name, row) in known_keys
+            save_kwargs["incremental"] = True
+        else:
+            mode = "full"
+
+    # Resume the last run if it failed after committing chunks. Resumed
+    # runs are always extracted, to complete their chunks
+    run_id = database.resume_run(table_name, mode)
+    if not run_id:
+
+        # Skip the extraction if the table didn't change since the last save
+        # (the fingerprint covers the full table in both modes)
+        last_run = database.get_latest_complete_run(table_name, mode=None)
+        if last_run and last_run["fingerprint"]:
+            scrape_kwargs["last_fingerprint"] = last_run["fingerprint"]
+
+        run_id = database.start_run(table_name, mode=mode)
+    try:
+        with log_phase(table_name, "scrape") as phase:
+            data = getattr(scraper, table["scrape"])(**scrape_kwargs)
+            if isinstance(data, list):
+                phase["rows"] = len(data)
+    except Exception:
+        database.finish_run(run_id, 0, "failed")
+        raise
+
+    fingerprint = scraper.fingerprints.get(table_name)
+    if fingerprint:
+        database.set_run_fingerprint(run_id, fingerprint)
+    if data is None:
+        database.finish_run(run_id, 0, "unchanged")
+
+    return {
+        "table_name": table_name,
+        "run_id": run_id,
+        "mode": mode,
+        "data": data,
+        "save_kwargs": save_kwargs,
+    }
+
+
+def finish_table(database, run: dict, on_saved=None) -> list:
+    """ Wait for the run rows (if they are parsed in a worker process),
+    save them in database and save the changes from the previous full run.
+    Unchanged runs are already finished by start_table
+
+    Args:
+        database (Database): database instance
+        run (dict): run data returned by start_table
+        on_saved (callable, optional): called with the run data as soon as
+            the run is saved, before the diff and export. Defaults to None.
+
+    Returns:
+        list: scraped rows
+    """
+
+    table_name = run["table_name"]
+    run_id = run["run_id"]
+    table = TABLES[table_name]
+
+    if run["data"] is None:
+        if on_saved:
+            on_saved(run)
+        return []
+
+    try:
+        data = run["data"]
+        if isinstance(data, Future):
+            with log_phase(table_name, "parse") as phase:
+                data = data.result()
+                phase["rows"] = len(data)
+
+        with log_phase(table_name, "save") as phase:
+            saved = getattr(database, table["save"])(data, run_id,
+                                                     **run["save_kwargs"])
+            phase["rows"] = len(saved)
+    except Exception:
+        database.rollback_close()
+        database.finish_run(run_id, 0, "failed")
+        raise
+
+    if on_saved:
+        on_saved(run)
+
+    # Save changes from the previous full run
+    if run["mode"] == "full":
+        with log_phase(table_name, "diff") as phase:
+            phase["rows"] = database.save_changes(table_name, saved, run_id)
+
+    # Export the saved rows (the run is already saved in database)
+    if PARQUET_FOLDER:
+        try:
+            with log_phase(table_name, "export") as phase:
+                export_run(PARQUET_FOLDER, table_name, saved, run_id,
+                           run["mode"], PARQUET_CHUNK_ROWS)
+                phase["rows"] = len(saved)
+        except Exception as err:
+            logger.error(f"Table {table_name} Parquet export failed: {err}")
+
+    return data
+
+
+def run_table(scraper, database, table_name: str, mode: str = None) -> list:
+    """ Scrape a table and save its rows in database. Incremental runs only
+    scrape and save the rows before the first row already saved
+
+    Args:
+        scraper (ScrapingDilutionTracker): logged scraper instance
+        database (Database): database instance
+        table_name (str): table key in TABLES
+        mode (str, optional): full or incremental. Defaults to None
+            (selected with get_run_mode).
+
+    Returns:
+        list: scraped rows
+    """
+
+    run = start_table(scraper, database, table_name, mode)
+    return finish_table(database, run)
+
+
+def run_tables(scraper, database, table_names: list, run_state=None):
+    """ Scrape and save tables in order. With parse workers, the browser
+    navigates to the next pages while the previous tables are parsed, and
+    the tables are saved after the scrapes
+
+    Args:
+        scraper (ScrapingDilutionTracker): logged scraper instance
+        database (Database): database instance
+        table_names (list): table keys in TABLES
+        run_state (RunState, optional): batch state, to skip the tables
+            already done and save the finished ones. Defaults to None.
+    """
+
+    # Skip the tables done in the batch
+    if run_state:
+        done = [name for name in table_names if run_state.is_done(name)]
+        for table_name in done:
+            logger.info(f"Table {table_name} already done in this batch, "
+                        "skipped")
+        table_names = [name for name in table_names if name not in done]
+
+    # Tables are done as soon as they are saved (a later diff or export
+    # error doesn't save them again)
+    def set_done(run):
+        if run_state:
+            run_state.set_done(run["table_name"], run["run_id"])
+
+    def finish(run):
+        finish_table(database, run, set_done)
+
+    if not scraper.parse_workers:
+        for table_name in table_names:
+            finish(start_table(scraper, database, table_name))
+        return
+
+    # Save the started runs even if a later scrape fails (the scrape error
+    # is raised, not the save errors)
+    runs = []
+    errors = []
+    try:
+        for table_name in table_names:
+            runs.append(start_table(scraper, database, table_name))
+    finally:
+        for run in runs:
+            try:
+                finish(run)
+            except Exception as err:
+                logger.error(f"Table {run['table_name']} save failed: {err}")
+                errors.append(err)
+    if errors:
+        raise errors[0]
@@ -0,0 +1,167 @@
+import os
+import json
+import socket
+import urllib.request
+from time import sleep, time
+from dotenv import load_dotenv
+from logs import logger
+from scraping.scraper_dt import ScrapingDilutionTracker
+from database.db import Database
+from pipeline import run_table
+load_dotenv()
+
+CHROME_FOLDER = os.getenv('CHROME_FOLDER')
+SESSION_FILE = os.getenv('SESSION_FILE', '.session.json')
+LEAN_BROWSING = os.getenv('LEAN_BROWSING') == "True"
+HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', 0))
+
+# Events target: http(s) webhook url or "unix:<socket path>"
+EVENTS_TARGET = os.getenv('EVENTS_TARGET', 'unix:/tmp/dilution_events.sock')
+POLL_INTERVAL = float(os.getenv('NEW_FILINGS_POLL_INTERVAL', 15))
+POLL_ROWS = int(os.getenv('NEW_FILINGS_POLL_ROWS', 20))
+FULL_SCRAPE_INTERVAL = int(os.getenv('NEW_FILINGS_FULL_INTERVAL', 3600))
+PUSH_RETRIES = int(os.getenv('EVENTS_PUSH_RETRIES', 3))
+
+
+class EventPusher ():
+    """ Send batches of events, as json, to a webhook or unix socket.
+    Events that can't be sent are kept and sent with the next batch
+    """
+
+    def __init__(self, target: str, retries: int = 3, max_pending: int = 1000):
+        """ Save target and retries settings
+
+        Args:
+            target (str): http(s) webhook url or "unix:<socket path>"
+            retries (int, optional): attempts per batch. Defaults to 3.
+            max_pending (int, optional): max events kept after failures.
+                Defaults to 1000.
+        """
+
+        self.target = target
+        self.retries = retries
+        self.max_pending = max_pending
+        self.pending = []
+
+    def __send__(self, body: bytes):
+        """ Send body to the target """
+
+        if self.target.startswith("unix:"):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(5)
+                client.connect(self.target[len("unix:"):])
+                client.sendall(body + b"\n")
+        else:
+            request = urllib.request.Request(
+                self.target,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            with urllib.request.urlopen(request, timeout=5) as response:
+                response.read()
+
+    def push(self, events: list) -> bool:
+        """ Send events with the pending ones, retrying with backoff
+
+        Args:
+            events (list): dicts with events data
+
+        Returns:
+            bool: True if the batch was sent
+        """
+
+        self.pending += events
+        if not self.pending:
+            return True
+
+        body = json.dumps({"events": self.pending}, default=str).encode()
+        for attempt in range(self.retries):
+            try:
+                self.__send__(body)
+            except Exception as err:
+                logger.warning(f"Push attempt {attempt + 1} failed: {err}")
+                sleep(0.5 * 2 ** attempt)
+                continue
+
+            self.pending = []
+            return True
+
+        # Keep the last events for the next push
+        self.pending = self.pending[-self.max_pending:]
+        return False
+
+
+def poll():
+    """ Re-read the top rows of New Filings at short intervals, until the
+    first known row, and push the new filings as events. Polls of unchanged
+    top rows (same fingerprint) only cost one script call. The table is
+    scraped and saved at a slow cadence
+    """
+
+    database = Database()
+    pusher = EventPusher(EVENTS_TARGET, PUSH_RETRIES)
+
+    # Validate chrome folder
+    if CHROME_FOLDER is None or not os.path.isdir(CHROME_FOLDER):
+        logger.error('CHROME_FOLDER not found env variable is not set')
+        quit()
+
+    # Connect to dilution tracker
+    scraper = ScrapingDilutionTracker(CHROME_FOLDER, SESSION_FILE,
+                                      LEAN_BROWSING, http_workers=HTTP_WORKERS)
+    if not scraper.login():
+        logger.error('Login failed. Close the program, open chrome, '
+                     'login manually and try again')
+        quit()
+
+    def get_key(row) -> str:
+        return database.get_row_key("new_filings", row)
+
+    # Known filings from the saved table. The tab stays in the new filings page
+    run_table(scraper, database, "new_filings")
+    known_keys = database.get_current_keys("new_filings")
+    last_full_scrape = time()
+    last_fingerprint = None
+
+    while True:
+        sleep(POLL_INTERVAL)
+
+        # Save the table at slow cadence, or only read the new top rows
+        full_scrape = time() - last_full_scrape >= FULL_SCRAPE_INTERVAL
+        try:
+            if full_scrape:
+                rows = run_table(scraper, database, "new_filings")
+                last_full_scrape = time()
+            else:
+                rows = scraper.get_new_filings(
+                    top_rows=POLL_ROWS,
+                    reload=True,
+                    is_known=lambda row: get_key(row) in known_keys,
+                    last_fingerprint=last_fingerprint,
+                )
+                last_fingerprint = scraper.fingerprints.get("new_filings")
+        except Exception as err:
+            logger.error(f"New filings poll failed: {err}")
+            continue
+
+        # Top rows unchanged since the last poll
+        if rows is None:
+            rows = []
+
+        # Detect new filings
+        events = [row.to_dict() for row in rows if get_key(row) not in known_keys]
+
+        # Keep only the saved table keys after a scrape
+        if full_scrape:
+            known_keys = database.get_current_keys("new_filings")
+        else:
+            known_keys.update(map(get_key, rows))
+
+        if events or pusher.pending:
+            logger.info(f"New filings detected: {len(events)}")
+            pusher.push(events)
+
+
+if __name__ == '__main__':
+    poll()
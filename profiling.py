@@ -0,0 +1,222 @@
+import os
+import csv
+import sys
+import cProfile
+import pstats
+from time import perf_counter
+from datetime import datetime as dt
+from contextlib import contextmanager
+from selenium.webdriver.remote.webdriver import WebDriver
+from logs import logger
+
+# Scraper module, used to find the scraper method of each webdriver command
+SCRAPER_FILE = os.path.join("scraping", "scraper_dt.py")
+
+
+def get_function_name(function: tuple) -> str:
+    """ Return "file:function" from a pstats function key """
+
+    file_name, _, name = function
+    if file_name == "~":
+        return name
+    return f"{os.path.basename(file_name)}:{name}"
+
+
+def get_collapsed_stacks(stats: pstats.Stats, max_depth: int = 60,
+                         min_time: float = 1e-5) -> dict:
+    """ Convert cProfile stats to collapsed stacks. cProfile only keeps
+    caller -> callee times, so each call path gets the time of its first
+    edge scaled down the path (like flameprof)
+
+    Args:
+        stats (pstats.Stats): profile stats
+        max_depth (int, optional): max stack depth. Defaults to 60.
+        min_time (float, optional): skip paths faster than this time
+            (seconds). Defaults to 1e-5.
+
+    Returns:
+        dict: "frame;frame;frame" -> self time (microseconds)
+    """
+
+    # Callee -> callers times into caller -> callees times
+    callees = {}
+    roots = []
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, {})[function] = caller_stats[3]
+
+    stacks = {}
+
+    def walk(function, stack, fraction):
+        _, _, self_time, total_time, _ = stats.stats[function]
+        stack = stack + [get_function_name(function)]
+        key = ";".join(stack)
+        stacks[key] = stacks.get(key, 0) + self_time * fraction * 1e6
+
+        if len(stack) >= max_depth or not total_time:
+            return
+        for callee, edge_time in callees.get(function, {}).items():
+            if get_function_name(callee) in stack:
+                continue
+            callee_total = stats.stats[callee][3]
+            if callee_total and edge_time * fraction >= min_time:
+                walk(callee, stack, fraction * edge_time / callee_total)
+
+    for root in roots:
+        walk(root, [], 1)
+
+    return {stack: round(value) for stack, value in stacks.items()
+            if round(value)}
+
+
+class Profiler ():
+    """ Profile phases with cProfile and trace the webdriver commands (name,
+    latency, scraper method and selector) of each phase. Results are saved
+    as pstats files and collapsed stacks, for flamegraph tools
+    """
+
+    def __init__(self, folder: str = "", enabled: bool = True):
+        """ Create the output folder and start the commands tracing
+
+        Args:
+            folder (str, optional): base output folder. Defaults to "".
+            enabled (bool, optional): profile, or only run the phases.
+                Defaults to True.
+        """
+
+        self.enabled = enabled
+        self.current_phase = ""
+        self.commands = []
+        self.folder = os.path.join(folder or "profile",
+                                   dt.now().strftime("%Y%m%d_%H%M%S"))
+
+        if enabled:
+            os.makedirs(self.folder, exist_ok=True)
+            self.__trace_commands__()
+
+    def __trace_commands__(self):
+        """ Wrap WebDriver.execute, the entry point of all the webdriver
+        commands of the WebScraping methods """
+
+        execute = WebDriver.execute
+        profiler = self
+
+        def traced_execute(driver, driver_command, params=None):
+            start = perf_counter()
+            try:
+                return execute(driver, driver_command, params)
+            finally:
+                latency = perf_counter() - start
+                profiler.commands.append({
+                    "phase": profiler.current_phase,
+                    "method": profiler.__get_scraper_method__(),
+                    "command": driver_command,
+                    "selector": profiler.__get_selector__(params),
+                    "latency_ms": round(latency * 1000, 3),
+                })
+
+        WebDriver.execute = traced_execute
+
+    def __get_scraper_method__(self) -> str:
+        """ Return the scraper method (outermost frame in scraper_dt.py)
+        that sent the current webdriver command """
+
+        method = ""
+        frame = sys._getframe(2)
+        while frame:
+            if frame.f_code.co_filename.endswith(SCRAPER_FILE):
+                method = frame.f_code.co_name
+            frame = frame.f_back
+        return method
+
+    def __get_selector__(self, params: dict) -> str:
+        """ Return the selector of find commands, or the first line of
+        scripts """
+
+        if not params:
+            return ""
+        if "using" in params:
+            return f"{params['using']}={params.get('value', '')}"
+        if "script" in params:
+            lines = [line.strip() for line in params["script"].splitlines()
+                     if line.strip()]
+            return lines[0][:60] if lines else ""
+        if "url" in params:
+            return params["url"]
+        return ""
+
+    @contextmanager
+    def phase(self, name: str):
+        """ Profile a phase and save its stats and collapsed stacks
+
+        Args:
+            name (str): phase name, used in the output files names
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        self.current_phase = name
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.current_phase = ""
+            self.__save_phase__(name, profile)
+
+    def __save_phase__(self, name: str, profile: cProfile.Profile):
+        """ Save pstats file and collapsed stacks of a phase """
+
+        base_path = os.path.join(self.folder, name)
+        profile.dump_stats(f"{base_path}.prof")
+
+        stats = pstats.Stats(profile)
+        stacks = get_collapsed_stacks(stats)
+        with open(f"{base_path}.collapsed", "w", encoding="utf-8") as file:
+            for stack, value in sorted(stacks.items()):
+                file.write(f"{stack} {value}\n")
+
+        logger.info(f"Profile of {name} saved in {base_path}.collapsed")
+
+    def save_commands(self, top: int = 20):
+        """ Save the traced webdriver commands (csv and collapsed stacks by
+        phase, method, command and selector) and log the slowest groups
+
+        Args:
+            top (int, optional): groups to log. Defaults to 20.
+        """
+
+        if not self.enabled or not self.commands:
+            return
+
+        fields = ["phase", "method", "command", "selector", "latency_ms"]
+        commands_path = os.path.join(self.folder, "webdriver_commands.csv")
+        with open(commands_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.commands)
+
+        # Total latency and count by group
+        groups = {}
+        for command in self.commands:
+            key = tuple(command[field] or "-" for field in fields[:4])
+            total, count = groups.get(key, (0, 0))
+            groups[key] = (total + command["latency_ms"], count + 1)
+
+        stacks_path = os.path.join(self.folder, "webdriver.collapsed")
+        with open(stacks_path, "w", encoding="utf-8") as file:
+            for key, (total, _) in sorted(groups.items()):
+                frames = [frame.replace(";", ",").replace(" ", "_")
+                          for frame in key]
+                file.write(f"{';'.join(frames)} {round(total * 1000)}\n")
+
+        slowest = sorted(groups.items(), key=lambda item: -item[1][0])[:top]
+        for (phase, method, command, selector), (total, count) in slowest:
+            logger.info(f"{phase} {method} {command} {selector}: "
+                        f"{total / 1000:.2f}s in {count} commands")
+        logger.info(f"Webdriver commands saved in {commands_path}")
@@ -0,0 +1,167 @@
+import os
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from dotenv import load_dotenv
+from logs import logger
+from database.db import Database, TICKER_FIELDS
+load_dotenv()
+
+SERVICE_HOST = os.getenv('SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(os.getenv('SERVICE_PORT', 8080))
+REFRESH_INTERVAL = int(os.getenv('SERVICE_REFRESH_INTERVAL', 10))
+
+
+def build_index(tables_rows: dict) -> dict:
+    """ Group the rows of all tables by ticker, as encoded json responses
+
+    Args:
+        tables_rows (dict): table name -> rows dicts
+
+    Returns:
+        dict: ticker -> json bytes with the rows of each table
+    """
+
+    grouped = {}
+    for table_name, rows in tables_rows.items():
+        symbol_field = TICKER_FIELDS[table_name][0]
+        for row in rows:
+            symbol = (row[symbol_field] or "").upper()
+            if not symbol:
+                continue
+            tables = grouped.setdefault(symbol, {})
+            tables.setdefault(table_name, []).append(row)
+
+    return {
+        symbol: json.dumps({"ticker": symbol, "tables": tables},
+                           default=str).encode()
+        for symbol, tables in grouped.items()
+    }
+
+
+class ReadService ():
+    """ In memory index of the current rows of all tables, by ticker. The
+    index is rebuilt when a new run is complete and swapped atomically
+    """
+
+    def __init__(self, load_rows, get_version):
+        """ Build the first index
+
+        Args:
+            load_rows (callable): returns table name -> rows dicts
+            get_version (callable): returns a value that changes when there
+                is new data (like the last complete run ids)
+        """
+
+        self.load_rows = load_rows
+        self.get_version = get_version
+        self.version = None
+        self.index = {}
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """ Rebuild the index if there is new data
+
+        Returns:
+            bool: True if the index was rebuilt
+        """
+
+        version = self.get_version()
+        if version == self.version:
+            return False
+
+        index = build_index(self.load_rows())
+
+        # Swap reference: readers use the old or the new index, never a mix
+        self.index = index
+        self.version = version
+        logger.info(f"Read service index refreshed: {len(index)} tickers")
+        return True
+
+    def lookup(self, ticker: str) -> bytes:
+        """ Return the json response of a ticker, or None if it has no data """
+
+        return self.index.get(ticker.upper())
+
+    def refresh_loop(self, stop: threading.Event):
+        """ Refresh the index every REFRESH_INTERVAL seconds until stop """
+
+        while not stop.wait(REFRESH_INTERVAL):
+            try:
+                self.refresh()
+            except Exception as err:
+                logger.error(f"Read service refresh failed: {err}")
+
+    def get_server(self, host: str, port: int) -> ThreadingHTTPServer:
+        """ Create the http server: GET /tickers/<ticker>
+
+        Args:
+            host (str): server host
+            port (int): server port
+
+        Returns:
+            ThreadingHTTPServer: server (not started)
+        """
+
+        service = self
+
+        class Handler (BaseHTTPRequestHandler):
+
+            # Keep alive connections, without delayed small writes
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                body = None
+                if self.path.startswith("/tickers/"):
+                    body = service.lookup(self.path[len("/tickers/"):])
+
+                if body is None:
+                    self.send_response(404)
+                    body = b'{"error": "not found"}'
+                else:
+                    self.send_response(200)
+
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        return server
+
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT):
+    """ Start the read service with the current tables data """
+
+    database = Database()
+
+    def load_rows():
+        return {table_name: database.get_current_rows(table_name)
+                for table_name in TICKER_FIELDS}
+
+    # The current tables change with the full and incremental runs
+    def get_version():
+        return database.get_latest_run_ids(mode=None)
+
+    service = ReadService(load_rows, get_version)
+
+    stop = threading.Event()
+    threading.Thread(target=service.refresh_loop, args=(stop,),
+                     daemon=True).start()
+
+    server = service.get_server(host, port)
+    logger.info(f"Read service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,96 @@
+import os
+import json
+from datetime import datetime as dt
+from logs import logger
+
+
+class RunState ():
+    """ Completion state of the current batch (one main run over all the
+    tables), saved in a json file after each table is scraped and saved. A
+    crashed batch can be resumed skipping the finished tables, and attaching
+    to the chrome of the crashed run
+    """
+
+    def __init__(self, path: str = ".run_state.json"):
+        """ Load the state of the last batch (if it didn't finish)
+
+        Args:
+            path (str, optional): json state file.
+                Defaults to ".run_state.json".
+        """
+
+        self.path = path
+        self.state = {}
+
+        if os.path.isfile(path):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    self.state = json.load(file)
+            except (OSError, ValueError) as err:
+                logger.warning(f"Run state file {path} not loaded: {err}")
+
+    def __save__(self):
+        """ Write the state file (replaced at once, so a crash while writing
+        doesn't corrupt it) """
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file, indent=4)
+        os.replace(temp_path, self.path)
+
+    def get_debugger_address(self) -> str:
+        """ Debugger address of the chrome of the last batch """
+
+        return self.state.get("debugger_address", "")
+
+    def start_batch(self, resume: bool = False, debugger_address: str = ""):
+        """ Continue the last batch (resume) or start a new one
+
+        Args:
+            resume (bool, optional): keep the tables already done in the last
+                batch. Defaults to False.
+            debugger_address (str, optional): debugger address of the current
+                chrome. Defaults to "".
+        """
+
+        if resume and self.state.get("batch_id"):
+            done = ", ".join(self.state["tables"]) or "none"
+            logger.info(f"Resuming batch {self.state['batch_id']}, tables "
+                        f"done: {done}")
+        else:
+            if resume:
+                logger.info("No unfinished batch to resume, starting a new one")
+            self.state = {
+                "batch_id": dt.now().strftime("%Y%m%d%H%M%S"),
+                "started_at": dt.now().isoformat(timespec="seconds"),
+                "tables": {},
+            }
+
+        self.state["debugger_address"] = debugger_address
+        self.__save__()
+
+    def is_done(self, table_name: str) -> bool:
+        """ Check if the table was already scraped and saved in the batch """
+
+        return table_name in self.state.get("tables", {})
+
+    def set_done(self, table_name: str, run_id: int):
+        """ Save the table as scraped and saved in the batch
+
+        Args:
+            table_name (str): table key in TABLES
+            run_id (int): saved run id
+        """
+
+        self.state["tables"][table_name] = {
+            "run_id": run_id,
+            "finished_at": dt.now().isoformat(timespec="seconds"),
+        }
+        self.__save__()
+
+    def finish_batch(self):
+        """ Delete the state file: all the tables are done """
+
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.state = {}
@@ -0,0 +1,189 @@
+import queue
+import shutil
+import tempfile
+import threading
+import psutil
+from logs import logger
+
+# Seconds to wait for the spare driver before starting one in the lease
+SPARE_TIMEOUT = 60
+
+
+class BrowserPool ():
+    """ Pool of chrome drivers. Drivers are health checked when leased and
+    recycled after a number of pages or when chrome memory is over a limit.
+    A replacement driver is pre-warmed in background, so recycling doesn't
+    wait for chrome to start
+    """
+
+    def __init__(self, new_driver, size: int = 1, max_pages: int = 50,
+                 max_rss_mb: int = 1500):
+        """ Start the pool drivers and the first spare driver
+
+        Args:
+            new_driver (callable): function to start a driver, with the chrome
+                data folder as argument
+            size (int, optional): drivers to lease. Defaults to 1.
+            max_pages (int, optional): pages before recycle a driver.
+                Defaults to 50.
+            max_rss_mb (int, optional): chrome memory limit (MB) before
+                recycle a driver. Defaults to 1500.
+        """
+
+        self.new_driver = new_driver
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+
+        self.idle = queue.Queue()
+        self.spares = queue.Queue()
+        self.pages = {}
+        self.folders = {}
+        self.warming = None
+
+        for _ in range(size):
+            self.idle.put(self.__start_driver__())
+        self.__warm_spare__()
+
+    def __start_driver__(self):
+        """ Start a driver in a temporary chrome data folder """
+
+        folder = tempfile.mkdtemp(prefix="chrome_pool_")
+        driver = self.new_driver(folder)
+        self.pages[id(driver)] = 0
+        self.folders[id(driver)] = folder
+        return driver
+
+    def __warm_spare__(self):
+        """ Start a spare driver in background (only one at a time) """
+
+        if self.warming and self.warming.is_alive():
+            return
+
+        def warm():
+            try:
+                self.spares.put(self.__start_driver__())
+            except Exception as err:
+                logger.error(f"Spare browser failed to start: {err}")
+
+        self.warming = threading.Thread(target=warm, daemon=True)
+        self.warming.start()
+
+    def __quit__(self, driver):
+        """ Quit driver and remove its chrome data folder """
+
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self.pages.pop(id(driver), None)
+        shutil.rmtree(self.folders.pop(id(driver), ""), ignore_errors=True)
+
+    def __discard__(self, driver):
+        """ Quit driver and remove its chrome data folder, in background """
+
+        threading.Thread(target=self.__quit__, args=(driver,),
+                         daemon=True).start()
+
+    def __replace__(self, driver):
+        """ Discard driver and return the spare one, warming a new spare.
+        If the spare is not ready in SPARE_TIMEOUT seconds (or it failed to
+        start), a new driver is started here """
+
+        self.__discard__(driver)
+        try:
+            spare = self.spares.get(timeout=SPARE_TIMEOUT)
+        except queue.Empty:
+            logger.warning("Spare browser not ready, starting a new one")
+            spare = self.__start_driver__()
+        self.__warm_spare__()
+        return spare
+
+    def get_rss_mb(self, driver) -> float:
+        """ Return memory (MB) used by the chrome processes of a driver
+
+        Args:
+            driver (webdriver.Chrome): pool driver
+
+        Returns:
+            float: resident memory of chromedriver and its children
+        """
+
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            rss = 0
+            for child in processes:
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return rss / 1024 / 1024
+        except psutil.Error:
+            return 0
+
+    def is_healthy(self, driver) -> bool:
+        """ Validate driver with a cheap script ping
+
+        Args:
+            driver (webdriver.Chrome): pool driver
+
+        Returns:
+            bool: True if the driver responds
+        """
+
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def lease(self):
+        """ Return a healthy idle driver (waits if all drivers are leased)
+
+        Returns:
+            webdriver.Chrome: driver
+        """
+
+        driver = self.idle.get()
+        if not self.is_healthy(driver):
+            logger.warning("Browser failed health check, replacing it")
+            driver = self.__replace__(driver)
+        return driver
+
+    def release(self, driver, pages: int = 1):
+        """ Return driver to the pool, recycling it if it is over the
+        pages or memory limits
+
+        Args:
+            driver (webdriver.Chrome): leased driver
+            pages (int, optional): pages loaded in the lease. Defaults to 1.
+        """
+
+        self.pages[id(driver)] = self.pages.get(id(driver), 0) + pages
+
+        pages_num = self.pages[id(driver)]
+        rss_mb = self.get_rss_mb(driver)
+        if pages_num >= self.max_pages or rss_mb >= self.max_rss_mb:
+            logger.info(f"Recycling browser: {pages_num} pages, "
+                        f"{rss_mb:.0f} MB")
+            driver = self.__replace__(driver)
+
+        self.idle.put(driver)
+
+    def close(self, *leased):
+        """ Quit all the drivers and remove their chrome data folders,
+        waiting for the spare that is starting
+
+        Args:
+            leased (webdriver.Chrome): leased drivers to quit too
+        """
+
+        if self.warming:
+            self.warming.join(SPARE_TIMEOUT)
+
+        drivers = list(leased)
+        for pool_queue in (self.idle, self.spares):
+            while not pool_queue.empty():
+                drivers.append(pool_queue.get())
+
+        for driver in drivers:
+            self.__quit__(driver)
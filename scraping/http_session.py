@@ -0,0 +1,138 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from logs import logger
+
+
+class HttpSession ():
+    """ Keep-alive HTTP client that reuses the browser session (cookies and
+    user agent). Responses are cached with ETag / Last-Modified validators,
+    and the session is refreshed from the browser when a request comes back
+    unauthorized
+    """
+
+    def __init__(self, export_session, workers: int = 4, timeout: int = 30):
+        """ Start the connection pool and load the browser session
+
+        Args:
+            export_session (callable): function that returns the browser
+                session as (cookies, user agent). It can login again
+            workers (int, optional): concurrent requests. Defaults to 4.
+            timeout (int, optional): request timeout (seconds). Defaults to 30.
+        """
+
+        self.export_session = export_session
+        self.workers = workers
+        self.timeout = timeout
+
+        # Url -> validators and text of the last response
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.session_version = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.__load_session__()
+
+    def __load_session__(self):
+        """ Copy cookies and user agent from the browser """
+
+        cookies, user_agent = self.export_session()
+
+        self.session.cookies.clear()
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/json,*/*",
+        })
+        self.session_version += 1
+
+    def __refresh_session__(self, session_version: int):
+        """ Refresh the session from the browser, only once for all the
+        requests that failed with the same session
+
+        Args:
+            session_version (int): session used by the failed request
+        """
+
+        with self.lock:
+            if session_version == self.session_version:
+                logger.info("HTTP session unauthorized, refreshing from browser")
+                self.__load_session__()
+
+    def get(self, url: str) -> str:
+        """ Get the text of an url, with a conditional request if the url is
+        cached. Unauthorized requests are retried once with a new session
+
+        Args:
+            url (str): page or resource url
+
+        Raises:
+            requests.HTTPError: request failed
+
+        Returns:
+            str: response text
+        """
+
+        for attempt in range(2):
+
+            headers = {}
+            cached = self.cache.get(url)
+            if cached:
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            session_version = self.session_version
+            response = self.session.get(url, headers=headers,
+                                        timeout=self.timeout)
+
+            # Session expired
+            if response.status_code in (401, 403) and attempt == 0:
+                self.__refresh_session__(session_version)
+                continue
+
+            # Not modified
+            if response.status_code == 304 and cached:
+                return cached["text"]
+
+            response.raise_for_status()
+            self.cache[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "text": response.text,
+            }
+            return response.text
+
+    def get_many(self, urls: list) -> dict:
+        """ Get urls concurrently. Failed urls are logged and skipped
+
+        Args:
+            urls (list): pages or resources urls
+
+        Returns:
+            dict: url -> response text
+        """
+
+        def get(url):
+            try:
+                return self.get(url)
+            except Exception as err:
+                logger.warning(f"HTTP request to {url} failed: {err}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            texts = executor.map(get, urls)
+            return {url: text for url, text in zip(urls, texts)
+                    if text is not None}
@@ -0,0 +1,102 @@
+class Record ():
+    """ Compact row of a scraped table. Fields are stored in slots instead of
+    a per row dict, and can be read as attributes or as dict keys, like
+    row["ticker"]
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        """ Set fields values, in slots order
+
+        Args:
+            values: fields values
+        """
+
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __getitem__(self, name: str):
+        return getattr(self, name)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+    def keys(self) -> tuple:
+        """ Return fields names, like dict keys """
+
+        return self.__slots__
+
+    def to_dict(self) -> dict:
+        """ Return fields as dict """
+
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class NewFiling (Record):
+    __slots__ = (
+        "ticker",
+        "company_name",
+        "dilution_type",
+        "dilution_name",
+        "date_modified",
+        "query_date",
+    )
+
+
+class CompletedOffering (Record):
+    __slots__ = (
+        "ticker",
+        "type",
+        "method",
+        "share_equivalent",
+        "price",
+        "warrants",
+        "offering_amt",
+        "bank",
+        "investors",
+        "datetime",
+        "query_date",
+    )
+
+
+class PendingS1 (Record):
+    __slots__ = (
+        "ticker",
+        "company_name",
+        "industry",
+        "date_first_s1",
+        "pricing_date",
+        "anticipated_deal_size",
+        "estimated_warrant_coverage",
+        "underwriters_placement_agents",
+        "float_before_offering",
+        "status",
+        "pricing",
+        "shares_offered",
+        "final_warrant_coverage",
+        "exercise_price",
+        "query_date",
+    )
+
+
+class ReverseSplit (Record):
+    __slots__ = (
+        "symbol",
+        "effective_date",
+        "split_ratio",
+        "current_float_m",
+        "status",
+        "query_date",
+    )
+
+
+class Noncompliant (Record):
+    __slots__ = (
+        "ticker",
+        "company",
+        "deficiency",
+        "market",
+        "notification_date",
+        "query_date",
+    )
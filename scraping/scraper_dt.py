@@ -1,148 +1,422 @@
-from time import sleep
+import os
+import multiprocessing
+from time import sleep, perf_counter
+from itertools import takewhile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime as dt
 from scraping.web_scraping import WebScraping
-from logs import logger
+from scraping.table_parser import TABLE_SCRIPT, FINGERPRINT_SCRIPT, \
+    parse_html, get_fingerprint
+from scraping.browser_pool import BrowserPool
+from scraping.http_session import HttpSession
+from scraping.table_specs import TABLE_SPECS, parse_payload
+from logs import logger, get_worker_queue, init_worker
 
 
 class ScrapingDilutionTracker (WebScraping):
 
-    def __init__(self, chrome_folder: str):
+    def __init__(self, chrome_folder: str, session_file: str = ".session.json",
+                 lean: bool = False, pool_max_pages: int = 0,
+                 pool_max_rss_mb: int = 1500, http_workers: int = 0,
+                 parse_workers: int = 0, detach: bool = False,
+                 debugger_address: str = ""):
         """ Connect to WebScraping class and start chrome instance
 
         Args:
             chrome_folder (str): chrome data folder path
+            session_file (str, optional): json file to persist the login
+                session. Defaults to ".session.json".
+            lean (bool, optional): block images, fonts, analytics and
+                widgets while browsing. Defaults to False.
+            pool_max_pages (int, optional): after login, load pages with a
+                browser pool that recycles chrome after this number of pages
+                (0 to use the login browser). Defaults to 0.
+            pool_max_rss_mb (int, optional): chrome memory (MB) limit of
+                the browser pool. Defaults to 1500.
+            http_workers (int, optional): after login, fetch the app pages
+                over HTTP with the browser session and this number of
+                concurrent requests (0 to only use the browser). Defaults to 0.
+            parse_workers (int, optional): parse the tables in this number
+                of worker processes, and return futures instead of records
+                (0 to parse in the browser thread). Defaults to 0.
+            detach (bool, optional): keep chrome open if the script crashes,
+                to attach to it in the next run. Defaults to False.
+            debugger_address (str, optional): attach to the chrome running in
+                this address, if it is still open. Defaults to "".
         """
 
+        self.session_file = session_file
+        self.pool_max_pages = pool_max_pages
+        self.pool_max_rss_mb = pool_max_rss_mb
+        self.pool = None
+        self.session_drivers = set()
+
+        # Rows read per script call in incremental scrapes
+        self.incremental_chunk_rows = 25
+
+        # Table name -> text fingerprint of the last scrape
+        self.fingerprints = {}
+
+        # HTTP client and page payloads fetched over HTTP
+        self.http_workers = http_workers
+        self.http = None
+        self.http_payloads = {}
+        self.http_payload = None
+
+        # Processes to parse the table payloads
+        self.parse_workers = parse_workers
+        self.parse_pool = None
+        if parse_workers:
+            # Spawned (not forked) workers, without copies of the chrome
+            # and logging threads of this process
+            self.parse_pool = ProcessPoolExecutor(
+                max_workers=parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker, initargs=(get_worker_queue(),))
+
         # Scraping pages
         self.pages = {
             "home": "https://dilutiontracker.com",
+            "app": "https://dilutiontracker.com/app",
             "new_filings": "https://dilutiontracker.com/app/new?a=t3vcol",
             "completed_offering": "https://dilutiontracker.com/app/completed-offerings",
             "pending_s1s": "https://dilutiontracker.com/app/s1",
             "reverse_splits": "https://dilutiontracker.com/app/reverse-split",
             "noncompliant": "https://listingcenter.nasdaq.com/"
                             "noncompliantcompanylist.aspx",
+            "ticker": "https://dilutiontracker.com/app/search/{ticker}",
+        }
+
+        # App pages that can be fetched over HTTP
+        self.http_pages = [
+            "new_filings",
+            "completed_offering",
+            "pending_s1s",
+            "reverse_splits",
+        ]
+
+        # Url patterns, blocked in lean mode, required by each page
+        self.allowlists = {
+            "noncompliant": ["*.svg"],
         }
 
-        # Start chrome instance with chrome data
+        # Start chrome instance with chrome data (or attach to the open one)
         super().__init__(
             chrome_folder=chrome_folder,
-            start_killing=True,
+            start_killing=not debugger_address,
+            lean=lean,
+            detach=detach,
+            debugger_address=debugger_address,
         )
 
-    def __get_table_data__(self, columns: list,
-                           start_row: int = 1, end_row: int = -1) -> list:
-        """ get data from table structure
+    def __lease_driver__(self):
+        """ Swap the current driver with one from the browser pool (if it is
+        enabled). New pool drivers restore the login session
+        """
+
+        if not self.pool_max_pages:
+            return
+
+        # Start pool and close the login browser
+        if not self.pool:
+            super().end_browser()
+            self.pool = BrowserPool(self.new_driver,
+                                    max_pages=self.pool_max_pages,
+                                    max_rss_mb=self.pool_max_rss_mb)
+        else:
+            self.pool.release(self.driver)
+
+        driver = self.pool.lease()
+        if driver is not self.driver:
+            self.driver = driver
+            self.__blocked_urls__ = None
+
+        if driver.session_id not in self.session_drivers:
+            self.load_session(self.session_file)
+            self.session_drivers.add(driver.session_id)
+
+    def close_pools(self):
+        """ Quit the browser pool drivers (with the leased one), removing
+        their chrome data folders, and end the parse processes. The login
+        browser is kept open """
+
+        if self.pool:
+            self.pool.close(self.driver)
+            self.pool = None
+
+        if self.parse_pool:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+
+    def end_browser(self):
+        """ End the login browser (or the browser pool) and the parse
+        processes """
+
+        if not self.pool:
+            super().end_browser()
+        self.close_pools()
+
+    def __export_session__(self) -> tuple:
+        """ Return the browser session for the HTTP client. In refreshes,
+        login again if the browser session expired
+
+        Returns:
+            tuple: cookies (list of dicts) and user agent
+        """
+
+        if self.http and not self.__is_logged__() and not self.login():
+            logger.error("Login failed refreshing the HTTP session")
+
+        cookies = self.driver.get_cookies()
+        user_agent = self.driver.execute_script("return navigator.userAgent;")
+        return cookies, user_agent
+
+    def __fetch_page__(self, page_key: str) -> bool:
+        """ Get the page table over HTTP (prefetched or with a new request).
+        Pages rendered by the browser (without rows in the html) are not used
+
+        Args:
+            page_key (str): page key in pages
+
+        Returns:
+            bool: True if the table payload is ready in http_payload
+        """
+
+        if not self.http or page_key not in self.http_pages:
+            return False
+
+        payload = self.http_payloads.pop(page_key, None)
+        if not payload:
+            try:
+                payload = parse_html(self.http.get(self.pages[page_key]))
+            except Exception as err:
+                logger.warning(f"Page {page_key} HTTP request failed: {err}")
+                return False
+
+        if not payload["rows"]:
+            logger.warning(f"Page {page_key} without rows over HTTP, "
+                           "using browser")
+            return False
+
+        logger.info(f"Page {page_key} loaded over HTTP: "
+                    f"{len(payload['rows'])} rows")
+        self.http_payload = payload
+        return True
+
+    def prefetch_pages(self, page_keys: list = None):
+        """ Fetch app pages concurrently over HTTP. The tables are used by
+        the next scrapes of each page
 
         Args:
-            selector_rows (str): selector of each row of table
-            columns (list): dicts with column data: column name and ata type
-            start_row (int, optional): start row index (inclusive). Defaults to 1
+            page_keys (list, optional): page keys in http_pages. Defaults to
+                None (all pages).
+        """
+
+        if not self.http:
+            return
+
+        page_keys = page_keys or self.http_pages
+        urls = {self.pages[page_key]: page_key for page_key in page_keys}
+        for url, html in self.http.get_many(list(urls)).items():
+            self.http_payloads[urls[url]] = parse_html(html)
+
+    def get_ticker_pages(self, tickers: list) -> dict:
+        """ Fetch the app page of each ticker concurrently over HTTP
+
+        Args:
+            tickers (list): ticker symbols
+
+        Returns:
+            dict: ticker -> page html (failed tickers are skipped)
+        """
+
+        if not self.http:
+            return {}
+
+        urls = {self.pages["ticker"].format(ticker=ticker): ticker
+                for ticker in tickers}
+        return {urls[url]: html
+                for url, html in self.http.get_many(list(urls)).items()}
+
+    def __open_page__(self, page_key: str, wait_selector: str = "tbody > tr"):
+        """ Load page, wait for its content and log load metrics. App pages
+        are fetched over HTTP if the HTTP client is enabled
+
+        Args:
+            page_key (str): page key in pages
+            wait_selector (str, optional): element to wait after load.
+                Defaults to "tbody > tr".
+        """
+
+        if self.__fetch_page__(page_key):
+            return
+
+        self.__lease_driver__()
+
+        if self.__lean__:
+            self.set_blocked_urls(self.allowlists.get(page_key, []))
+
+        start = perf_counter()
+        self.set_page(self.pages[page_key])
+        try:
+            self.wait_load(wait_selector)
+        except Exception:
+            logger.warning(f"Page {page_key}: {wait_selector} not found")
+        load_time = perf_counter() - start
+
+        metrics = self.get_page_metrics()
+        logger.info(f"Page {page_key} loaded in {load_time:.2f}s "
+                    f"(lean: {self.__lean__}): {metrics['bytes'] / 1024:.0f} KB "
+                    f"in {metrics['resources']} resources")
+
+    def __get_table_data__(self, table_name: str, end_row: int = -1,
+                           is_known=None, last_fingerprint: str = None) -> list:
+        """ get data from table structure. The table cells are extracted with
+        a single script call and mapped to the columns using the table headers.
+        With is_known, the rows are read in chunks and the read stops in the
+        first known row (tables sorted newest first). With the parse pool,
+        the payload is parsed in a worker process. The table text fingerprint
+        is saved in fingerprints, and unchanged tables are not extracted
+
+        Args:
+            table_name (str): table key in TABLE_SPECS
             end_row (int, optional): end row index (no inclusive). Defaults to -1
+            is_known (callable, optional): function that receives a record and
+                returns True if it is already saved. Defaults to None.
+            last_fingerprint (str, optional): fingerprint of the last scrape:
+                skip the extraction if the table didn't change.
+                Defaults to None.
 
         Returns:
-            list: table data with dynamic structure (based on column dict)
+            list: table records, sharing the same query date (a future of
+                the records with the parse pool, without is_known), or None
+                if the table is unchanged
         """
 
+        rows_selector = TABLE_SPECS[table_name].get("rows_selector")
+        query_date = dt.today()
+        limit = end_row - 1 if end_row != -1 else None
+
+        # Table fetched over HTTP
+        payload, self.http_payload = self.http_payload, None
+
+        # Compare the table digest before extracting the rows
+        if payload:
+            fingerprint = get_fingerprint(payload, limit)
+        else:
+            fingerprint = self.driver.execute_script(FINGERPRINT_SCRIPT, limit,
+                                                     rows_selector)
+        self.fingerprints[table_name] = fingerprint
+        if last_fingerprint and fingerprint == last_fingerprint:
+            logger.info(f"Table {table_name} unchanged ({fingerprint}), "
+                        "extraction skipped")
+            return None
+
+        if payload and is_known:
+            data = parse_payload(table_name, payload, query_date, end_row)
+            return list(takewhile(lambda row: not is_known(row), data))
+
+        if not is_known:
+
+            # Only extract the required rows
+            if not payload:
+                payload = self.driver.execute_script(TABLE_SCRIPT, limit,
+                                                     rows_selector)
+
+            # Parse in a worker process, while the browser continues
+            if self.parse_pool:
+                return self.parse_pool.submit(parse_payload, table_name,
+                                              payload, query_date, end_row)
+            return parse_payload(table_name, payload, query_date, end_row)
+
+        # Read chunks until the first known row
+        chunk_rows = self.incremental_chunk_rows
+        offset = 0
         data = []
-        selector_rows = "tbody > tr"
-        rows_num = len(self.get_elems(selector_rows))
-        for index in range(rows_num):
-            
-            # End loop if end row is reached
-            if index + start_row == end_row:
-                break
+        while True:
+            payload = self.driver.execute_script(TABLE_SCRIPT, chunk_rows,
+                                                 rows_selector, offset)
+            for row in parse_payload(table_name, payload, query_date):
+                if is_known(row):
+                    logger.info(f"Table {table_name}: known row found after "
+                                f"{len(data)} new rows")
+                    return data
+                data.append(row)
+
+                # Rows limit
+                if len(data) == end_row - 1:
+                    return data
+
+            # End of table
+            if len(payload["rows"]) < chunk_rows:
+                return data
+            offset += chunk_rows
+
+    def __is_logged__(self) -> bool:
+        """ Probe login loading the app page: without session, the page
+        redirects out of the app
 
-            # Generate row selector
-            selector_row = f'{selector_rows}:nth-child({index + start_row})'
-            
-            # auto detect end row
-            row = self.get_elems(selector_row)
-            if not row:
-                break
-
-            data_row = {}
-            last_double_column = False
-            double_columns_found = 0
-            for column_data in columns:
-                
-                # Get column name and data type
-                column_name = column_data["name"]
-                data_type_column = column_data["data_type"]
-                
-                # Generate column selector
-                row_index = columns.index(column_data) + 1 - double_columns_found
-                selector_column = f'{selector_row} td:nth-child({row_index})'
-                
-                # Detect colspan=2
-                colspan = self.get_attrib(selector_column, "colspan")
-
-                # Skip if last column was double
-                if last_double_column:
-                    data_row[column_name] = "NULL"
-                    last_double_column = False
-                    continue
-
-                # Extract links
-                extra = column_data.get("extra", {})
-                if extra.get("is_link", False):
-                    value = self.get_attrib(selector_column, "href")
-                    data_row[column_name] = value
-                    continue
-
-                # Extract text
-                value = self.get_text(selector_column)
-
-                # Skip empty values
-                if not value:
-                    data_row[column_name] = "NULL"
-                    continue
-               
-                # Clean text
-                replace_chars = [
-                    "\\",
-                    "'",
-                    '"'
-                ]
-                for char in replace_chars:
-                    value = value.replace(char, "")
-
-                # Convert numeric fields
-                if data_type_column in [int, float]:
-                    value = value.replace(",", "").replace(
-                        "%", "").replace("$", "")
-
-                # Convert date format 2023-09-30
-                if data_type_column == dt:
-
-                    # Get format frome extra data
-                    format_date = column_data["extra"]["format"]
-                    value = dt.strptime(value, format_date)
-
-                data_row[column_name] = value
-                
-                # Skip next column if colspan=2
-                if colspan == "2":
-                    last_double_column = True
-                    double_columns_found += 1
-
-            # Add query date to data
-            data_row["query_date"] = dt.today()
-
-            data.append(data_row)
-
-        return data
+        Returns:
+            bool: True if the app page is loaded
+        """
+
+        self.set_page(self.pages["app"])
+        current_page = self.driver.current_url
+        return current_page.startswith(self.pages["app"]) \
+            and "login" not in current_page
+
+    def __close_modal__(self):
+        """ Close intercom modal if it is open """
+
+        selector = '.intercom-post-close'
+        modal_elem = self.get_elems(selector)
+        if modal_elem:
+            self.click_js(selector)
+            self.refresh_selenium()
+
+    def __start_http__(self):
+        """ Start the HTTP client with the browser session, after the first
+        login """
+
+        if self.http_workers and not self.http:
+            self.http = HttpSession(self.__export_session__,
+                                    workers=self.http_workers)
 
     def login(self) -> bool:
-        """ Validate correct login and go to app page
+        """ Validate correct login and go to app page. The chrome profile
+        session is probed first, then the saved session is restored and
+        probed, and the full flow only runs if both probes fail. The session
+        file is saved after each successful login
 
         Returns:
             bool: True if login success
         """
 
+        # Chrome profile session (like a manual login)
+        is_logged = self.__is_logged__()
+        if is_logged:
+            logger.info("Chrome profile session is logged")
+
+        # Restore saved session
+        elif self.load_session(self.session_file):
+            is_logged = self.__is_logged__()
+            if is_logged:
+                logger.info("Saved session restored")
+            else:
+
+                # Expired session: remove it before the full flow
+                logger.info("Saved session expired, removing it")
+                self.clear_session()
+                os.remove(self.session_file)
+
+        if is_logged:
+            self.save_session(self.session_file)
+            self.__close_modal__()
+            self.__start_http__()
+            return True
+
         selectors = {
             "nav_items": 'nav li',
-            "close_modal": '.intercom-post-close'
         }
 
         # Load home page
@@ -156,7 +430,7 @@ class ScrapingDilutionTracker (WebScraping):
 
             # Go to home page
             old_page = self.driver.current_url
-            self.set_page(f'{self.pages["home"]}/app')
+            self.set_page(self.pages["app"])
         
             go_to_app_found = True
             
@@ -169,19 +443,32 @@ class ScrapingDilutionTracker (WebScraping):
         if old_page == current_page:
             return False
 
-        # Close modal
-        modal_elem = self.get_elems(selectors["close_modal"])
-        if modal_elem:
-            self.click_js(selectors["close_modal"])
-            self.refresh_selenium()
+        # Save session for the next runs
+        self.save_session(self.session_file)
+
+        self.__close_modal__()
+        self.__start_http__()
 
         return True
     
-    def get_new_filings(self) -> list:
+    def get_new_filings(self, top_rows: int = 0, reload: bool = False,
+                        is_known=None, last_fingerprint: str = None) -> list:
         """ Extract data from tablle of new filings page
 
+        Args:
+            top_rows (int, optional): only extract the first rows (0 for all
+                rows). Defaults to 0.
+            reload (bool, optional): refresh the current tab (or fetch the
+                page again over HTTP) instead of opening the page.
+                Defaults to False.
+            is_known (callable, optional): incremental mode: stop in the
+                first row that returns True. Defaults to None.
+            last_fingerprint (str, optional): skip the extraction (and
+                return None) if the table fingerprint didn't change.
+                Defaults to None.
+
         Returns:
-            list: dicts with rows data
+            list: records with rows data
             Structure:
             [
                 {
@@ -196,46 +483,38 @@ class ScrapingDilutionTracker (WebScraping):
             ]
         """
         
-        logger.info("Scraping table New Filings...")
-        
-        self.set_page(self.pages["new_filings"])
-        self.refresh_selenium()
+        if reload and self.http:
+            self.__open_page__("new_filings")
+        elif reload:
+            self.driver.refresh()
+            self.wait_load("tbody > tr")
+        else:
+            logger.info("Scraping table New Filings...")
+            self.__open_page__("new_filings")
+            self.refresh_selenium()
         
         # Get table data
         table_data = self.__get_table_data__(
-            columns=[
-                {
-                    "name": "ticker",
-                    "data_type": str,
-                },
-                {
-                    "name": "company_name",
-                    "data_type": str,
-                },
-                {
-                    "name": "dilution_type",
-                    "data_type": str,
-                },
-                {
-                    "name": "dilution_name",
-                    "data_type": str,
-                },
-                {
-                    "name": "date_modified",
-                    "data_type": dt,
-                    "extra": {
-                        "format": "%Y-%m-%d"
-                    }
-                }
-            ]
+            "new_filings",
+            end_row=top_rows + 1 if top_rows else -1,
+            is_known=is_known,
+            last_fingerprint=last_fingerprint,
         )
         return table_data
     
-    def get_completed_offerings(self) -> list:
+    def get_completed_offerings(self, is_known=None,
+                                last_fingerprint: str = None) -> list:
         """ Extract data from tablle of completed offering page
 
+        Args:
+            is_known (callable, optional): incremental mode: stop in the
+                first row that returns True. Defaults to None.
+            last_fingerprint (str, optional): skip the extraction (and
+                return None) if the table fingerprint didn't change.
+                Defaults to None.
+
         Returns:
-            list: dicts with rows data
+            list: records with rows data
             Structure:
             [
                 {
@@ -257,63 +536,25 @@ class ScrapingDilutionTracker (WebScraping):
         
         logger.info("Scraping table Completed Offering...")
         
-        self.set_page(self.pages["completed_offering"])
+        self.__open_page__("completed_offering")
         self.refresh_selenium()
         
         # Get table data
-        table_data = self.__get_table_data__(
-            columns=[
-                {
-                    "name": "ticker",
-                    "data_type": str,
-                },
-                {
-                    "name": "type",
-                    "data_type": str,
-                },
-                {
-                    "name": "method",
-                    "data_type": str,
-                },
-                {
-                    "name": "share_equivalent",
-                    "data_type": int,
-                },
-                {
-                    "name": "price",
-                    "data_type": float,
-                },
-                {
-                    "name": "warrants",
-                    "data_type": int,
-                },
-                {
-                    "name": "offering_amt",
-                    "data_type": int,
-                },
-                {
-                    "name": "bank",
-                    "data_type": str,
-                },
-                {
-                    "name": "investors",
-                    "data_type": str,
-                },
-                {
-                    "name": "datetime",
-                    "data_type": dt,
-                    "extra": {
-                        "format": "%Y-%m-%d %H:%M",
-                    }
-                }
-            ]
-        )
+        table_data = self.__get_table_data__("completed_offerings",
+                                             is_known=is_known,
+                                             last_fingerprint=last_fingerprint)
         return table_data
 
-    def get_pending_s1s(self) -> list:
+    def get_pending_s1s(self, last_fingerprint: str = None) -> list:
         """ Extract data from tablle of pending s1s page
+
+        Args:
+            last_fingerprint (str, optional): skip the extraction (and
+                return None) if the table fingerprint didn't change.
+                Defaults to None.
+
         Returns:
-            list: dicts with rows data
+            list: records with rows data
             Structure:
             [
                 {
@@ -339,84 +580,24 @@ class ScrapingDilutionTracker (WebScraping):
         
         logger.info("Scraping table Pending S1s...")
         
-        self.set_page(self.pages["pending_s1s"])
+        self.__open_page__("pending_s1s")
         self.refresh_selenium()
         
         # Get table data
-        table_data = self.__get_table_data__(
-            columns=[
-                {
-                    "name": "ticker",
-                    "data_type": str,
-                },
-                {
-                    "name": "company_name",
-                    "data_type": str,
-                },
-                {
-                    "name": "industry",
-                    "data_type": str,
-                },
-                {
-                    "name": "date_first_s1",
-                    "data_type": dt,
-                    "extra": {
-                        "format": "%Y-%m-%d"
-                    }
-                },
-                {
-                    "name": "pricing_date",
-                    "data_type": dt,
-                    "extra": {
-                        "format": "%Y-%m-%d"
-                    }
-                },
-                {
-                    "name": "anticipated_deal_size",
-                    "data_type": str,
-                },
-                {
-                    "name": "estimated_warrant_coverage",
-                    "data_type": int,
-                },
-                {
-                    "name": "underwriters_placement_agents",
-                    "data_type": str,
-                },
-                {
-                    "name": "float_before_offering",
-                    "data_type": int,
-                },
-                {
-                    "name": "status",
-                    "data_type": str,
-                },
-                {
-                    "name": "pricing",
-                    "data_type": float,
-                },
-                {
-                    "name": "shares_offered",
-                    "data_type": int,
-                },
-                {
-                    "name": "final_warrant_coverage",
-                    "data_type": int,
-                },
-                {
-                    "name": "exercise_price",
-                    "data_type": float,
-                },
-            ],
-            start_row=2
-        )
+        table_data = self.__get_table_data__("pending_s1s",
+                                             last_fingerprint=last_fingerprint)
         return table_data
     
-    def get_reverse_splits(self) -> list:
+    def get_reverse_splits(self, last_fingerprint: str = None) -> list:
         """ Extract data from tablle of reverse split page
 
+        Args:
+            last_fingerprint (str, optional): skip the extraction (and
+                return None) if the table fingerprint didn't change.
+                Defaults to None.
+
         Returns:
-            list: dicts with rows data
+            list: records with rows data
             Structure:
             [
                 {
@@ -433,45 +614,24 @@ class ScrapingDilutionTracker (WebScraping):
         
         logger.info("Scraping table Reverse Splits...")
         
-        self.set_page(self.pages["reverse_splits"])
+        self.__open_page__("reverse_splits")
         self.refresh_selenium()
         
         # Get table data
-        table_data = self.__get_table_data__(
-            columns=[
-                {
-                    "name": "symbol",
-                    "data_type": str,
-                },
-                {
-                    "name": "effective_date",
-                    "data_type": dt,
-                    "extra": {
-                        "format": "%Y-%m-%d"
-                    }
-                },
-                {
-                    "name": "split_ratio",
-                    "data_type": str,
-                },
-                {
-                    "name": "current_float_m",
-                    "data_type": float,
-                },
-                {
-                    "name": "status",
-                    "data_type": str,
-                },
-            ],
-            start_row=2,
-        )
+        table_data = self.__get_table_data__("reverse_splits",
+                                             last_fingerprint=last_fingerprint)
         return table_data
         
-    def get_noncompliant_data(self) -> list:
+    def get_noncompliant_data(self, last_fingerprint: str = None) -> list:
         """ Get data from noncompliantcompanylist page
 
+        Args:
+            last_fingerprint (str, optional): skip the extraction (and
+                return None) if the table fingerprint didn't change.
+                Defaults to None.
+
         Returns:
-            list: no complaint data
+            list: no complaint records
 
             Structure:
             [
@@ -491,59 +651,15 @@ class ScrapingDilutionTracker (WebScraping):
 
         selectors = {
             "dispay_btn": 'th [type="button"]',
-            "rows": '.rgMasterTable tbody tr',
-            "company": 'td[colspan="4"] p',
-            "ticker": 'td:nth-child(2)',
-            "deficiency": 'td:nth-child(3)',
-            "market": 'td:nth-child(4)',
-            "notification_date": 'td:nth-child(5)',
         }
 
         # Load page and open registers
-        self.set_page(self.pages["noncompliant"])
+        self.__open_page__("noncompliant", selectors["dispay_btn"])
         self.click_js(selectors["dispay_btn"])
         sleep(5)
         self.refresh_selenium()
 
-        # Loop each row
-        rows_num = len(self.get_elems(selectors["rows"]))
-        current_company = ""
-        data = []
-        for index in range(rows_num):
-            
-            selector_row = f'{selectors["rows"]}:nth-child({index + 1})'
-            selector_company = f'{selector_row} {selectors["company"]}'
-
-            # Detect new company
-            company = self.get_text(selector_company)
-            if company:
-                current_company = company
-                continue
-
-            # Validate company tricker
-            selector_ticker = f'{selector_row} {selectors["ticker"]}'
-            ticker = self.get_text(selector_ticker).lower().strip()
-            
-            # Extract row data
-            selector_deficiency = f'{selector_row} {selectors["deficiency"]}'
-            selector_market = f'{selector_row} {selectors["market"]}'
-            selector_notification = f'{selector_row} {selectors["notification_date"]}'
-
-            deficiency = self.get_text(selector_deficiency)
-            market = self.get_text(selector_market)
-            notification_date = self.get_text(selector_notification)
-
-            # Format date
-            notification_date = dt.strptime(notification_date, "%m/%d/%Y")
-
-            # Save data
-            data.append({
-                "ticker": ticker,
-                "company": current_company,
-                "deficiency": deficiency,
-                "market": market,
-                "notification_date": notification_date,
-                "query_date": dt.today(),
-            })
-
-        return data
+        # Get table data
+        table_data = self.__get_table_data__("noncompliant",
+                                             last_fingerprint=last_fingerprint)
+        return table_data
@@ -0,0 +1,433 @@
+import re
+import hashlib
+from html.parser import HTMLParser
+from datetime import datetime as dt
+from scraping.records import Noncompliant
+from logs import logger
+
+# Js script to extract, in a single call, the header and body cells of the
+# page tables. Each cell is returned as [text, colspan, href]. The optional
+# arguments are the max number of body rows, the rows selector and the
+# index of the first body row
+TABLE_SCRIPT = """
+    const offset = arguments[2] || 0;
+    const limit = arguments[0] ? offset + arguments[0] : undefined;
+    const rowsSelector = arguments[1] || 'tbody > tr';
+    const cellData = cell => {
+        const link = cell.querySelector('a');
+        const href = cell.getAttribute('href') || (link ? link.href : null);
+        return [cell.innerText.trim(), cell.colSpan || 1, href];
+    };
+    const headRows = document.querySelectorAll('thead tr');
+    const headers = headRows.length
+        ? [...headRows[headRows.length - 1].children].map(cellData)
+        : [];
+    const rows = [...document.querySelectorAll(rowsSelector)]
+        .slice(offset, limit)
+        .map(row => [...row.children].map(cellData));
+    return {headers: headers, rows: rows};
+"""
+
+# Js script to return a digest of the table text, instead of the cells, to
+# detect unchanged tables with a single call: FNV-1a hash of the header and
+# body cells text, with rows and text length. The optional arguments are the
+# max number of body rows and the rows selector
+FINGERPRINT_SCRIPT = """
+    const limit = arguments[0] || undefined;
+    const rowsSelector = arguments[1] || 'tbody > tr';
+    const headRows = document.querySelectorAll('thead tr');
+    const rows = [...document.querySelectorAll(rowsSelector)].slice(0, limit);
+    if (headRows.length) {
+        rows.unshift(headRows[headRows.length - 1]);
+    }
+    let hash = 0x811c9dc5;
+    let length = 0;
+    for (const row of rows) {
+        for (const cell of row.children) {
+            const text = cell.textContent.trim() + '\\t';
+            for (let i = 0; i < text.length; i++) {
+                hash = Math.imul(hash ^ text.charCodeAt(i), 0x01000193);
+            }
+            length += text.length;
+        }
+        hash = Math.imul(hash ^ 10, 0x01000193);
+    }
+    const digest = (hash >>> 0).toString(16).padStart(8, '0');
+    return `${digest}-${rows.length}-${length}`;
+"""
+
+# Header fingerprint -> column indexes in the normalized grid
+header_maps = {}
+
+
+def normalize_cells(cells: list) -> list:
+    """ Expand cells with colspan in a normalized grid: the first slot keeps
+    the cell and the other slots are filled with None
+
+    Args:
+        cells (list): cells as [text, colspan, href]
+
+    Returns:
+        list: cells with one slot per grid column
+    """
+
+    grid = []
+    for cell in cells:
+        grid.append(cell)
+        colspan = int(cell[1] or 1)
+        grid += [None] * (colspan - 1)
+    return grid
+
+
+def normalize_header(text: str) -> str:
+    """ Return header text in lower case and only with alphanumeric chars """
+
+    return re.sub(r"[^a-z0-9]", "", str(text).lower())
+
+
+def get_column_indexes(headers: list, columns: list) -> list:
+    """ Map each column to its index in the normalized grid using the table
+    headers. The mapping is cached by header fingerprint
+
+    Args:
+        headers (list): header cells as [text, colspan, href]
+        columns (list): dicts with column data: column name, header labels
+            and data type
+
+    Raises:
+        ValueError: the headers do not match with the columns
+
+    Returns:
+        list: grid index of each column
+    """
+
+    # Header labels in the normalized grid
+    labels = []
+    for cell in normalize_cells(headers):
+        labels.append(normalize_header(cell[0]) if cell else "")
+
+    # Return cached mapping
+    fingerprint = (tuple(labels), tuple(column["name"] for column in columns))
+    if fingerprint in header_maps:
+        return header_maps[fingerprint]
+
+    # Without headers, use the columns positions
+    positions = list(range(len(columns)))
+    if not any(labels):
+        header_maps[fingerprint] = positions
+        return positions
+
+    # Match columns with headers. Each header cell is used by one column
+    # only, so repeated labels map to the columns in order
+    indexes = []
+    for column in columns:
+        accepted = [normalize_header(label)
+                    for label in column.get("headers", [])]
+        accepted.append(normalize_header(column["name"]))
+        index = None
+        for position, label in enumerate(labels):
+            if label and label in accepted and position not in indexes:
+                index = position
+                break
+        indexes.append(index)
+
+    # Use positions for the columns without header, only if the position
+    # is not used by other column
+    missing = [column["name"] for column, index in zip(columns, indexes)
+               if index is None]
+    if missing:
+        for position, index in enumerate(indexes):
+            if index is not None:
+                continue
+            if position in indexes or position >= len(labels):
+                raise ValueError(
+                    f"Columns {missing} not found in table headers {labels}")
+            indexes[position] = position
+        logger.warning(f"Columns {missing} not found in table headers "
+                       f"{labels}, mapped by position")
+
+    header_maps[fingerprint] = indexes
+    return indexes
+
+
+def parse_value(value: str, column_data: dict):
+    """ Clean and convert cell text to the column data type
+
+    Args:
+        value (str): cell text
+        column_data (dict): column name, data type and extra data
+
+    Returns:
+        str or datetime: clean value or "NULL" if is empty
+    """
+
+    # Skip empty values
+    if not value:
+        return "NULL"
+
+    # Clean text
+    replace_chars = [
+        "\\",
+        "'",
+        '"'
+    ]
+    for char in replace_chars:
+        value = value.replace(char, "")
+
+    # Convert numeric fields
+    data_type_column = column_data["data_type"]
+    if data_type_column in [int, float]:
+        value = value.replace(",", "").replace(
+            "%", "").replace("$", "")
+
+    # Convert date format 2023-09-30
+    if data_type_column == dt:
+
+        # Get format frome extra data
+        format_date = column_data["extra"]["format"]
+        value = dt.strptime(value, format_date)
+
+    return value
+
+
+def parse_table(payload: dict, columns: list, record_class: type,
+                query_date: dt, start_row: int = 1, end_row: int = -1) -> list:
+    """ Convert table cells extracted with TABLE_SCRIPT to records
+
+    Args:
+        payload (dict): headers and rows cells
+        columns (list): dicts with column data: column name and data type
+        record_class (type): Record class with the columns fields, in the
+            same order, and query_date as last field
+        query_date (datetime): run date, shared by all rows
+        start_row (int, optional): start row index (inclusive). Defaults to 1
+        end_row (int, optional): end row index (no inclusive). Defaults to -1
+
+    Returns:
+        list: table records
+    """
+
+    rows = payload["rows"]
+
+    # Without thead, the row before the first data row is the header
+    headers = payload["headers"]
+    if not headers and 1 < start_row <= len(rows) + 1:
+        headers = rows[start_row - 2]
+    indexes = get_column_indexes(headers, columns)
+
+    # Filter rows
+    end_index = None if end_row == -1 else end_row - 1
+    rows = rows[start_row - 1:end_index]
+
+    data = []
+    for cells in rows:
+
+        grid = normalize_cells(cells)
+
+        values = []
+        for column_data, index in zip(columns, indexes):
+
+            # Slot covered by other cell or missing
+            cell = grid[index] if index < len(grid) else None
+            if not cell:
+                values.append("NULL")
+                continue
+
+            # Extract links
+            extra = column_data.get("extra", {})
+            if extra.get("is_link", False):
+                values.append(cell[2])
+                continue
+
+            values.append(parse_value(cell[0], column_data))
+
+        data.append(record_class(*values, query_date))
+
+    return data
+
+
+def parse_noncompliant(payload: dict, query_date: dt) -> list:
+    """ Convert noncompliant table cells to records. Company rows (with a
+    colspan=4 cell) set the company of the next deficiency rows
+
+    Args:
+        payload (dict): headers and rows cells
+        query_date (datetime): run date, shared by all rows
+
+    Returns:
+        list: noncompliant records
+    """
+
+    current_company = ""
+    data = []
+    for cells in payload["rows"]:
+
+        # Detect new company
+        companies = [cell[0] for cell in cells if int(cell[1] or 1) == 4]
+        if companies and companies[0]:
+            current_company = companies[0]
+            continue
+
+        # Skip rows without deficiency data
+        if len(cells) < 5:
+            continue
+
+        # Format date
+        notification_date = dt.strptime(cells[4][0], "%m/%d/%Y")
+
+        data.append(Noncompliant(
+            cells[1][0].upper().strip(),
+            current_company,
+            cells[2][0],
+            cells[3][0],
+            notification_date,
+            query_date,
+        ))
+
+    return data
+
+
+class HtmlTableParser (HTMLParser):
+    """ Extract from saved html pages the same headers and rows cells
+    returned by TABLE_SCRIPT in the browser
+    """
+
+    void_tags = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                 "link", "meta", "source", "track", "wbr"}
+
+    def __init__(self, table_class: str = ""):
+        """ Start parser
+
+        Args:
+            table_class (str, optional): only extract rows inside tables with
+                this class. Defaults to "" (all tables).
+        """
+
+        super().__init__(convert_charrefs=True)
+        self.table_class = table_class
+        self.stack = []
+
+        # Open rows and cells (None for the not extracted ones)
+        self.open_rows = []
+        self.open_cells = []
+
+        self.headers = []
+        self.rows = []
+
+    def __in_table_class__(self) -> bool:
+        """ Validate if the current element is inside a table with the class """
+
+        if not self.table_class:
+            return True
+        for tag, attrs in self.stack:
+            classes = (attrs.get("class") or "").split()
+            if tag == "table" and self.table_class in classes:
+                return True
+        return False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        parent = self.stack[-1][0] if self.stack else None
+
+        # Links of the open cells
+        if tag == "a":
+            for cell in self.open_cells:
+                if cell and cell[2] is None:
+                    cell[2] = attrs.get("href")
+
+        if tag in self.void_tags:
+            if tag == "br":
+                self.handle_data(" ")
+            return
+
+        # Header and body rows
+        if tag == "tr":
+            row = None
+            if parent == "thead":
+                row = ("thead", [])
+            elif parent == "tbody" and self.__in_table_class__():
+                row = ("tbody", [])
+            self.open_rows.append(row)
+
+        # Cells of the current row
+        if tag in ("td", "th"):
+            cell = None
+            if parent == "tr" and self.open_rows and self.open_rows[-1]:
+                cell = [[], int(attrs.get("colspan") or 1), attrs.get("href")]
+                self.open_rows[-1][1].append(cell)
+            self.open_cells.append(cell)
+
+        self.stack.append((tag, attrs))
+
+    def handle_endtag(self, tag):
+
+        # Ignore end tags without start tag
+        if tag not in (open_tag for open_tag, _ in self.stack):
+            return
+
+        # Close elements until the tag
+        while self.stack:
+            open_tag, _ = self.stack.pop()
+
+            if open_tag in ("td", "th"):
+                cell = self.open_cells.pop()
+                if cell:
+                    cell[0] = " ".join("".join(cell[0]).split())
+
+            if open_tag == "tr":
+                row = self.open_rows.pop()
+                if row and row[0] == "thead":
+                    self.headers = row[1]
+                elif row:
+                    self.rows.append(row[1])
+
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for cell in self.open_cells:
+            if cell:
+                cell[0].append(data)
+
+
+def parse_html(html: str, rows_selector: str = "tbody > tr") -> dict:
+    """ Extract table cells from a saved html page
+
+    Args:
+        html (str): page html
+        rows_selector (str, optional): "tbody > tr" or ".<table class>
+            tbody tr", like in TABLE_SCRIPT. Defaults to "tbody > tr".
+
+    Returns:
+        dict: headers and rows cells
+    """
+
+    table_class = ""
+    if rows_selector.startswith("."):
+        table_class = rows_selector[1:].split()[0]
+
+    parser = HtmlTableParser(table_class)
+    parser.feed(html)
+    parser.close()
+    return {"headers": parser.headers, "rows": parser.rows}
+
+
+def get_fingerprint(payload: dict, limit: int = None) -> str:
+    """ Digest of the header and body cells text of a payload, to detect
+    unchanged tables fetched over HTTP (the digests are not comparable with
+    the FINGERPRINT_SCRIPT ones)
+
+    Args:
+        payload (dict): headers and rows cells (from parse_html)
+        limit (int, optional): max number of body rows. Defaults to None.
+
+    Returns:
+        str: digest with the number of rows
+    """
+
+    rows = [payload["headers"]] + payload["rows"][:limit]
+    digest = hashlib.blake2b(digest_size=8)
+    for row in rows:
+        text = "\t".join(str(cell[0]).strip() for cell in row)
+        digest.update(f"{text}\n".encode())
+    return f"{digest.hexdigest()}-{len(rows)}"
@@ -0,0 +1,280 @@
+from datetime import datetime as dt
+from scraping.records import (NewFiling, CompletedOffering, PendingS1,
+                              ReverseSplit, Noncompliant)
+from scraping.table_parser import parse_table, parse_noncompliant
+
+# Columns, record class, first data row and rows selector of each table,
+# used to parse the tables in the browser and in saved html pages. Columns
+# are mapped to the table cells by their header labels (case and symbols
+# are ignored, and the column name is also accepted)
+TABLE_SPECS = {
+    "new_filings": {
+        "record_class": NewFiling,
+        "columns": [
+            {
+                "name": "ticker",
+                "headers": ["Ticker", "Symbol"],
+                "data_type": str,
+            },
+            {
+                "name": "company_name",
+                "headers": ["Company", "Company Name"],
+                "data_type": str,
+            },
+            {
+                "name": "dilution_type",
+                "headers": ["Type", "Dilution Type"],
+                "data_type": str,
+            },
+            {
+                "name": "dilution_name",
+                "headers": ["Dilution Name", "Filing"],
+                "data_type": str,
+            },
+            {
+                "name": "date_modified",
+                "headers": ["Date Modified", "Modified", "Date"],
+                "data_type": dt,
+                "extra": {
+                    "format": "%Y-%m-%d"
+                }
+            }
+        ],
+    },
+    "completed_offerings": {
+        "record_class": CompletedOffering,
+        "columns": [
+            {
+                "name": "ticker",
+                "headers": ["Ticker", "Symbol"],
+                "data_type": str,
+            },
+            {
+                "name": "type",
+                "headers": ["Type", "Offering Type"],
+                "data_type": str,
+            },
+            {
+                "name": "method",
+                "headers": ["Method"],
+                "data_type": str,
+            },
+            {
+                "name": "share_equivalent",
+                "headers": ["Share Equivalent", "Shares"],
+                "data_type": int,
+            },
+            {
+                "name": "price",
+                "headers": ["Price"],
+                "data_type": float,
+            },
+            {
+                "name": "warrants",
+                "headers": ["Warrants"],
+                "data_type": int,
+            },
+            {
+                "name": "offering_amt",
+                "headers": ["Offering Amt", "Offering Amount", "Amount"],
+                "data_type": int,
+            },
+            {
+                "name": "bank",
+                "headers": ["Bank", "Placement Agent"],
+                "data_type": str,
+            },
+            {
+                "name": "investors",
+                "headers": ["Investors"],
+                "data_type": str,
+            },
+            {
+                "name": "datetime",
+                "headers": ["Date", "Date Time"],
+                "data_type": dt,
+                "extra": {
+                    "format": "%Y-%m-%d %H:%M",
+                }
+            }
+        ],
+    },
+    "pending_s1s": {
+        "record_class": PendingS1,
+        "columns": [
+            {
+                "name": "ticker",
+                "headers": ["Ticker", "Symbol"],
+                "data_type": str,
+            },
+            {
+                "name": "company_name",
+                "headers": ["Company", "Company Name"],
+                "data_type": str,
+            },
+            {
+                "name": "industry",
+                "headers": ["Industry"],
+                "data_type": str,
+            },
+            {
+                "name": "date_first_s1",
+                "headers": ["Date First S-1", "First S-1"],
+                "data_type": dt,
+                "extra": {
+                    "format": "%Y-%m-%d"
+                }
+            },
+            {
+                "name": "pricing_date",
+                "headers": ["Pricing Date"],
+                "data_type": dt,
+                "extra": {
+                    "format": "%Y-%m-%d"
+                }
+            },
+            {
+                "name": "anticipated_deal_size",
+                "headers": ["Anticipated Deal Size", "Deal Size"],
+                "data_type": str,
+            },
+            {
+                "name": "estimated_warrant_coverage",
+                "headers": ["Estimated Warrant Coverage", "Warrant Coverage"],
+                "data_type": int,
+            },
+            {
+                "name": "underwriters_placement_agents",
+                "headers": ["Underwriters / Placement Agents", "Underwriters"],
+                "data_type": str,
+            },
+            {
+                "name": "float_before_offering",
+                "headers": ["Float Before Offering"],
+                "data_type": int,
+            },
+            {
+                "name": "status",
+                "headers": ["Status"],
+                "data_type": str,
+            },
+            {
+                "name": "pricing",
+                "headers": ["Pricing", "Price"],
+                "data_type": float,
+            },
+            {
+                "name": "shares_offered",
+                "headers": ["Shares Offered"],
+                "data_type": int,
+            },
+            {
+                "name": "final_warrant_coverage",
+                "headers": ["Final Warrant Coverage", "Warrant Coverage"],
+                "data_type": int,
+            },
+            {
+                "name": "exercise_price",
+                "headers": ["Exercise Price"],
+                "data_type": float,
+            },
+        ],
+        "start_row": 2,
+    },
+    "reverse_splits": {
+        "record_class": ReverseSplit,
+        "columns": [
+            {
+                "name": "symbol",
+                "headers": ["Symbol", "Ticker"],
+                "data_type": str,
+            },
+            {
+                "name": "effective_date",
+                "headers": ["Effective Date", "Date"],
+                "data_type": dt,
+                "extra": {
+                    "format": "%Y-%m-%d"
+                }
+            },
+            {
+                "name": "split_ratio",
+                "headers": ["Split Ratio", "Ratio"],
+                "data_type": str,
+            },
+            {
+                "name": "current_float_m",
+                "headers": ["Current Float (M)", "Current Float"],
+                "data_type": float,
+            },
+            {
+                "name": "status",
+                "headers": ["Status"],
+                "data_type": str,
+            },
+        ],
+        "start_row": 2,
+    },
+    "noncompliant": {
+        "record_class": Noncompliant,
+        "rows_selector": ".rgMasterTable tbody tr",
+
+        # Rows are grouped by company (see parse_noncompliant), so the
+        # columns are only the records fields
+        "columns": [
+            {
+                "name": "ticker",
+                "headers": ["Symbol"],
+                "data_type": str,
+            },
+            {
+                "name": "company",
+                "headers": ["Company Name", "Issuer Name"],
+                "data_type": str,
+            },
+            {
+                "name": "deficiency",
+                "headers": ["Deficiency"],
+                "data_type": str,
+            },
+            {
+                "name": "market",
+                "headers": ["Market"],
+                "data_type": str,
+            },
+            {
+                "name": "notification_date",
+                "headers": ["Notification Date"],
+                "data_type": dt,
+                "extra": {
+                    "format": "%m/%d/%Y"
+                }
+            },
+        ],
+    },
+}
+
+
+def parse_payload(table_name: str, payload: dict, query_date: dt,
+                  end_row: int = -1) -> list:
+    """ Convert the table cells of a page to records
+
+    Args:
+        table_name (str): table key in TABLE_SPECS
+        payload (dict): headers and rows cells (from TABLE_SCRIPT or
+            parse_html)
+        query_date (datetime): run date, shared by all rows
+        end_row (int, optional): end row index (no inclusive). Defaults to -1
+
+    Returns:
+        list: table records
+    """
+
+    spec = TABLE_SPECS[table_name]
+
+    # Rows grouped by company
+    if table_name == "noncompliant":
+        return parse_noncompliant(payload, query_date)
+
+    return parse_table(payload, spec["columns"], spec["record_class"],
+                       query_date, spec.get("start_row", 1), end_row)
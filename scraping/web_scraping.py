@@ -1,5 +1,8 @@
 import os
+import copy
+import json
 import time
+import socket
 import zipfile
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -9,6 +12,30 @@ from selenium.webdriver.chrome.service import Service
 
 current_file = os.path.basename(__file__)
 
+# Url patterns blocked in lean mode: images, fonts, analytics and widgets
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*segment.com*", "*segment.io*",
+    "*intercom.io*", "*intercomcdn.com*", "*intercomassets.com*",
+]
+
+# Js script to get load time and transferred bytes of the current page
+PAGE_METRICS_SCRIPT = """
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    let bytes = navigation ? navigation.transferSize : 0;
+    for (const resource of resources) {
+        bytes += resource.transferSize;
+    }
+    return {
+        dom_ready: navigation ? navigation.domContentLoadedEventEnd : null,
+        bytes: bytes,
+        resources: resources.length,
+    };
+"""
+
 class WebScraping ():
     """
     Class to manage and configure web browser
@@ -22,7 +49,8 @@ class WebScraping ():
                  chrome_folder="", user_agent=False, 
                  download_folder="", extensions=[], incognito=False, experimentals=True,
                  start_killing=False, start_openning:bool=True, width:int=1280, height:int=720,
-                 mute:bool=True):
+                 mute:bool=True, lean:bool=False, detach:bool=False,
+                 debugger_address:str=""):
         """ Constructor of the class
 
         Args:
@@ -43,6 +71,13 @@ class WebScraping ():
             width (int, optional): Width of the window. Defaults to 1280.
             height (int, optional): Height of the window. Defaults to 720.
             mute (bool, optional): Mute the audio of the window. Defaults to True.
+            lean (bool, optional): Block images, fonts, analytics and widgets,
+                and use the eager page load strategy. Defaults to False.
+            detach (bool, optional): Keep chrome open when the script ends or
+                crashes. Defaults to False.
+            debugger_address (str, optional): Attach to the chrome running in
+                this address ("host:port", from get_debugger_address) instead of
+                opening a new one. Defaults to "".
         """
 
         self.basetime = 1
@@ -65,6 +100,12 @@ class WebScraping ():
         self.__width__ = width
         self.__height__ = height
         self.__mute__ = mute
+        self.__lean__ = lean
+        self.__detach__ = detach
+        self.__debugger_address__ = debugger_address
+        self.__blocked_urls__ = None
+        self.__loaded_session__ = None
+        self.__session_script__ = None
         
         self.__web_page__ = None
 
@@ -110,6 +151,103 @@ class WebScraping ():
             except:
                 pass
 
+    def save_session(self, session_file: str):
+        """ Save cookies and local storage of the current page in a json file
+
+        Args:
+            session_file (str): path of the json file
+        """
+
+        session = {
+            "cookies": self.driver.get_cookies(),
+            "origin": self.driver.execute_script(
+                "return window.location.origin;"),
+            "local_storage": self.driver.execute_script(
+                "return Object.assign({}, window.localStorage);"),
+        }
+        with open(session_file, "w", encoding="utf-8") as file:
+            json.dump(session, file)
+
+    def load_session(self, session_file: str) -> bool:
+        """ Restore cookies and local storage saved with 'save_session'.
+        Cookies are set with CDP and local storage is injected before page
+        scripts run, so the next page load already uses the session
+
+        Args:
+            session_file (str): path of the json file
+
+        Returns:
+            bool: True if the session file exists and was loaded
+        """
+
+        if not os.path.isfile(session_file):
+            return False
+
+        try:
+            with open(session_file, encoding="utf-8") as file:
+                session = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setCookies", {
+            "cookies": session["cookies"]
+        })
+
+        # Set local storage items in the first document of the same origin
+        if session["local_storage"]:
+            script = """
+                if (window.location.origin === %s
+                        && !window.sessionStorage.getItem('session_loaded')) {
+                    const items = %s;
+                    for (const key in items) {
+                        window.localStorage.setItem(key, items[key]);
+                    }
+                    window.sessionStorage.setItem('session_loaded', '1');
+                }
+            """ % (json.dumps(session["origin"]),
+                   json.dumps(session["local_storage"]))
+            result = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": script})
+            self.__session_script__ = result.get("identifier")
+
+        self.__loaded_session__ = session
+        return True
+
+    def clear_session(self):
+        """ Remove the cookies, local storage items and script injected by
+        'load_session' (the current page must be in the session origin) """
+
+        session = self.__loaded_session__
+        if not session:
+            return
+
+        for cookie in session["cookies"]:
+            params = {"name": cookie["name"]}
+            for field in ("domain", "path"):
+                if cookie.get(field):
+                    params[field] = cookie[field]
+            self.driver.execute_cdp_cmd("Network.deleteCookies", params)
+
+        if self.__session_script__:
+            self.driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument",
+                {"identifier": self.__session_script__})
+            self.__session_script__ = None
+
+        if session["local_storage"]:
+            script = """
+                if (window.location.origin === arguments[0]) {
+                    for (const key of arguments[1]) {
+                        window.localStorage.removeItem(key);
+                    }
+                }
+            """
+            self.driver.execute_script(script, session["origin"],
+                                       list(session["local_storage"]))
+
+        self.__loaded_session__ = None
+
     def __set_browser_instance__(self):
         """
         Open and configure browser
@@ -182,6 +320,17 @@ class WebScraping ():
                         'safebrowsing.enabled': True
                         }
 
+            else:
+                prefs = {}
+
+            # Lean mode: return after DOMContentLoaded and skip images and fonts
+            if self.__lean__:
+                WebScraping.options.page_load_strategy = "eager"
+                WebScraping.options.add_argument("--blink-settings=imagesEnabled=false")
+                prefs["profile.managed_default_content_settings.images"] = 2
+                prefs["webkit.webprefs.remote_fonts_enabled"] = False
+
+            if prefs:
                 WebScraping.options.add_experimental_option("prefs", prefs)
 
             if self.__extensions__:
@@ -195,6 +344,9 @@ class WebScraping ():
                 WebScraping.options.add_argument(
                     "--disable-blink-features=AutomationControlled")
 
+            if self.__detach__:
+                WebScraping.options.add_experimental_option("detach", True)
+
         # Set proxy without autentication
         if (self.__proxy_server__ and self.__proxy_port__
                 and not self.__proxy_user__ and not self.__proxy_pass__):
@@ -213,12 +365,115 @@ class WebScraping ():
         # Autoinstall driver with selenium
         if not WebScraping.service:
             WebScraping.service = Service()
-            
+
+        # Reuse the running chrome, if it is still open
+        if self.__debugger_address__ and self.__attach_browser__():
+            return
+
         self.driver = webdriver.Chrome(
             service=WebScraping.service,
             options=WebScraping.options
         )
 
+        if self.__lean__:
+            self.set_blocked_urls()
+
+    def __attach_browser__(self) -> bool:
+        """ Attach the driver to the chrome running in the debugger address
+
+        Returns:
+            bool: True if chrome is running and the driver is attached
+        """
+
+        # Fast check, chromedriver waits a long time for closed ports
+        host, port = self.__debugger_address__.rsplit(":", 1)
+        try:
+            socket.create_connection((host, int(port)), timeout=2).close()
+        except (OSError, ValueError):
+            print(f"Chrome not running in {self.__debugger_address__}, "
+                  "opening a new one")
+            return False
+
+        options = webdriver.ChromeOptions()
+        options.debugger_address = self.__debugger_address__
+        self.driver = webdriver.Chrome(
+            service=WebScraping.service,
+            options=options
+        )
+
+        if self.__lean__:
+            self.set_blocked_urls()
+
+        return True
+
+    def get_debugger_address(self) -> str:
+        """ Return the debugger address of the current chrome, to attach to
+        it later (chrome must be open with detach)
+
+        Returns:
+            str: "host:port" address, or "" if it is not available
+        """
+
+        chrome_options = self.driver.capabilities.get("goog:chromeOptions", {})
+        return chrome_options.get("debuggerAddress", "")
+
+    def new_driver(self, chrome_folder: str):
+        """ Start a new chrome instance, with the class options and its own
+        driver service, in other chrome data folder (two chrome instances
+        can't share the same folder)
+
+        Args:
+            chrome_folder (str): chrome data folder for the new instance
+
+        Returns:
+            webdriver.Chrome: new driver
+        """
+
+        options = copy.deepcopy(WebScraping.options)
+        options.arguments[:] = [argument for argument in options.arguments
+                                if not argument.startswith("--user-data-dir=")]
+        options.add_argument(f"--user-data-dir={chrome_folder}")
+        options.experimental_options.pop("detach", None)
+
+        driver = webdriver.Chrome(service=Service(), options=options)
+
+        if self.__lean__:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {
+                "urls": LEAN_BLOCKED_URLS
+            })
+
+        return driver
+
+    def set_blocked_urls(self, allowlist: list = []):
+        """ Block the lean mode url patterns with CDP, except the patterns in
+        the allowlist (required by the current page)
+
+        Args:
+            allowlist (list, optional): patterns to load. Defaults to [].
+        """
+
+        blocked_urls = [url for url in LEAN_BLOCKED_URLS if url not in allowlist]
+
+        # Skip if the patterns are already blocked
+        if blocked_urls == self.__blocked_urls__:
+            return
+
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {
+            "urls": blocked_urls
+        })
+        self.__blocked_urls__ = blocked_urls
+
+    def get_page_metrics(self) -> dict:
+        """ Return load metrics of the current page
+
+        Returns:
+            dict: dom_ready (ms), transferred bytes and resources number
+        """
+
+        return self.driver.execute_script(PAGE_METRICS_SCRIPT)
+
     def __create_proxy_extesion__(self):
         """Create a proxy chrome extension"""
 
@@ -324,8 +579,9 @@ class WebScraping ():
         Close the current instance of the web browser and reload in the same page
         """
 
-        self.end_browser()
-        self.driver = self.get_browser()
+        self.driver.quit()
+        self.__blocked_urls__ = None
+        self.__set_browser_instance__()
         self.driver.get(self.__web_page__)
 
     def send_data(self, selector, data):
@@ -671,5 +927,5 @@ class WebScraping ():
             value (str): local storage value
         """
         
-        script = f"window.localStorage.setItem('{key}', '{value}')"
-        self.driver.execute_script (script)
\ No newline at end of file
+        script = "window.localStorage.setItem(arguments[0], arguments[1])"
+        self.driver.execute_script (script, key, value)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import os
+import sys
+import socket
+import threading
+from time import sleep
+from dotenv import load_dotenv
+from logs import logger
+from scraping.scraper_dt import ScrapingDilutionTracker
+from database.db import Database
+from pipeline import TABLES, run_table
+load_dotenv()
+
+CHROME_FOLDER = os.getenv('CHROME_FOLDER')
+SESSION_FILE = os.getenv('SESSION_FILE', '.session.json')
+LEAN_BROWSING = os.getenv('LEAN_BROWSING') == "True"
+POOL_MAX_PAGES = int(os.getenv('POOL_MAX_PAGES', 0))
+POOL_MAX_RSS_MB = int(os.getenv('POOL_MAX_RSS_MB', 1500))
+HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', 0))
+WORKER_NAME = os.getenv('WORKER_NAME', f'{socket.gethostname()}-{os.getpid()}')
+HEARTBEAT_INTERVAL = int(os.getenv('HEARTBEAT_INTERVAL', 30))
+POLL_INTERVAL = int(os.getenv('POLL_INTERVAL', 10))
+
+
+def heartbeat(job_id: int, stop: threading.Event):
+    """ Update job heartbeat until stop is set, or the job is reclaimed by
+    other worker
+
+    Args:
+        job_id (int): running job id
+        stop (threading.Event): event to end the heartbeat
+    """
+
+    # Own connection, to not share the worker transaction
+    database = Database()
+    while not stop.wait(HEARTBEAT_INTERVAL):
+        if not database.heartbeat_job(job_id, WORKER_NAME):
+            logger.warning(f'Job {job_id} reclaimed by other worker')
+            return
+
+
+def work():
+    """ Claim and run scrape jobs from the database queue """
+
+    database = Database()
+
+    # Validate chrome folder
+    if CHROME_FOLDER is None or not os.path.isdir(CHROME_FOLDER):
+        logger.error('CHROME_FOLDER not found env variable is not set')
+        quit()
+
+    # Connect to dilution tracker
+    scraper = ScrapingDilutionTracker(CHROME_FOLDER, SESSION_FILE,
+                                      LEAN_BROWSING, POOL_MAX_PAGES,
+                                      POOL_MAX_RSS_MB, HTTP_WORKERS)
+    if not scraper.login():
+        logger.error('Login failed. Close the program, open chrome, '
+                     'login manually and try again')
+        quit()
+
+    logger.info(f'Worker {WORKER_NAME} started')
+    while True:
+
+        # Wait for new jobs
+        job = database.claim_job(WORKER_NAME)
+        if not job:
+            sleep(POLL_INTERVAL)
+            continue
+
+        logger.info(f'Job {job["id"]} claimed: {job["table_name"]}')
+
+        stop = threading.Event()
+        heartbeat_thread = threading.Thread(
+            target=heartbeat, args=(job["id"], stop), daemon=True)
+        heartbeat_thread.start()
+
+        try:
+            run_table(scraper, database, job["table_name"])
+        except Exception as err:
+            logger.error(f'Job {job["id"]} failed: {err}')
+            database.rollback_close()
+            if not database.release_job(job["id"], WORKER_NAME, str(err)):
+                logger.warning(f'Job {job["id"]} reclaimed by other worker, '
+                               'not released')
+        else:
+            if not database.finish_job(job["id"], WORKER_NAME):
+                logger.warning(f'Job {job["id"]} reclaimed by other worker, '
+                               'not marked as done')
+        finally:
+            stop.set()
+            heartbeat_thread.join()
+
+
+if __name__ == '__main__':
+
+    # Create jobs: python worker.py enqueue [table_name ...]
+    if sys.argv[1:2] == ['enqueue']:
+        table_names = sys.argv[2:] or list(TABLES)
+        Database().enqueue_jobs(table_names)
+        logger.info(f'Jobs created: {table_names}')
+    else:
+        work()